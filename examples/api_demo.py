@@ -39,7 +39,6 @@ from openzwave.scene import ZWaveScene
 from openzwave.controller import ZWaveController
 from openzwave.network import ZWaveNetwork
 from openzwave.option import ZWaveOption
-import time
 
 device="/dev/ttyUSB0"
 log="Debug"
@@ -76,7 +75,7 @@ print("------------------------------------------------------------")
 print("Waiting for network awaked : ")
 print("------------------------------------------------------------")
 for i in range(0,300):
-    if network.state>=network.STATE_AWAKED:
+    if network.wait_for_state(network.STATE_AWAKED, timeout=1.0):
 
         print(" done")
         print("Memory use : {} Mo".format( (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0)))
@@ -85,7 +84,6 @@ for i in range(0,300):
         sys.stdout.write(".")
         sys.stdout.flush()
         time_started += 1
-        time.sleep(1.0)
 if network.state<network.STATE_AWAKED:
     print(".")
     print("Network is not awake but continue anyway")
@@ -101,7 +99,7 @@ print("------------------------------------------------------------")
 print("Waiting for network ready : ")
 print("------------------------------------------------------------")
 for i in range(0,300):
-    if network.state>=network.STATE_READY:
+    if network.wait_for_state(network.STATE_READY, timeout=1.0):
         print(" done in {} seconds".format(time_started))
         break
     else:
@@ -113,7 +111,6 @@ for i in range(0,300):
         #sys.stdout.write(")")
         #sys.stdout.write(".")
         sys.stdout.flush()
-        time.sleep(1.0)
 
 
 print("Memory use : {} Mo".format( (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0)))
@@ -111,13 +111,12 @@ print("------------------------------------------------------------")
 print("Waiting for driver : ")
 print("------------------------------------------------------------")
 for i in range(0,300):
-    if network.state>=network.STATE_STARTED:
+    if network.wait_for_state(network.STATE_STARTED, timeout=1.0):
         print(" done")
         break
     else:
         sys.stdout.write(".")
         sys.stdout.flush()
-        time.sleep(1.0)
 if network.state<network.STATE_STARTED:
     print(".")
     print("Can't initialise driver! Look at the logs in OZW_Log.log")
@@ -134,7 +133,7 @@ print("------------------------------------------------------------")
 print("Waiting for network to become ready : ")
 print("------------------------------------------------------------")
 for i in range(0,300):
-    if network.state>=network.STATE_READY:
+    if network.wait_for_state(network.STATE_READY, timeout=1.0):
         print(" done")
         break
     else:
@@ -145,7 +144,6 @@ for i in range(0,300):
         #sys.stdout.write(")")
         #sys.stdout.write(".")
         sys.stdout.flush()
-        time.sleep(1.0)
 if not network.is_ready:
     print(".")
     print("Can't start network! Look at the logs in OZW_Log.log")
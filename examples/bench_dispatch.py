@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave wrapper
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+Benchmark of the signal dispatch : louie (pydispatch on python 3)
+against openzwave.dispatch.FastDispatcher. No controller needed.
+
+Send SIGNAL_VALUE_CHANGED and SIGNAL_VALUE, as the network does for each
+value notification, to some receivers.
+
+"""
+
+import sys
+import timeit
+import six
+if six.PY3:
+    from pydispatch import dispatcher as louie_dispatcher
+else:
+    from louie import dispatcher as louie_dispatcher
+
+from openzwave.dispatch import FastDispatcher
+from openzwave.network import ZWaveNetwork
+
+loops = 100000
+receivers = 5
+
+for arg in sys.argv:
+    if arg.startswith("--loops"):
+        temp,loops = arg.split("=")
+        loops = int(loops)
+    elif arg.startswith("--receivers"):
+        temp,receivers = arg.split("=")
+        receivers = int(receivers)
+    if arg.startswith("--help"):
+        print("help : ")
+        print("  --loops=100000 : the number of notifications to send")
+        print("  --receivers=5 : the number of receivers connected to each signal")
+
+class Receiver(object):
+    """A receiver of value signals"""
+    def __init__(self):
+        self.count = 0
+
+    def value_update(self, network, node, value):
+        self.count += 1
+
+def bench(dispatcher):
+    """Return the time of a notification in us"""
+    connected = [Receiver() for i in range(receivers)]
+    for receiver in connected:
+        dispatcher.connect(receiver.value_update, ZWaveNetwork.SIGNAL_VALUE_CHANGED)
+        dispatcher.connect(receiver.value_update, ZWaveNetwork.SIGNAL_VALUE)
+    def notify():
+        dispatcher.send(ZWaveNetwork.SIGNAL_VALUE_CHANGED, \
+            **{'network': None, 'node': None, 'value': None})
+        dispatcher.send(ZWaveNetwork.SIGNAL_VALUE, \
+            **{'network': None, 'node': None, 'value': None})
+    duration = timeit.timeit(notify, number=loops)
+    for receiver in connected:
+        dispatcher.disconnect(receiver.value_update, ZWaveNetwork.SIGNAL_VALUE_CHANGED)
+        dispatcher.disconnect(receiver.value_update, ZWaveNetwork.SIGNAL_VALUE)
+    return duration * 1000000.0 / loops
+
+print("------------------------------------------------------------")
+print("Dispatch of {} notifications to {} receivers : ".format(loops, receivers))
+print("------------------------------------------------------------")
+print("  louie : {:.3f} us/notification".format(bench(louie_dispatcher)))
+print("  fast  : {:.3f} us/notification".format(bench(FastDispatcher())))
+print("------------------------------------------------------------")
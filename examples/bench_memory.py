@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave wrapper
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+Benchmark of the memory used by the API objects. No controller needed.
+
+Create many values and nodes and report the bytes used by each of them.
+The "dict" lines emulate the objects without __slots__ and with eager cache
+dicts, as they were before.
+
+"""
+
+import sys
+import gc
+import tracemalloc
+
+from openzwave.value import ZWaveValue
+from openzwave.node import ZWaveNode
+
+count = 10000
+
+for arg in sys.argv:
+    if arg.startswith("--count"):
+        temp,count = arg.split("=")
+        count = int(count)
+    if arg.startswith("--help"):
+        print("help : ")
+        print("  --count=10000 : the number of objects to create")
+
+class FakeNetwork(object):
+    """A network which is only used to create objects"""
+    use_cache = True
+
+#The properties a value serves from its cache
+CACHED_PROPERTIES = ('data', 'descriptor', 'instance', 'index', 'is_read_only')
+
+class DictValue(ZWaveValue):
+    """A value with a __dict__ and its cache dicts allocated at creation"""
+    def __init__(self, value_id, network=None, parent=None):
+        ZWaveValue.__init__(self, value_id, network=network, parent=parent)
+        self._cache = dict()
+        for prop in CACHED_PROPERTIES:
+            self.cache_property(prop)
+
+class DictNode(ZWaveNode):
+    """A node with a __dict__ and its cache dict allocated at creation"""
+    def __init__(self, node_id, network):
+        ZWaveNode.__init__(self, node_id, network)
+        self._cached_properties = dict()
+
+def measure(factory):
+    """Return the bytes allocated by object created by factory"""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    end = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    #The list holding the objects
+    size = end - start - sys.getsizeof(objects)
+    del objects
+    return float(size) / count
+
+network = FakeNetwork()
+node = ZWaveNode(1, network)
+print("------------------------------------------------------------")
+print("Memory use for {} objects : ".format(count))
+print("------------------------------------------------------------")
+print("  value (slots) : {:.1f} bytes/value".format(measure(lambda i: ZWaveValue(i, network=network, parent=node))))
+print("  value (dict)  : {:.1f} bytes/value".format(measure(lambda i: DictValue(i, network=network, parent=node))))
+print("  node (slots)  : {:.1f} bytes/node".format(measure(lambda i: ZWaveNode(i, network))))
+print("  node (dict)   : {:.1f} bytes/node".format(measure(lambda i: DictNode(i, network))))
+print("------------------------------------------------------------")
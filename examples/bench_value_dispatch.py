@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave wrapper
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+Benchmark of the dispatch on the type of a value in getValueFromType.
+No controller needed.
+
+The lookup of the ValueID and the dispatch of libopenzwave are compiled
+twice with Cython : the chain of comparisons of the PyValueTypes strings
+(before) and the switch on the ValueType enum (after). The calls to the
+manager are replaced by C functions, so only the dispatch path is measured.
+
+Needs Cython and a C++ compiler : the module is built with pyximport.
+
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+import pyximport
+
+loops = 1000000
+
+for arg in sys.argv:
+    if arg.startswith("--loops"):
+        temp,loops = arg.split("=")
+        loops = int(loops)
+    if arg.startswith("--help"):
+        print("help : ")
+        print("  --loops=1000000 : the number of calls for each value type")
+
+SOURCE = '''
+# distutils: language = c++
+from cython.operator cimport dereference as deref
+from libcpp.map cimport map
+from libcpp cimport bool
+from libc.stdint cimport uint64_t, int32_t, int16_t, uint8_t
+from libcpp.string cimport string
+
+cdef extern from *:
+    """
+    #include <string>
+    enum ValueType { ValueType_Bool = 0, ValueType_Byte, ValueType_Decimal, ValueType_Int,
+        ValueType_List, ValueType_Schedule, ValueType_Short, ValueType_String,
+        ValueType_Button, ValueType_Raw };
+    struct ValueID {
+        ValueType m_type;
+        ValueType GetType() const { return m_type; }
+    };
+    static bool GetValueAsBool(const ValueID& v, bool* o) { *o = true; return true; }
+    static bool GetValueAsByte(const ValueID& v, uint8_t* o) { *o = 99; return true; }
+    static bool GetValueAsFloat(const ValueID& v, float* o) { *o = 21.5; return true; }
+    static bool GetValueAsInt(const ValueID& v, int32_t* o) { *o = 1000; return true; }
+    static bool GetValueAsShort(const ValueID& v, int16_t* o) { *o = 100; return true; }
+    static bool GetValueAsString(const ValueID& v, std::string* o) { *o = "string"; return true; }
+    static bool GetValueListSelection(const ValueID& v, std::string* o) { *o = "item"; return true; }
+    """
+    cdef enum ValueType:
+        ValueType_Bool, ValueType_Byte, ValueType_Decimal, ValueType_Int, ValueType_List,
+        ValueType_Schedule, ValueType_Short, ValueType_String, ValueType_Button, ValueType_Raw
+    cdef cppclass ValueID:
+        ValueType m_type
+        ValueType GetType()
+    bool GetValueAsBool(ValueID& v, bool* o)
+    bool GetValueAsByte(ValueID& v, uint8_t* o)
+    bool GetValueAsFloat(ValueID& v, float* o)
+    bool GetValueAsInt(ValueID& v, int32_t* o)
+    bool GetValueAsShort(ValueID& v, int16_t* o)
+    bool GetValueAsString(ValueID& v, string* o)
+    bool GetValueListSelection(ValueID& v, string* o)
+
+class EnumWithDoc(str):
+    pass
+
+PyValueTypes = [EnumWithDoc(name) for name in ('Bool', 'Byte', 'Decimal', 'Int', 'List',
+    'Schedule', 'Short', 'String', 'Button', 'Raw')]
+
+cdef map[uint64_t, ValueID] values_map
+
+def add_value(uint64_t valueId, int typeInt):
+    cdef ValueID vid
+    vid.m_type = <ValueType>typeInt
+    values_map[valueId] = vid
+
+def get_by_string(valueId):
+    cdef bool type_bool
+    cdef uint8_t type_byte
+    cdef float type_float
+    cdef int32_t type_int
+    cdef int16_t type_short
+    cdef string type_string
+    ret = None
+    if values_map.find(valueId) != values_map.end():
+        datatype = PyValueTypes[values_map.at(valueId).GetType()]
+        if datatype == "Bool":
+            cret = GetValueAsBool(values_map.at(valueId), &type_bool)
+            ret = type_bool if cret else None
+            return ret
+        elif datatype == "Byte":
+            cret = GetValueAsByte(values_map.at(valueId), &type_byte)
+            ret = type_byte if cret else None
+            return ret
+        elif datatype == "Decimal":
+            cret = GetValueAsFloat(values_map.at(valueId), &type_float)
+            ret = type_float if cret else None
+            return ret
+        elif datatype == "Int":
+            cret = GetValueAsInt(values_map.at(valueId), &type_int)
+            ret = type_int if cret else None
+            return ret
+        elif datatype == "Short":
+            cret = GetValueAsShort(values_map.at(valueId), &type_short)
+            ret = type_short if cret else None
+            return ret
+        elif datatype == "String":
+            cret = GetValueAsString(values_map.at(valueId), &type_string)
+            ret = type_string.c_str() if cret else None
+            return ret
+        elif datatype == "Button":
+            cret = GetValueAsBool(values_map.at(valueId), &type_bool)
+            ret = type_bool if cret else None
+            return ret
+        elif datatype == "List":
+            cret = GetValueListSelection(values_map.at(valueId), &type_string)
+            ret = type_string.c_str() if cret else None
+            return ret
+        else :
+            cret = GetValueAsString(values_map.at(valueId), &type_string)
+            ret = type_string.c_str() if cret else None
+    return ret
+
+def get_by_enum(uint64_t valueId):
+    cdef bool type_bool
+    cdef uint8_t type_byte
+    cdef float type_float
+    cdef int32_t type_int
+    cdef int16_t type_short
+    cdef string type_string
+    cdef bool cret
+    cdef map[uint64_t, ValueID].iterator it = values_map.find(valueId)
+    cdef ValueID* vid
+    cdef ValueType datatype
+    ret = None
+    if it != values_map.end():
+        vid = &deref(it).second
+        datatype = vid.GetType()
+        if datatype == ValueType_Bool or datatype == ValueType_Button:
+            cret = GetValueAsBool(deref(vid), &type_bool)
+            ret = type_bool if cret else None
+        elif datatype == ValueType_Byte:
+            cret = GetValueAsByte(deref(vid), &type_byte)
+            ret = type_byte if cret else None
+        elif datatype == ValueType_Decimal:
+            cret = GetValueAsFloat(deref(vid), &type_float)
+            ret = type_float if cret else None
+        elif datatype == ValueType_Int:
+            cret = GetValueAsInt(deref(vid), &type_int)
+            ret = type_int if cret else None
+        elif datatype == ValueType_Short:
+            cret = GetValueAsShort(deref(vid), &type_short)
+            ret = type_short if cret else None
+        elif datatype == ValueType_List:
+            cret = GetValueListSelection(deref(vid), &type_string)
+            ret = type_string.c_str() if cret else None
+        else:
+            cret = GetValueAsString(deref(vid), &type_string)
+            ret = type_string.c_str() if cret else None
+    return ret
+'''
+
+#The value types of the benchmark, in the order of the chain of comparisons
+TYPES = [('Bool', 0), ('Byte', 1), ('Decimal', 2), ('Int', 3), ('Short', 6), ('String', 7), ('Button', 8), ('List', 4)]
+
+build_dir = tempfile.mkdtemp(prefix='pyozw-bench-')
+sys.path.insert(0, build_dir)
+with open(os.path.join(build_dir, 'bench_value_dispatch_ext.pyx'), 'w') as pyx:
+    pyx.write(SOURCE)
+pyximport.install(build_dir=build_dir, language_level=2)
+import bench_value_dispatch_ext as ext
+
+#Many values in the map, as in a real network
+for value_id in range(1000):
+    ext.add_value((value_id << 32) | 0x1000000, TYPES[value_id % len(TYPES)][1])
+
+def bench(func, value_id):
+    """Return the time of a call in ns"""
+    return timeit.timeit(lambda: func(value_id), number=loops) * 1000000000.0 / loops
+
+print("------------------------------------------------------------")
+print("Dispatch of getValueFromType ({} loops) : ".format(loops))
+print("------------------------------------------------------------")
+print("  {:8} {:>12} {:>12} {:>8}".format('type', 'string ns', 'enum ns', 'speedup'))
+for index, (name, type_int) in enumerate(TYPES):
+    value_id = (index << 32) | 0x1000000
+    by_string = bench(ext.get_by_string, value_id)
+    by_enum = bench(ext.get_by_enum, value_id)
+    print("  {:8} {:12.1f} {:12.1f} {:7.2f}x".format(name, by_string, by_enum, by_string / by_enum))
+print("------------------------------------------------------------")
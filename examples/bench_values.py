@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave wrapper
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+Microbenchmark of PyManager.getValue and PyManager.setValue.
+Print the per-call cost for each type of value.
+Run it against two builds of libopenzwave to compare them.
+Needs a controller : bench_value_dispatch.py measures the dispatch on the
+type of the values without one.
+
+"""
+
+import logging
+import sys, os
+import timeit
+
+logging.basicConfig(level=logging.INFO)
+
+logger = logging.getLogger('openzwave')
+
+import openzwave
+from openzwave.network import ZWaveNetwork
+from openzwave.option import ZWaveOption
+
+
+device="/dev/ttyUSB0"
+log="Info"
+loops=10000
+bench_set=False
+
+for arg in sys.argv:
+    if arg.startswith("--device"):
+        temp,device = arg.split("=")
+    elif arg.startswith("--log"):
+        temp,log = arg.split("=")
+    elif arg.startswith("--loops"):
+        temp,loops = arg.split("=")
+        loops = int(loops)
+    elif arg.startswith("--set"):
+        bench_set = True
+    if arg.startswith("--help"):
+        print("help : ")
+        print("  --device=/dev/yourdevice ")
+        print("  --log=Info|Debug")
+        print("  --loops=10000")
+        print("  --set : also bench setValue (send the current value to the nodes)")
+
+#Define some manager options
+options = ZWaveOption(device, \
+  config_path="../openzwave/config", \
+  user_path=".", cmd_line="")
+options.set_log_file("OZW_Log.log")
+options.set_append_log_file(False)
+options.set_console_output(False)
+options.set_save_log_level(log)
+options.set_logging(True)
+options.lock()
+
+#Create a network object
+network = ZWaveNetwork(options, log=None)
+
+print("------------------------------------------------------------")
+print("Waiting for network to become ready : ")
+print("------------------------------------------------------------")
+for i in range(0,90):
+    if network.wait_for_state(network.STATE_READY, timeout=1.0):
+        print(" done")
+        break
+    else:
+        sys.stdout.write(".")
+        sys.stdout.flush()
+if not network.is_ready:
+    print(".")
+    print("Can't start network! Look at the logs in OZW_Log.log")
+    quit(2)
+print("------------------------------------------------------------")
+print("Use openzwave library : {}".format(network.controller.ozw_library_version))
+print("Use python library : {}".format(network.controller.python_library_version))
+print("------------------------------------------------------------")
+manager = network.manager
+#Keep a value of each type
+values_by_type = {}
+for node in network.nodes:
+    for val in network.nodes[node].values:
+        value = network.nodes[node].values[val]
+        if value.type not in values_by_type:
+            values_by_type[value.type] = value
+print("Bench getValue ({} loops) : ".format(loops))
+print("------------------------------------------------------------")
+for vtype in sorted(values_by_type):
+    value_id = values_by_type[vtype].value_id
+    duration = timeit.timeit(lambda: manager.getValue(value_id), number=loops)
+    print("  {:<10} : {:.3f} us/call".format(vtype, duration * 1000000.0 / loops))
+if bench_set:
+    print("------------------------------------------------------------")
+    print("Bench setValue ({} loops) : ".format(loops))
+    print("------------------------------------------------------------")
+    for vtype in sorted(values_by_type):
+        value = values_by_type[vtype]
+        if value.is_read_only or vtype in ('Button', 'Schedule'):
+            continue
+        value_id = value.value_id
+        data = manager.getValue(value_id)
+        duration = timeit.timeit(lambda: manager.setValue(value_id, data), number=loops)
+        print("  {:<10} : {:.3f} us/call".format(vtype, duration * 1000000.0 / loops))
+print("------------------------------------------------------------")
+print("Stop network")
+print("------------------------------------------------------------")
+network.stop()
@@ -106,13 +106,12 @@ network.start()
 #We wait for the network.
 print("***** Waiting for network to become ready : ")
 for i in range(0,90):
-    if network.state>=network.STATE_READY:
+    if network.wait_for_state(network.STATE_READY, timeout=1.0):
         print("***** Network is ready")
         break
     else:
         sys.stdout.write(".")
         sys.stdout.flush()
-        time.sleep(1.0)
 
 time.sleep(5.0)
 
@@ -953,6 +953,7 @@ def install_requires():
          pkgs.append('PyDispatcher>=2.0.5')
     else:
          pkgs.append('Louie>=1.1')
+         pkgs.append('futures')
     pkgs += current_template.install_requires()
     return pkgs
 
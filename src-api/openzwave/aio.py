@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: openzwave.aio
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave API
+
+.. moduleauthor: bibi21000 aka Sébastien GALLET <bibi21000@gmail.com>
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+An asyncio facade of the network. Needs python 3.7+.
+
+The signals are sent from the notification thread of OpenZWave : they are
+handed to the event loop with call_soon_threadsafe, so waiting costs no thread.
+
+.. code-block:: python
+
+        network = AsyncZWaveNetwork(ZWaveNetwork(options, autostart=False))
+        await network.start()
+        await network.wait_ready(timeout=120)
+        async with network.values(command_class=0x25) as events:
+            async for event in events:
+                print(event.node.node_id, event.value.label, event.value.data)
+
+"""
+import asyncio
+import collections
+from openzwave.object import ZWaveException
+from openzwave.network import ZWaveNetwork
+
+# Set default logging handler to avoid "No handler found" warnings.
+import logging
+try:  # Python 2.7+
+    from logging import NullHandler
+except ImportError:
+    class NullHandler(logging.Handler):
+        """NullHandler logger for python 2.6"""
+        def emit(self, record):
+            pass
+logger = logging.getLogger('openzwave')
+logger.addHandler(NullHandler())
+
+#An event of a stream : the signal and its node and value (None for node events)
+ZWaveEvent = collections.namedtuple('ZWaveEvent', ['signal', 'node', 'value'])
+
+def _set_result(future, result):
+    """Resolve a future, unless it has been cancelled (ie by a timeout)"""
+    if not future.done():
+        future.set_result(result)
+
+def _set_exception(future, exception):
+    """Fail a future, unless it has been cancelled (ie by a timeout)"""
+    if not future.done():
+        future.set_exception(exception)
+
+class ZWaveEventStream(object):
+    """
+    An asynchronous iterator over the signals of the network.
+
+    The events are queued in the event loop. When the consumer is too slow
+    and max_queue events are waiting, the oldest one is dropped.
+
+    Close it (or use it with async with) to unsubscribe.
+
+    """
+
+    def __init__(self, network, loop, signals, node_id=None, value_id=None, command_class=None, max_queue=1000):
+        """
+        Initialize the stream and subscribe to the signals.
+
+        :param network: The network
+        :type network: ZWaveNetwork
+        :param loop: The event loop of the consumer
+        :type loop: asyncio.AbstractEventLoop
+        :param signals: The signals to stream
+        :type signals: list of str
+        :param max_queue: The maximum number of events waiting to be read
+        :type max_queue: int
+
+        """
+        self._network = network
+        self._loop = loop
+        self._events = collections.deque(maxlen=max(1, max_queue))
+        self._waiter = None
+        self._closed = False
+        self.dropped = 0
+        self._subscriptions = [network.subscribe(signal, self._on_signal, node_id=node_id, \
+            value_id=value_id, command_class=command_class) for signal in signals]
+
+    def _on_signal(self, signal, node=None, value=None):
+        """
+        Called in the thread sending the signal.
+
+        """
+        self._loop.call_soon_threadsafe(self._put, ZWaveEvent(signal, node, value))
+
+    def _put(self, event):
+        """
+        Called in the event loop.
+
+        """
+        if self._closed:
+            return
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+        if self._waiter is not None:
+            _set_result(self._waiter, None)
+            self._waiter = None
+
+    def close(self):
+        """
+        Unsubscribe from the signals and end the iteration.
+
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for subscription in self._subscriptions:
+            self._network.unsubscribe(subscription)
+        self._subscriptions = []
+        if self._waiter is not None:
+            _set_result(self._waiter, None)
+            self._waiter = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._events:
+            if self._closed:
+                raise StopAsyncIteration
+            self._waiter = self._loop.create_future()
+            await self._waiter
+        return self._events.popleft()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+class AsyncZWaveNetwork(object):
+    """
+    An asyncio facade of a ZWaveNetwork.
+
+    """
+
+    #The signals changing the state of the network
+    _STATE_SIGNALS = (ZWaveNetwork.SIGNAL_NETWORK_FAILED, ZWaveNetwork.SIGNAL_NETWORK_STARTED,
+                      ZWaveNetwork.SIGNAL_NETWORK_AWAKED, ZWaveNetwork.SIGNAL_NETWORK_READY,
+                      ZWaveNetwork.SIGNAL_NETWORK_STOPPED, ZWaveNetwork.SIGNAL_NETWORK_RESETTED)
+    #The signals of the value streams
+    VALUE_SIGNALS = (ZWaveNetwork.SIGNAL_VALUE_ADDED, ZWaveNetwork.SIGNAL_VALUE_CHANGED,
+                     ZWaveNetwork.SIGNAL_VALUE_REFRESHED, ZWaveNetwork.SIGNAL_VALUE_REMOVED)
+    #The signals of the node streams
+    NODE_SIGNALS = (ZWaveNetwork.SIGNAL_NODE,)
+
+    def __init__(self, network, loop=None):
+        """
+        Initialize the facade.
+
+        :param network: The network, created with autostart=False
+        :type network: ZWaveNetwork
+        :param loop: The event loop. None for the loop running the first coroutine of the facade
+        :type loop: asyncio.AbstractEventLoop
+
+        """
+        self._network = network
+        self._loop = loop
+        #The futures waiting for a state of the network
+        self._state_waiters = []
+        self._subscriptions = [network.subscribe(signal, self._on_state_signal) \
+            for signal in self._STATE_SIGNALS]
+
+    @property
+    def network(self):
+        """
+        The network.
+
+        :rtype: ZWaveNetwork
+
+        """
+        return self._network
+
+    @property
+    def state(self):
+        """
+        The state of the network.
+
+        :rtype: int
+
+        """
+        return self._network.state
+
+    def _get_loop(self):
+        """
+        Return the event loop. Without one given to the constructor, it is
+        the running loop : must be called from the event loop.
+
+        :rtype: asyncio.AbstractEventLoop
+
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    def _on_state_signal(self):
+        """
+        Called in the thread sending the signal.
+
+        """
+        loop = self._loop
+        if loop is None:
+            #No coroutine has run yet : nobody is waiting
+            return
+        loop.call_soon_threadsafe(self._check_state)
+
+    def _check_state(self):
+        """
+        Resolve the futures waiting for the current state. Called in the event loop.
+
+        """
+        state = self._network.state
+        waiters = []
+        for target, future in self._state_waiters:
+            if future.done():
+                continue
+            if state >= target:
+                _set_result(future, state)
+            elif state == self._network.STATE_FAILED:
+                _set_exception(future, ZWaveException(u"Network failed"))
+            elif state == self._network.STATE_STOPPED:
+                _set_exception(future, ZWaveException(u"Network stopped"))
+            else:
+                waiters.append((target, future))
+        self._state_waiters = waiters
+
+    async def wait_state(self, state, timeout=None):
+        """
+        Wait until the network reaches state.
+
+        :param state: The state to wait for (ie ZWaveNetwork.STATE_READY)
+        :type state: int
+        :param timeout: The maximum time to wait, in seconds. None to wait forever
+        :type timeout: float
+        :returns: The state of the network
+        :rtype: int
+        :raises: asyncio.TimeoutError, ZWaveException if the network fails or is stopped
+
+        """
+        #Set the loop before reading the state : the signals are dropped without loop
+        loop = self._get_loop()
+        if self._network.state >= state:
+            return self._network.state
+        future = loop.create_future()
+        self._state_waiters.append((state, future))
+        return await asyncio.wait_for(future, timeout)
+
+    async def wait_awake(self, timeout=None):
+        """
+        Wait until all the awake nodes are queried.
+
+        :param timeout: The maximum time to wait, in seconds. None to wait forever
+        :type timeout: float
+        :rtype: int
+
+        """
+        return await self.wait_state(self._network.STATE_AWAKED, timeout=timeout)
+
+    async def wait_ready(self, timeout=None):
+        """
+        Wait until all the nodes are queried.
+
+        :param timeout: The maximum time to wait, in seconds. None to wait forever
+        :type timeout: float
+        :rtype: int
+
+        """
+        return await self.wait_state(self._network.STATE_READY, timeout=timeout)
+
+    async def start(self):
+        """
+        Start the network. Use wait_awake or wait_ready to wait for the nodes.
+
+        """
+        self._network.start()
+
+    async def stop(self):
+        """
+        Stop the network. Run in the default executor of the loop as it waits
+        for the driver.
+
+        """
+        await self._get_loop().run_in_executor(None, self._network.stop)
+
+    def close(self):
+        """
+        Unsubscribe the facade from the network.
+
+        """
+        for subscription in self._subscriptions:
+            self._network.unsubscribe(subscription)
+        self._subscriptions = []
+
+    def values(self, node_id=None, value_id=None, command_class=None, signals=None, max_queue=1000):
+        """
+        Return a stream of the value events, filtered by node, value or command class.
+        Without loop given to the constructor, call it from the event loop.
+
+        :param signals: The signals to stream. None for VALUE_SIGNALS
+        :type signals: list of str
+        :param max_queue: The maximum number of events waiting to be read
+        :type max_queue: int
+        :rtype: ZWaveEventStream
+
+        """
+        return ZWaveEventStream(self._network, self._get_loop(), signals if signals is not None else self.VALUE_SIGNALS, \
+            node_id=node_id, value_id=value_id, command_class=command_class, max_queue=max_queue)
+
+    def nodes(self, node_id=None, signals=None, max_queue=1000):
+        """
+        Return a stream of the node events.
+        Without loop given to the constructor, call it from the event loop.
+
+        :param signals: The signals to stream. None for NODE_SIGNALS
+        :type signals: list of str
+        :param max_queue: The maximum number of events waiting to be read
+        :type max_queue: int
+        :rtype: ZWaveEventStream
+
+        """
+        return ZWaveEventStream(self._network, self._get_loop(), signals if signals is not None else self.NODE_SIGNALS, \
+            node_id=node_id, max_queue=max_queue)
+
+    async def set_value(self, value, data, timeout=None):
+        """
+        Set the data of a value and wait until the node confirms it with a
+        ValueChanged or ValueRefreshed notification.
+
+        :param value: The value to set
+        :type value: ZWaveValue
+        :param data: The new data
+        :type data: variable
+        :param timeout: The maximum time to wait, in seconds. None to wait forever
+        :type timeout: float
+        :returns: The data of the value
+        :raises: ZWaveWriteException if the write is rejected or not confirmed in time
+
+        """
+        return await asyncio.wrap_future(value.set(data, confirm=True, timeout=timeout), loop=self._get_loop())
@@ -268,6 +268,7 @@ class ZWaveNodeBasic(ZWaveNodeInterface):
         is_switch (label) : says if the value with label=label is a switch
         get_switch (label) : retrieve the value where label=label
     """
+    __slots__ = ()
 
 
     def get_battery_level(self, value_id=None):
@@ -429,6 +430,7 @@ class ZWaveNodeSwitch(ZWaveNodeInterface):
     Represents an interface to switches and dimmers Commands
 
     """
+    __slots__ = ()
 
     def get_switches_all(self):
         """
@@ -688,6 +690,7 @@ class ZWaveNodeSensor(ZWaveNodeInterface):
     Represents an interface to Sensor Commands
 
     """
+    __slots__ = ()
 
     def get_sensors(self, type='All'):
         """
@@ -739,6 +742,7 @@ class ZWaveNodeThermostat(ZWaveNodeInterface):
     Represents an interface to Thermostat Commands
 
     """
+    __slots__ = ()
 
     def get_thermostats(self, type='All'):
         """
@@ -891,6 +895,7 @@ class ZWaveNodeSecurity(ZWaveNodeInterface):
     Represents an interface to Security Commands
 
     """
+    __slots__ = ()
 
     def get_protections(self):
         """
@@ -961,6 +966,7 @@ class ZWaveNodeDoorLock(ZWaveNodeInterface):
     """
     Represents an interface to door lock and user codes associated with door locks
     """
+    __slots__ = ()
 
     def get_doorlocks(self):
         """
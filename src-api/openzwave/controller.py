@@ -27,10 +27,8 @@ along with python-openzwave. If not, see http://www.gnu.org/licenses.
 import os, sys
 import six
 if six.PY3:
-    from pydispatch import dispatcher
     from urllib.request import urlopen
 else:
-    from louie import dispatcher
     from urllib2 import urlopen
 import zipfile
 import tempfile
@@ -38,7 +36,7 @@ import threading
 import shutil
 import time
 
-from openzwave.object import ZWaveObject, deprecated
+from openzwave.object import ZWaveObject, deprecated, wait_for
 from libopenzwave import PyStatDriver, PyControllerState
 
 # Set default logging handler to avoid "No handler found" warnings.
@@ -206,6 +204,8 @@ class ZWaveController(ZWaveObject):
         self._timer_statistics = None
         self._interval_statistics = 0.0
         self._ctrl_lock = threading.Lock()
+        #Notified after each notification, as the send queue may have shrunk
+        self._queue_condition = threading.Condition()
         #~ self._manager_last = None
         self._ctrl_last_state = self.STATE_NORMAL
         self._ctrl_last_stateint = self.INT_NORMAL
@@ -221,17 +221,35 @@ class ZWaveController(ZWaveObject):
         self.cancel_command()
         if self._timer_statistics is not None:
             self._timer_statistics.cancel()
-        for i in range(0, 60):
-            if self.send_queue_count <= 0:
-                break
-            else:
-                try:
-                    self._network.network_event.wait(1.0)
-                except AssertionError:
-                    #For gevent AssertionError: Impossible to call blocking function in the event loop callback
-                    pass
+        started = time.time()
+        self.wait_queue_empty(timeout=60)
         self.kill_command()
-        logger.debug(u"Wait for empty send_queue during %s second(s).", i)
+        logger.debug(u"Wait for empty send_queue during %s second(s).", time.time() - started)
+
+    def notify_queue(self):
+        """
+        Wake up the threads waiting for the send queue.
+        Called by the network after each notification.
+
+        """
+        with self._queue_condition:
+            self._queue_condition.notify_all()
+
+    def wait_queue_empty(self, timeout=None):
+        """
+        Wait until the outgoing send queue is empty.
+
+        The queue is checked again after each notification : no notification
+        tells that it is empty, so it is also checked every second.
+
+        :param timeout: The maximum time to wait, in seconds. None to wait forever
+        :type timeout: float
+        :returns: True if the send queue is empty
+        :rtype: bool
+
+        """
+        return wait_for(self._queue_condition, lambda: self.send_queue_count <= 0, \
+            timeout=timeout, interval=1.0)
 
     def __str__(self):
         """
@@ -483,7 +501,7 @@ class ZWaveController(ZWaveObject):
         """
         self._timer_statistics = None
         stats = self.stats
-        dispatcher.send(self.SIGNAL_CONTROLLER_STATS, \
+        self._network._send(self.SIGNAL_CONTROLLER_STATS, \
             **{'controller':self, 'stats':stats})
 
         self._timer_statistics = threading.Timer(self._interval_statistics, self.do_poll_statistics)
@@ -596,7 +614,7 @@ class ZWaveController(ZWaveObject):
 
         """
         self._network.state = self._network.STATE_RESETTED
-        dispatcher.send(self._network.SIGNAL_NETWORK_RESETTED, \
+        self._network._send(self._network.SIGNAL_NETWORK_RESETTED, \
             **{'network':self._network})
         self._network.manager.resetController(self._network.home_id)
         try:
@@ -981,7 +999,7 @@ class ZWaveController(ZWaveObject):
         logger.debug(u'Z-Wave ControllerCommand : %s', args)
 
         if args['controllerState'] == self.STATE_WAITING:
-            dispatcher.send(self._network.SIGNAL_CONTROLLER_WAITING, \
+            self._network._send(self._network.SIGNAL_CONTROLLER_WAITING, \
                 **{'network': self._network, 'controller': self,
                    'state_int': args['controllerStateInt'], 'state': args['controllerState'], 'state_full': args['controllerStateDoc'],
                    })
@@ -994,7 +1012,7 @@ class ZWaveController(ZWaveObject):
         self._ctrl_last_state = args['controllerState']
         self._ctrl_last_stateint = args['controllerStateInt']
 
-        dispatcher.send(self._network.SIGNAL_CONTROLLER_COMMAND, \
+        self._network._send(self._network.SIGNAL_CONTROLLER_COMMAND, \
             **{'network': self._network, 'controller': self,
                'node':self._network.nodes[args['nodeId']] if args['nodeId'] in self._network.nodes else None, 'node_id' : args['nodeId'],
                'state_int': args['controllerStateInt'], 'state': args['controllerState'], 'state_full': args['controllerStateDoc'],
@@ -1007,7 +1025,7 @@ class ZWaveController(ZWaveObject):
         if self._ctrl_lock.acquire(False):
             return True
         else:
-            dispatcher.send(self._network.SIGNAL_CONTROLLER_COMMAND, \
+            self._network._send(self._network.SIGNAL_CONTROLLER_COMMAND, \
                 **{'network': self._network, 'controller': self,
                    'node':self, 'node_id' : self.node_id,
                    'state_int': self.INT_INPROGRESS, 'state': PyControllerState[self.INT_INPROGRESS], 'state_full': PyControllerState[self.INT_INPROGRESS].doc,
@@ -1027,7 +1045,7 @@ class ZWaveController(ZWaveObject):
                 hide_command_buttons()
 
         """
-        dispatcher.send(self._network.SIGNAL_CONTROLLER_COMMAND, \
+        self._network._send(self._network.SIGNAL_CONTROLLER_COMMAND, \
             **{'network': self._network, 'controller': self,
                'node':self, 'node_id' : self.node_id,
                'state_int': self._ctrl_last_stateint, 'state': PyControllerState[self._ctrl_last_stateint], 'state_full': PyControllerState[self._ctrl_last_stateint].doc,
@@ -1347,9 +1365,9 @@ class ZWaveController(ZWaveObject):
         self.ctrl_last_state = state
         self.ctrl_last_message = message
         if state == self.SIGNAL_CTRL_WAITING:
-            dispatcher.send(self.SIGNAL_CTRL_WAITING, \
+            self._network._send(self.SIGNAL_CTRL_WAITING, \
                 **{'state': state, 'message': message, 'network': self._network, 'controller': self})
-        dispatcher.send(self.SIGNAL_CONTROLLER, \
+        self._network._send(self.SIGNAL_CONTROLLER, \
             **{'state': state, 'message': message, 'network': self._network, 'controller': self})
 
 
@@ -0,0 +1,999 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: openzwave.dispatch
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave API
+
+.. moduleauthor: bibi21000 aka Sébastien GALLET <bibi21000@gmail.com>
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+import collections
+import inspect
+import threading
+import time
+import weakref
+from six.moves import queue
+from openzwave.object import ZWaveException
+
+# Set default logging handler to avoid "No handler found" warnings.
+import logging
+try:  # Python 2.7+
+    from logging import NullHandler
+except ImportError:
+    class NullHandler(logging.Handler):
+        """NullHandler logger for python 2.6"""
+        def emit(self, record):
+            pass
+logger = logging.getLogger('openzwave')
+logger.addHandler(NullHandler())
+
+class _Marker(object):
+    """A marker used as a wildcard for signals and senders"""
+    __slots__ = ('_name',)
+
+    def __init__(self, name):
+        self._name = name
+
+    def __repr__(self):
+        return self._name
+
+#Connect to all the signals
+All = _Marker('All')
+#Connect to all the senders
+Any = _Marker('Any')
+#The sender of the signals sent without sender
+Anonymous = _Marker('Anonymous')
+
+def _accepted_arguments(receiver):
+    """
+    Return the names of the keyword arguments accepted by receiver,
+    or None if it accepts all of them (**kwargs).
+
+    :param receiver: The receiver to inspect
+    :type receiver: callable
+    :rtype: frozenset
+
+    """
+    try:
+        if hasattr(inspect, 'signature'):
+            params = inspect.signature(receiver).parameters.values()
+            if any([param.kind == param.VAR_KEYWORD for param in params]):
+                return None
+            return frozenset([param.name for param in params \
+                if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)])
+        if not inspect.isfunction(receiver) and not inspect.ismethod(receiver):
+            receiver = receiver.__call__
+        spec = inspect.getargspec(receiver)
+        if spec.keywords is not None:
+            return None
+        return frozenset(spec.args)
+    except (TypeError, ValueError):
+        return None
+
+class _WeakMethod(object):
+    """A weak reference to a bound method"""
+    __slots__ = ('_self', '_func')
+
+    def __init__(self, method, callback):
+        self._self = weakref.ref(method.__self__, callback)
+        self._func = method.__func__
+
+    def __call__(self):
+        obj = self._self()
+        if obj is None:
+            return None
+        return self._func.__get__(obj, type(obj))
+
+class _StrongRef(object):
+    """A strong reference with the interface of a weak one"""
+    __slots__ = ('_receiver',)
+
+    def __init__(self, receiver):
+        self._receiver = receiver
+
+    def __call__(self):
+        return self._receiver
+
+def _receiver_key(receiver):
+    """
+    Return the key identifying a receiver. A bound method is identified by its
+    object and its function, as a new one is created on each access.
+
+    """
+    if inspect.ismethod(receiver) and receiver.__self__ is not None:
+        return (id(receiver.__self__), id(receiver.__func__))
+    return id(receiver)
+
+class _Receiver(object):
+    """A receiver connected to a signal"""
+    __slots__ = ('key', 'ref', 'sender', 'arguments', 'with_signal', 'with_sender')
+
+    def __init__(self, key, ref, sender, arguments):
+        self.key = key
+        self.ref = ref
+        self.sender = sender
+        self.arguments = arguments
+        self.with_signal = arguments is None or 'signal' in arguments
+        self.with_sender = arguments is None or 'sender' in arguments
+
+class FastDispatcher(object):
+    """
+    A signal dispatcher compatible with the connect, disconnect and send
+    functions of louie and pydispatch.
+
+    The receivers of each signal are bound in a tuple on first send and the
+    arguments accepted by a receiver are inspected once, when it is connected.
+    A send only walks this tuple.
+
+    .. code-block:: python
+
+            from openzwave.dispatch import FastDispatcher
+            dispatcher = FastDispatcher()
+            dispatcher.connect(louie_value_update, ZWaveNetwork.SIGNAL_VALUE)
+            network = ZWaveNetwork(options, dispatcher=dispatcher)
+
+    """
+
+    def __init__(self):
+        """
+        Initialize the dispatcher.
+
+        """
+        #Reentrant : a receiver can be garbage collected while the lock is held
+        self._lock = threading.RLock()
+        #The receivers of each signal, in the order of connection
+        self._receivers = {}
+        #The receivers bound for each signal, All included
+        self._bound = {}
+
+    def connect(self, receiver, signal=All, sender=Any, weak=True):
+        """
+        Connect receiver to signal.
+
+        :param receiver: The callable to call when the signal is sent
+        :type receiver: callable
+        :param signal: The signal to connect to. All for all the signals
+        :type signal: str
+        :param sender: Only receive the signals of this sender. Any for all
+        :type sender: object
+        :param weak: Keep a weak reference to the receiver : it is disconnected when it is garbage collected
+        :type weak: bool
+
+        """
+        key = _receiver_key(receiver)
+        ref = None
+        if weak:
+            callback = lambda dead, key=key: self._disconnect_dead(key)
+            try:
+                if inspect.ismethod(receiver) and receiver.__self__ is not None:
+                    ref = _WeakMethod(receiver, callback)
+                else:
+                    ref = weakref.ref(receiver, callback)
+            except TypeError:
+                ref = None
+        if ref is None:
+            ref = _StrongRef(receiver)
+        entry = _Receiver(key, ref, sender, _accepted_arguments(receiver))
+        with self._lock:
+            receivers = [rec for rec in self._receivers.get(signal, ()) \
+                if rec.key != key or rec.sender is not sender]
+            receivers.append(entry)
+            self._receivers[signal] = receivers
+            self._bound = {}
+
+    def disconnect(self, receiver, signal=All, sender=Any, weak=True):
+        """
+        Disconnect receiver from signal.
+
+        :param receiver: The callable to disconnect
+        :type receiver: callable
+        :param signal: The signal to disconnect from
+        :type signal: str
+        :param sender: The sender used to connect
+        :type sender: object
+        :param weak: Not used. For compatibility with louie
+        :type weak: bool
+
+        """
+        key = _receiver_key(receiver)
+        with self._lock:
+            receivers = [rec for rec in self._receivers.get(signal, ()) \
+                if rec.key != key or rec.sender is not sender]
+            if receivers:
+                self._receivers[signal] = receivers
+            elif signal in self._receivers:
+                del self._receivers[signal]
+            self._bound = {}
+
+    def _disconnect_dead(self, key):
+        """
+        Remove a receiver which has been garbage collected from all the signals.
+
+        """
+        with self._lock:
+            for signal in list(self._receivers.keys()):
+                receivers = [rec for rec in self._receivers[signal] if rec.key != key]
+                if receivers:
+                    self._receivers[signal] = receivers
+                else:
+                    del self._receivers[signal]
+            self._bound = {}
+
+    def _bind(self, signal):
+        """
+        Build the tuple of the receivers of a signal.
+
+        """
+        with self._lock:
+            bound = tuple(self._receivers.get(signal, ()))
+            if signal is not All:
+                bound += tuple(self._receivers.get(All, ()))
+            self._bound[signal] = bound
+        return bound
+
+    def receivers(self, signal=All):
+        """
+        Return the live receivers connected to signal.
+
+        :param signal: The signal
+        :type signal: str
+        :rtype: list
+
+        """
+        bound = self._bound.get(signal)
+        if bound is None:
+            bound = self._bind(signal)
+        return [receiver for receiver in [rec.ref() for rec in bound] if receiver is not None]
+
+    def send(self, signal=All, sender=Anonymous, *arguments, **named):
+        """
+        Send signal to its receivers.
+
+        Each receiver is called with the named arguments it accepts,
+        signal and sender included.
+
+        :param signal: The signal to send
+        :type signal: str
+        :param sender: The sender of the signal
+        :type sender: object
+        :returns: The responses of the receivers
+        :rtype: list of (receiver, response)
+
+        """
+        bound = self._bound.get(signal)
+        if bound is None:
+            bound = self._bind(signal)
+        responses = []
+        for rec in bound:
+            if rec.sender is not Any and rec.sender is not sender:
+                continue
+            receiver = rec.ref()
+            if receiver is None:
+                continue
+            if rec.arguments is None:
+                kwargs = dict(named)
+            else:
+                kwargs = dict([(name, named[name]) for name in rec.arguments if name in named])
+            if rec.with_signal:
+                kwargs['signal'] = signal
+            if rec.with_sender:
+                kwargs['sender'] = sender
+            responses.append((receiver, receiver(*arguments, **kwargs)))
+        return responses
+
+class DeliveryPolicy(object):
+    """
+    Buffer the signals of a subscription and deliver them from its own thread,
+    so that a slow subscriber never blocks the thread sending the signals.
+
+    The subclasses choose what to keep when the subscriber can't keep up.
+
+    :see: SignalRouter.subscribe
+
+    """
+
+    def __init__(self):
+        """
+        Initialize the policy.
+
+        """
+        self._condition = threading.Condition()
+        self._deliver = None
+        self._thread = None
+        self._stopped = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def start(self, deliver):
+        """
+        Start the delivery thread. A policy is used by one subscription only.
+
+        :param deliver: The function called with the signal and its named arguments
+        :type deliver: callable
+        :raises ZWaveException: if the policy is already started or stopped
+
+        """
+        with self._condition:
+            if self._thread is not None:
+                raise ZWaveException(u"Policy %s is already started" % self)
+            if self._stopped:
+                raise ZWaveException(u"Policy %s is stopped" % self)
+            self._deliver = deliver
+            self._thread = threading.Thread(target=self._run, name='openzwave-policy')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stop the delivery thread. The pending signals are dropped.
+
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def push(self, signal, named, key):
+        """
+        Buffer a signal. Never blocks.
+
+        :param signal: The signal
+        :type signal: str
+        :param named: The named arguments of the signal
+        :type named: dict()
+        :param key: The id of the value of the signal. None if the signal has no value
+        :type key: int
+
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            if self._put((signal, named), key):
+                self._condition.notify()
+
+    def _put(self, item, key):
+        """
+        Add an item to the buffer and update the counters.
+        Return True if the delivery thread must be woken up.
+
+        """
+        raise NotImplementedError()
+
+    def _pop(self):
+        """
+        Remove the next item to deliver from the buffer. None if it is empty.
+
+        """
+        raise NotImplementedError()
+
+    def _pending(self):
+        """
+        The number of items in the buffer.
+
+        """
+        raise NotImplementedError()
+
+    def _timeout(self):
+        """
+        The time before an item of the buffer is ready, in seconds. None to wait for a new item.
+
+        """
+        return None
+
+    def _run(self):
+        """
+        The loop of the delivery thread.
+
+        """
+        while True:
+            with self._condition:
+                item = self._pop()
+                while item is None and not self._stopped:
+                    self._condition.wait(self._timeout())
+                    item = self._pop()
+                if self._stopped:
+                    return
+            try:
+                self._deliver(item[0], item[1])
+            except Exception:
+                logger.exception(u'Error in subscription delivered by %s', self)
+            with self._condition:
+                self.delivered += 1
+
+    def metrics(self):
+        """
+        Return the counters of the policy :
+
+            * pending : the number of signals waiting to be delivered
+            * delivered : the number of signals delivered
+            * dropped : the number of signals dropped
+            * coalesced : the number of signals replaced by a newer one of the same value
+
+        :rtype: dict()
+
+        """
+        with self._condition:
+            return {'pending': self._pending(), 'delivered': self.delivered,
+                    'dropped': self.dropped, 'coalesced': self.coalesced}
+
+class DropOldestPolicy(DeliveryPolicy):
+    """
+    Keep at most max_queue signals : when the queue is full, the oldest one is dropped.
+
+    """
+
+    def __init__(self, max_queue=100):
+        """
+        Initialize the policy.
+
+        :param max_queue: The maximum number of signals waiting to be delivered
+        :type max_queue: int
+
+        """
+        DeliveryPolicy.__init__(self)
+        self._queue = collections.deque(maxlen=max(1, max_queue))
+
+    def _put(self, item, key):
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(item)
+        return True
+
+    def _pop(self):
+        if self._queue:
+            return self._queue.popleft()
+        return None
+
+    def _pending(self):
+        return len(self._queue)
+
+class CoalescePolicy(DeliveryPolicy):
+    """
+    Keep only the latest signal of each value : a signal replaces the pending
+    one of the same value, at its place in the queue. The signals without value
+    are never coalesced. When max_queue is reached, the oldest signal is dropped.
+
+    """
+
+    def __init__(self, max_queue=None):
+        """
+        Initialize the policy.
+
+        :param max_queue: The maximum number of signals waiting to be delivered. None for no limit
+        :type max_queue: int
+
+        """
+        DeliveryPolicy.__init__(self)
+        self._max_queue = max_queue
+        self._queue = collections.OrderedDict()
+        self._sequence = 0
+
+    def _put(self, item, key):
+        if key is not None and key in self._queue:
+            self._queue[key] = item
+            self.coalesced += 1
+            return False
+        if key is None:
+            #A key which can't be an id of value
+            self._sequence += 1
+            key = (None, self._sequence)
+        if self._max_queue is not None and len(self._queue) >= self._max_queue:
+            self._queue.popitem(last=False)
+            self.dropped += 1
+        self._queue[key] = item
+        return True
+
+    def _pop(self):
+        if self._queue:
+            return self._queue.popitem(last=False)[1]
+        return None
+
+    def _pending(self):
+        return len(self._queue)
+
+class SamplePolicy(DeliveryPolicy):
+    """
+    Deliver at most one signal of each value per interval : the latest signal
+    received during the interval is held and delivered when it expires, the
+    other ones are coalesced. The signals without value are always delivered.
+
+    """
+
+    def __init__(self, interval=1.0, max_queue=100):
+        """
+        Initialize the policy.
+
+        :param interval: The minimal time between two signals of a value, in seconds
+        :type interval: float
+        :param max_queue: The maximum number of signals waiting to be delivered
+        :type max_queue: int
+
+        """
+        DeliveryPolicy.__init__(self)
+        self._interval = interval
+        self._last = {}
+        self._held = {}
+        self._queue = collections.deque(maxlen=max(1, max_queue))
+
+    def _append(self, item):
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(item)
+
+    def _put(self, item, key):
+        if key is not None:
+            if key in self._held:
+                self._held[key] = item
+                self.coalesced += 1
+                return False
+            now = time.time()
+            if now - self._last.get(key, 0.0) < self._interval:
+                #Wake up the delivery thread to wait for the end of the interval
+                self._held[key] = item
+                return True
+            self._last[key] = now
+        self._append(item)
+        return True
+
+    def _pop(self):
+        if self._held:
+            now = time.time()
+            for key in [key for key in self._held if now - self._last[key] >= self._interval]:
+                self._last[key] = now
+                self._append(self._held.pop(key))
+        if self._queue:
+            return self._queue.popleft()
+        return None
+
+    def _pending(self):
+        return len(self._queue) + len(self._held)
+
+    def _timeout(self):
+        if not self._held:
+            return None
+        end = min(self._last[key] for key in self._held) + self._interval
+        return max(0.0, end - time.time())
+
+class Subscription(object):
+    """
+    A callback subscribed to a signal with filters on the node, the value or the
+    command class.
+
+    :see: SignalRouter.subscribe
+
+    """
+    __slots__ = ('signal', 'callback', 'node_id', 'value_id', 'command_class', 'policy', '_arguments')
+
+    def __init__(self, signal, callback, node_id=None, value_id=None, command_class=None, policy=None):
+        self.signal = signal
+        self.callback = callback
+        self.node_id = node_id
+        self.value_id = value_id
+        self.command_class = command_class
+        self.policy = policy
+        self._arguments = _accepted_arguments(callback)
+
+    def accepts(self, node_id, value_id, command_class):
+        """
+        Check the filters of the subscription.
+
+        :rtype: bool
+
+        """
+        return (self.node_id is None or self.node_id == node_id) and \
+            (self.value_id is None or self.value_id == value_id) and \
+            (self.command_class is None or self.command_class == command_class)
+
+    def deliver(self, signal, named):
+        """
+        Call the callback with the named arguments it accepts, signal included.
+
+        """
+        if self._arguments is None:
+            kwargs = dict(named)
+            kwargs['signal'] = signal
+        else:
+            kwargs = dict([(name, named[name]) for name in self._arguments if name in named])
+            if 'signal' in self._arguments:
+                kwargs['signal'] = signal
+        return self.callback(**kwargs)
+
+    def __repr__(self):
+        return 'Subscription(%r, node_id=%r, value_id=%r, command_class=%r)' % \
+            (self.signal, self.node_id, self.value_id, self.command_class)
+
+class SignalRouter(object):
+    """
+    Route the signals to the subscriptions filtered by node, value or command class.
+
+    The subscriptions of a signal are indexed in routing tables by their most
+    selective filter : value, then node, then command class. A signal only reaches
+    the subscriptions of its value, its node and its command class.
+
+    """
+
+    def __init__(self):
+        """
+        Initialize the router.
+
+        """
+        self._lock = threading.RLock()
+        #The routing tables of each signal, replaced on each change
+        self._tables = {}
+
+    def __contains__(self, signal):
+        return signal in self._tables
+
+    def subscribe(self, signal, callback, node_id=None, value_id=None, command_class=None, policy=None):
+        """
+        Subscribe callback to signal. The callback is called with the named
+        arguments of the signal it accepts.
+        With a policy, the callback is called from the thread of the policy.
+
+        :param signal: The signal to subscribe to (ie ZWaveNetwork.SIGNAL_VALUE)
+        :type signal: str
+        :param callback: The callable to call when the signal is sent
+        :type callback: callable
+        :param node_id: Only receive the signals of this node
+        :type node_id: int
+        :param value_id: Only receive the signals of this value
+        :type value_id: int
+        :param command_class: Only receive the signals of the values of this command class
+        :type command_class: int
+        :param policy: The policy used when the callback can't keep up. None to call it directly
+        :type policy: DeliveryPolicy
+        :returns: The subscription, to use with unsubscribe
+        :rtype: Subscription
+
+        """
+        subscription = Subscription(signal, callback, node_id=node_id, value_id=value_id, command_class=command_class, policy=policy)
+        if policy is not None:
+            policy.start(subscription.deliver)
+        with self._lock:
+            table = self._copy_table(signal)
+            key, keys = self._routing_key(subscription)
+            if key is None:
+                table['all'] = table['all'] + (subscription,)
+            else:
+                table[key][keys] = table[key].get(keys, ()) + (subscription,)
+            if command_class is not None:
+                table['with_command_class'] += 1
+            self._tables[signal] = table
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscription.
+
+        :param subscription: The subscription returned by subscribe
+        :type subscription: Subscription
+
+        """
+        if subscription.policy is not None:
+            subscription.policy.stop()
+        with self._lock:
+            if subscription.signal not in self._tables:
+                return
+            table = self._copy_table(subscription.signal)
+            key, keys = self._routing_key(subscription)
+            if key is None:
+                if subscription not in table['all']:
+                    return
+                table['all'] = tuple([sub for sub in table['all'] if sub is not subscription])
+            else:
+                if subscription not in table[key].get(keys, ()):
+                    return
+                subscriptions = tuple([sub for sub in table[key][keys] if sub is not subscription])
+                if subscriptions:
+                    table[key][keys] = subscriptions
+                else:
+                    del table[key][keys]
+            if subscription.command_class is not None:
+                table['with_command_class'] -= 1
+            if table['all'] or table['value_id'] or table['node_id'] or table['command_class']:
+                self._tables[subscription.signal] = table
+            else:
+                del self._tables[subscription.signal]
+
+    def _copy_table(self, signal):
+        """
+        Return a copy of the routing table of a signal, to be modified and replaced.
+
+        """
+        table = self._tables.get(signal)
+        if table is None:
+            return {'all': (), 'value_id': {}, 'node_id': {}, 'command_class': {}, 'with_command_class': 0}
+        return {'all': table['all'], 'value_id': dict(table['value_id']),
+                'node_id': dict(table['node_id']), 'command_class': dict(table['command_class']),
+                'with_command_class': table['with_command_class']}
+
+    def _routing_key(self, subscription):
+        """
+        Return the table and the key where the subscription is indexed.
+
+        """
+        if subscription.value_id is not None:
+            return 'value_id', subscription.value_id
+        if subscription.node_id is not None:
+            return 'node_id', subscription.node_id
+        if subscription.command_class is not None:
+            return 'command_class', subscription.command_class
+        return None, None
+
+    def route(self, signal, named):
+        """
+        Deliver a signal to its subscriptions. The node, value and command class
+        are read from the node, value, node_id and valueId arguments of the signal.
+
+        :param signal: The signal sent
+        :type signal: str
+        :param named: The named arguments of the signal
+        :type named: dict()
+
+        """
+        table = self._tables.get(signal)
+        if table is None:
+            return
+        node = named.get('node')
+        value = named.get('value')
+        node_id = node.node_id if node is not None else named.get('node_id')
+        value_id = value.value_id if value is not None else named.get('valueId')
+        command_class = None
+        if value is not None and table['with_command_class'] > 0:
+            command_class = value.command_class
+        subscriptions = table['all']
+        if value_id is not None and value_id in table['value_id']:
+            subscriptions = subscriptions + table['value_id'][value_id]
+        if node_id is not None and node_id in table['node_id']:
+            subscriptions = subscriptions + table['node_id'][node_id]
+        if command_class is not None and command_class in table['command_class']:
+            subscriptions = subscriptions + table['command_class'][command_class]
+        for subscription in subscriptions:
+            if subscription.accepts(node_id, value_id, command_class):
+                if subscription.policy is not None:
+                    subscription.policy.push(signal, named, value_id)
+                    continue
+                try:
+                    subscription.deliver(signal, named)
+                except Exception:
+                    logger.exception(u'Error in subscription %s', subscription)
+
+class _WorkQueue(queue.Queue):
+    """
+    The queue of a worker of DispatchExecutor.
+
+    """
+
+    def put_overflow(self, item):
+        """
+        Put an item without waiting for room : the queue can grow over its maxsize.
+        Used by a worker to queue work to itself.
+
+        """
+        with self.not_full:
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+class DispatchExecutor(object):
+    """
+    Deliver the signals of the network from worker threads, so that slow
+    handlers don't stall the notification thread of OpenZWave.
+
+    The signals of a node are always delivered by the same worker, in the order
+    they were sent. The signals without node are delivered by the first worker.
+    Each worker has a bounded queue : when it is full, the notification thread
+    waits for room. A signal sent by a handler to its own worker is queued
+    without waiting, over the bound : waiting for room would deadlock.
+
+    The executor belongs to the application, which may share it between
+    networks : the network doesn't stop it. Stop it after destroying the network,
+    not from a handler. The signals sent after stop are delivered by the sending thread.
+
+    .. code-block:: python
+
+            executor = DispatchExecutor(workers=4, max_queue=1000)
+            network = ZWaveNetwork(options, executor=executor)
+            ...
+            print(executor.metrics())
+            network.destroy()
+            executor.stop()
+
+    """
+
+    def __init__(self, workers=4, max_queue=1000):
+        """
+        Initialize the executor and start the workers.
+
+        :param workers: The number of worker threads
+        :type workers: int
+        :param max_queue: The maximum number of signals waiting in the queue of each worker
+        :type max_queue: int
+
+        """
+        self._workers = max(1, workers)
+        self._max_queue = max_queue
+        self._lock = threading.Lock()
+        self._queues = [_WorkQueue(max_queue) for i in range(self._workers)]
+        self._submitted = 0
+        self._delivered = 0
+        self._errors = 0
+        self._max_depth = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._handler_total = 0.0
+        self._handler_max = 0.0
+        self._stopped = False
+        #Protect _stopped and the number of submit putting in the queues
+        self._submit_condition = threading.Condition()
+        self._submitting = 0
+        self._threads = []
+        for i in range(self._workers):
+            thread = threading.Thread(target=self._run, args=(self._queues[i],), name='openzwave-dispatch-%s' % i)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self, key):
+        """
+        Return the index of the worker of a key.
+
+        """
+        if key is None:
+            return 0
+        return hash(key) % self._workers
+
+    def submit(self, key, func, *args, **kwargs):
+        """
+        Queue a call to func in the worker of key. When the caller is this
+        worker, the call is queued without waiting for room. When the executor
+        is stopped, the call is made by the caller, after the queued ones.
+
+        :param key: The key used to order the calls, ie the node id. None for the first worker
+        :type key: hashable
+        :param func: The function to call
+        :type func: callable
+
+        """
+        index = self._worker(key)
+        with self._submit_condition:
+            stopped = self._stopped
+            if not stopped:
+                #stop waits for the calls being queued before queueing its markers
+                self._submitting += 1
+        if stopped:
+            thread = self._threads[index]
+            if thread is not threading.current_thread():
+                #Deliver after the signals queued before stop
+                thread.join()
+            with self._lock:
+                self._submitted += 1
+            self._call(time.time(), func, args, kwargs)
+            return
+        work_queue = self._queues[index]
+        try:
+            if self._threads[index] is threading.current_thread():
+                work_queue.put_overflow((time.time(), func, args, kwargs))
+            else:
+                work_queue.put((time.time(), func, args, kwargs))
+        finally:
+            with self._submit_condition:
+                self._submitting -= 1
+                if self._submitting == 0:
+                    self._submit_condition.notify_all()
+        depth = work_queue.qsize()
+        with self._lock:
+            self._submitted += 1
+            if depth > self._max_depth:
+                self._max_depth = depth
+
+    def _call(self, submitted, func, args, kwargs):
+        """
+        Call func and update the metrics.
+
+        """
+        started = time.time()
+        error = False
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            error = True
+            logger.exception(u'Error in dispatched handler %s', func)
+        ended = time.time()
+        with self._lock:
+            self._delivered += 1
+            if error:
+                self._errors += 1
+            self._wait_total += started - submitted
+            self._wait_max = max(self._wait_max, started - submitted)
+            self._handler_total += ended - started
+            self._handler_max = max(self._handler_max, ended - started)
+
+    def _run(self, work_queue):
+        """
+        The loop of a worker.
+
+        """
+        while True:
+            item = work_queue.get()
+            try:
+                if item is None:
+                    return
+                self._call(*item)
+            finally:
+                work_queue.task_done()
+
+    def join(self):
+        """
+        Wait until all the queued signals are delivered.
+        When called from a handler, don't wait for the queue of its own worker.
+
+        """
+        current = threading.current_thread()
+        for work_queue, thread in zip(self._queues, self._threads):
+            if thread is not current:
+                work_queue.join()
+
+    def stop(self):
+        """
+        Deliver the queued signals and stop the workers.
+        The signals submitted after are delivered by the sending thread.
+
+        """
+        with self._submit_condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            #The markers must be queued after the signals already submitted
+            while self._submitting > 0:
+                self._submit_condition.wait()
+        for work_queue in self._queues:
+            work_queue.put(None)
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def metrics(self):
+        """
+        Return the metrics of the executor : queue depths and latencies, in seconds.
+
+            * submitted, delivered, errors : the number of signals
+            * queue_depth : the number of signals waiting in the queue of each worker
+            * max_queue_depth : the highest depth seen in a queue
+            * wait_avg, wait_max : the time spent by the signals in the queues
+            * handler_avg, handler_max : the time spent in the handlers
+
+        :rtype: dict()
+
+        """
+        with self._lock:
+            delivered = self._delivered
+            return {'submitted': self._submitted,
+                    'delivered': delivered,
+                    'errors': self._errors,
+                    'queue_depth': [work_queue.qsize() for work_queue in self._queues],
+                    'max_queue_depth': self._max_depth,
+                    'wait_avg': self._wait_total / delivered if delivered else 0.0,
+                    'wait_max': self._wait_max,
+                    'handler_avg': self._handler_total / delivered if delivered else 0.0,
+                    'handler_max': self._handler_max,
+                   }
@@ -43,6 +43,7 @@ class ZWaveGroup(ZWaveObject):
     Hold options of the manager
     Also used to retrieve information about the library, ...
     """
+    __slots__ = ('_node_id', '_index')
 
     def __init__(self, group_index, network=None, node_id=None):
         """
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: openzwave.kvals
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave API
+
+.. moduleauthor: bibi21000 aka Sébastien GALLET <bibi21000@gmail.com>
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+The key/values of the objects (kvals), stored in a sqlite database.
+
+"""
+import threading
+import six
+
+# Set default logging handler to avoid "No handler found" warnings.
+import logging
+try:  # Python 2.7+
+    from logging import NullHandler
+except ImportError:
+    class NullHandler(logging.Handler):
+        """NullHandler logger for python 2.6"""
+        def emit(self, record):
+            pass
+logger = logging.getLogger('openzwave')
+logger.addHandler(NullHandler())
+
+try:
+    import sqlite3 as lite
+except ImportError:
+    logger.warning('pysqlite is not installed')
+
+def _stored(value):
+    """
+    Return value as it is read back from the database : the value column
+    is TEXT, so numbers are stored as text.
+
+    """
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, six.integer_types + (float,)):
+        return six.text_type(value)
+    return value
+
+class ZWaveKvalsStore(object):
+    """
+    The kvals of the objects, one table by class.
+
+    Reads are served from a dict in memory : a table is loaded from the
+    database, in one query, the first time one of its objects is read.
+    Writes update the dict and are queued : a write-behind thread coalesces
+    them and flushes them in one transaction every flush_interval seconds.
+    Call flush to write them immediately.
+
+    """
+
+    #The tables created at startup
+    TABLES = ('ZWaveOption', 'ZWaveOptionSingleton', 'ZWaveNetwork', 'ZWaveNetworkSingleton', \
+        'ZWaveNode', 'ZWaveController', 'ZWaveValue', 'ZWaveScene')
+
+    def __init__(self, path, flush_interval=0.5):
+        """
+        Open the database and start the write-behind thread.
+
+        :param path: The path of the sqlite database
+        :type path: str
+        :param flush_interval: The time the changes are coalesced before being written, in seconds
+        :type flush_interval: float
+        :raises: sqlite3.Error
+
+        """
+        self._connection = lite.connect(path, check_same_thread=False)
+        #Serialize the use of the connection and the order of the flushes
+        self._db_lock = threading.RLock()
+        #Protect the cache and the pending changes, notified when changes are pending
+        self._lock = threading.Condition()
+        #{table : {object_id : {key : value}}}
+        self._cache = {}
+        #The tables loaded in the cache
+        self._loaded = set()
+        #{(table, object_id, key) : value}, None to delete the key
+        self._pending = {}
+        self._tables = set()
+        self._flush_interval = flush_interval
+        self._stopped = False
+        self.flushes = 0
+        self.flushed = 0
+        if lite.sqlite_version_info >= (3, 24, 0):
+            self._upsert = "INSERT INTO %s(object_id, key, value) VALUES (?,?,?) " \
+                "ON CONFLICT(object_id, key) DO UPDATE SET value=excluded.value"
+        else:
+            self._upsert = "INSERT OR REPLACE INTO %s(object_id, key, value) VALUES (?,?,?)"
+        cur = self._connection.cursor()
+        self.version = cur.execute('SELECT SQLITE_VERSION()').fetchone()[0]
+        cur.execute('PRAGMA journal_mode=WAL')
+        cur.execute('PRAGMA synchronous=NORMAL')
+        self.check_tables()
+        self._thread = threading.Thread(target=self._run, name='openzwave-kvals')
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def connection(self):
+        """
+        The connection to the database. Changes made through it bypass the
+        dict in memory.
+
+        :rtype: sqlite3.Connection
+
+        """
+        return self._connection
+
+    def check_tables(self, tables=None):
+        """
+        Check that the tables for "classes" are in database.
+
+        :param tables: The tables to check. None for TABLES
+        :type tables: list of str
+        :returns: True if operation succeed
+        :rtype: boolean
+
+        """
+        with self._db_lock:
+            with self._connection:
+                cur = self._connection.cursor()
+                for table in tables if tables is not None else self.TABLES:
+                    self._check_table(cur, table)
+        return True
+
+    def _check_table(self, cur, table):
+        """
+        Create the table, or migrate a table of an older release (without
+        primary key) keeping the last value of each key.
+
+        """
+        cur.execute("PRAGMA table_info(%s)" % table)
+        columns = cur.fetchall()
+        if len(columns) == 0:
+            cur.execute("CREATE TABLE %s(object_id INT, key TEXT, value TEXT, PRIMARY KEY(object_id, key))" % table)
+        elif not any([column[5] for column in columns]):
+            logger.info(u"Add a primary key to kvals table %s", table)
+            cur.execute("ALTER TABLE %s RENAME TO %s_old" % (table, table))
+            cur.execute("CREATE TABLE %s(object_id INT, key TEXT, value TEXT, PRIMARY KEY(object_id, key))" % table)
+            cur.execute("INSERT OR REPLACE INTO %s(object_id, key, value) " \
+                "SELECT object_id, key, value FROM %s_old ORDER BY rowid" % (table, table))
+            cur.execute("DROP TABLE %s_old" % table)
+        self._tables.add(table)
+
+    def _load_table(self, table):
+        """
+        Load all the kvals of a table in the cache, in one query.
+        The objects already in the cache keep their kvals.
+
+        """
+        with self._db_lock:
+            if table in self._loaded:
+                return
+            if table not in self._tables:
+                self.check_tables([table])
+            cur = self._connection.cursor()
+            cur.execute("SELECT object_id,key,value FROM %s" % table)
+            rows = {}
+            for object_id, key, value in cur.fetchall():
+                rows.setdefault(object_id, {})[key] = value
+            with self._lock:
+                cache = self._cache.setdefault(table, {})
+                for object_id in rows:
+                    cache.setdefault(object_id, rows[object_id])
+                self._loaded.add(table)
+
+    def _load(self, table):
+        """
+        Return the kvals of the table in the cache, loading it on the first call.
+        Only the objects having kvals are in the cache.
+
+        """
+        if table not in self._loaded:
+            self._load_table(table)
+        return self._cache[table]
+
+    def get_table(self, table, object_ids=None):
+        """
+        The kvals of the objects of a table, loaded in one query.
+
+        :param table: The table (a class name)
+        :type table: str
+        :param object_ids: The ids of the objects to return. None for all the objects
+        :type object_ids: list of int
+        :returns: The kvals of the objects having kvals, by object_id
+        :rtype: dict()
+
+        """
+        cache = self._load(table)
+        with self._lock:
+            if object_ids is None:
+                object_ids = list(cache.keys())
+            return dict([(object_id, dict(cache[object_id])) for object_id in object_ids if object_id in cache])
+
+    def get(self, table, object_id):
+        """
+        The kvals of an object.
+
+        :param table: The table of the object (its class name)
+        :type table: str
+        :param object_id: The id of the object
+        :type object_id: int
+        :rtype: dict()
+
+        """
+        cache = self._load(table)
+        with self._lock:
+            return dict(cache.get(object_id, {}))
+
+    def set(self, table, object_id, kvs):
+        """
+        Update the kvals of an object. They are written by the write-behind thread.
+
+        :param table: The table of the object (its class name)
+        :type table: str
+        :param object_id: The id of the object
+        :type object_id: int
+        :param kvs: The key/values to store. Setting a value to None will remove it.
+        :type kvs: dict()
+
+        """
+        cache = self._load(table)
+        with self._lock:
+            notify = len(self._pending) == 0
+            values = cache.setdefault(object_id, {})
+            for key in kvs:
+                value = _stored(kvs[key])
+                if value is None:
+                    values.pop(key, None)
+                else:
+                    values[key] = value
+                self._pending[(table, object_id, key)] = value
+            if len(values) == 0:
+                del cache[object_id]
+            if notify:
+                self._lock.notify_all()
+
+    @property
+    def pending(self):
+        """
+        The number of changes waiting to be written.
+
+        :rtype: int
+
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Write the pending changes in one transaction.
+        If it fails, the changes are pending again : the ones made since are kept.
+
+        :returns: The number of changes written
+        :rtype: int
+
+        """
+        with self._db_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if len(pending) == 0:
+                return 0
+            deletes = {}
+            upserts = {}
+            for (table, object_id, key), value in pending.items():
+                if value is None:
+                    deletes.setdefault(table, []).append((object_id, key))
+                else:
+                    upserts.setdefault(table, []).append((object_id, key, value))
+            try:
+                with self._connection:
+                    cur = self._connection.cursor()
+                    for table in deletes:
+                        cur.executemany("DELETE FROM %s WHERE object_id=? AND key=?" % table, deletes[table])
+                    for table in upserts:
+                        cur.executemany(self._upsert % table, upserts[table])
+            except lite.Error:
+                logger.exception(u'Error when writing %s kvals', len(pending))
+                with self._lock:
+                    for key in pending:
+                        self._pending.setdefault(key, pending[key])
+                return 0
+            self.flushes += 1
+            self.flushed += len(pending)
+            return len(pending)
+
+    def _run(self):
+        """
+        The write-behind thread.
+
+        """
+        while True:
+            with self._lock:
+                while len(self._pending) == 0 and not self._stopped:
+                    self._lock.wait()
+                if not self._stopped:
+                    #Let the changes accumulate : set only notifies the first one
+                    self._lock.wait(self._flush_interval)
+                stopped = self._stopped
+            self.flush()
+            if stopped:
+                return
+
+    def close(self):
+        """
+        Stop the write-behind thread, write the pending changes and close the database.
+
+        :returns: False if some changes can't be written : they are lost
+        :rtype: boolean
+
+        """
+        with self._lock:
+            self._stopped = True
+            self._lock.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+        lost = self.pending
+        if lost > 0:
+            logger.error(u'Close the kvals database : %s kvals are lost', lost)
+        with self._db_lock:
+            self._connection.close()
+        return lost == 0
@@ -29,16 +29,21 @@ import time
 import sys
 import six
 if six.PY3:
-    from pydispatch import dispatcher
+    from pydispatch import dispatcher as louie_dispatcher
 else:
-    from louie import dispatcher
+    from louie import dispatcher as louie_dispatcher
 import threading
+import collections
 
 import libopenzwave
 import openzwave
-from openzwave.object import ZWaveException, ZWaveTypeException, ZWaveObject
+from openzwave.object import ZWaveException, ZWaveTypeException, ZWaveObject, wait_for
 from openzwave.controller import ZWaveController
+from openzwave.dispatch import SignalRouter
+from openzwave.kvals import ZWaveKvalsStore
 from openzwave.node import ZWaveNode
+from openzwave.group import ZWaveGroup
+from openzwave.value import ZWaveValue, ZWavePendingWrites
 from openzwave.option import ZWaveOption
 from openzwave.scene import ZWaveScene
 from openzwave.singleton import Singleton
@@ -240,6 +245,9 @@ class ZWaveNetwork(ZWaveObject):
 
     Deprecated : SIGNAL_DRIVER_* shouldn't be used anymore.
 
+    The signals are sent with louie (pydispatch on python 3) by default.
+    Use the dispatcher parameter to send them with an openzwave.dispatch.FastDispatcher.
+
     """
 
     SIGNAL_NETWORK_FAILED = 'NetworkFailed'
@@ -292,7 +300,33 @@ class ZWaveNetwork(ZWaveObject):
 
     ignoreSubsequent = True
 
-    def __init__(self, options, log=None, autostart=True, kvals=True):
+    #The kinds of objects in the change log
+    CHANGE_NODE = 'node'
+    CHANGE_VALUE = 'value'
+    CHANGE_GROUP = 'group'
+    #The number of changed objects kept in the change log
+    MAX_CHANGES = 10000
+
+    #The notifications needed to maintain the network, the nodes and the values.
+    _REQUIRED_NOTIFICATIONS = (SIGNAL_DRIVER_FAILED, SIGNAL_DRIVER_READY, SIGNAL_DRIVER_RESET,
+                               SIGNAL_DRIVER_REMOVED, SIGNAL_NODE_ADDED, SIGNAL_NODE_NAMING,
+                               SIGNAL_NODE_NEW, SIGNAL_NODE_PROTOCOL_INFO, SIGNAL_NODE_REMOVED,
+                               SIGNAL_VALUE_ADDED, SIGNAL_VALUE_REMOVED,
+                               SIGNAL_ESSENTIAL_NODE_QUERIES_COMPLETE, SIGNAL_NODE_QUERIES_COMPLETE,
+                               SIGNAL_AWAKE_NODES_QUERIED, SIGNAL_ALL_NODES_QUERIED,
+                               SIGNAL_ALL_NODES_QUERIED_SOME_DEAD, SIGNAL_CONTROLLER_COMMAND,
+                               SIGNAL_NOTIFICATION)
+
+    #The signals sent by the network itself, by the notifications they come from.
+    #The ones from the required notifications need nothing more.
+    _DERIVED_NOTIFICATIONS = {
+        SIGNAL_NETWORK_FAILED : (), SIGNAL_NETWORK_STARTED : (), SIGNAL_NETWORK_READY : (),
+        SIGNAL_NETWORK_STOPPED : (), SIGNAL_NETWORK_RESETTED : (), SIGNAL_NETWORK_AWAKED : (),
+        SIGNAL_NODE : (), SIGNAL_NODE_READY : (), SIGNAL_CONTROLLER_WAITING : (),
+        SIGNAL_VALUE : (SIGNAL_VALUE_CHANGED, SIGNAL_VALUE_REFRESHED),
+    }
+
+    def __init__(self, options, log=None, autostart=True, kvals=True, notification_types=None, use_cache=True, dispatcher=None, executor=None):
         """
         Initialize zwave network
 
@@ -304,30 +338,102 @@ class ZWaveNetwork(ZWaveObject):
         :type autostart: bool
         :param kvals: Enable kvals (use pysqlite)
         :type kvals: bool
+        :param notification_types: The notifications to handle (ie SIGNAL_VALUE_CHANGED).
+            The other ones are dropped by the library before reaching python.
+            The notifications needed by the network itself (driver, nodes, ...) are always handled.
+            Notification is one of them : the codes it carries (SIGNAL_MSG_COMPLETE, ...)
+            are always sent.
+            The signals sent by the network (ie SIGNAL_NETWORK_READY) select the notifications they come from.
+            None for all.
+        :type notification_types: list of str
+        :param use_cache: Serve the attributes of the values from a cache updated by the notifications.
+            SIGNAL_VALUE_CHANGED and SIGNAL_VALUE_REFRESHED are always handled when it is enabled.
+        :type use_cache: bool
+        :param dispatcher: The dispatcher used to send the signals : an openzwave.dispatch.FastDispatcher
+            or any object with the send function of louie. None for louie (pydispatch on python 3).
+        :type dispatcher: openzwave.dispatch.FastDispatcher
+        :param executor: Deliver the signals from the worker threads of this executor,
+            keeping the order of the signals of each node. None to deliver them from
+            the notification thread. The network doesn't stop it : stop it after destroy.
+        :type executor: openzwave.dispatch.DispatchExecutor
+        :raises: ZWaveException if a notification type is unknown
 
         """
         logger.debug("Create network object.")
+        #Check the notification types before allocating anything
+        if notification_types is None:
+            self._notification_types = None
+        else:
+            self._notification_types = self._map_notification_types(notification_types)
+            if use_cache:
+                #Without them, the cached data would never be outdated
+                self._notification_types |= set([self.SIGNAL_VALUE_CHANGED, self.SIGNAL_VALUE_REFRESHED])
         self.log = log
         self._options = options
-        ZWaveObject.__init__(self, None, self)
+        self._dispatcher = dispatcher if dispatcher is not None else louie_dispatcher
+        self._router = SignalRouter()
+        self._executor = executor
+        self._pending_writes = ZWavePendingWrites()
+        #Notified when the state of the network changes
+        self._state_condition = threading.Condition()
+        #Notified when a node becomes ready
+        self._node_condition = threading.Condition()
+        #The change log : {(kind, object_id) : (sequence, node_id)}, ordered by sequence
+        self._changes = collections.OrderedDict()
+        self._changes_lock = threading.Lock()
+        self._sequence = 0
+        #The changes up to this sequence have been dropped from the log
+        self._changes_floor = 0
+        ZWaveObject.__init__(self, None, self, use_cache=use_cache)
         self._controller = ZWaveController(1, self, options)
         self._manager = libopenzwave.PyManager()
         self._manager.create()
-        self._state = self.STATE_STOPPED
+        self._set_state(self.STATE_STOPPED)
         self.nodes = None
         self._semaphore_nodes = threading.Semaphore()
         self._id_separator = '.'
         self.network_event = threading.Event()
         self.dbcon = None
+        self._kvals_store = None
         if kvals == True:
             try:
-                self.dbcon = lite.connect(os.path.join(self._options.user_path, 'pyozw.sqlite'), check_same_thread=False)
-                cur = self.dbcon.cursor()
-                version = cur.execute('SELECT SQLITE_VERSION()').fetchone()
-                logger.debug("Use sqlite version : %s", version)
-                self._check_db_tables()
+                self._kvals_store = ZWaveKvalsStore(os.path.join(self._options.user_path, 'pyozw.sqlite'))
+                self.dbcon = self._kvals_store.connection
+                logger.debug("Use sqlite version : %s", self._kvals_store.version)
             except lite.Error as e:
                 logger.warning("Can't connect to sqlite database : kvals are disabled - %s", e.args[0])
+        self._notification_handlers = {
+            self.SIGNAL_DRIVER_FAILED : self._handle_driver_failed,
+            self.SIGNAL_DRIVER_READY : self._handle_driver_ready,
+            self.SIGNAL_DRIVER_RESET : self._handle_driver_reset,
+            self.SIGNAL_DRIVER_REMOVED : self._handle_driver_removed,
+            self.SIGNAL_NODE_ADDED : self._handle_node_added,
+            self.SIGNAL_NODE_EVENT : self._handle_node_event,
+            self.SIGNAL_NODE_NAMING : self._handle_node_naming,
+            self.SIGNAL_NODE_NEW : self._handle_node_new,
+            self.SIGNAL_NODE_PROTOCOL_INFO : self._handle_node_protocol_info,
+            self.SIGNAL_NODE_REMOVED : self._handle_node_removed,
+            self.SIGNAL_GROUP : self._handle_group,
+            self.SIGNAL_SCENE_EVENT : self._handle_scene_event,
+            self.SIGNAL_VALUE_ADDED : self._handle_value_added,
+            self.SIGNAL_VALUE_CHANGED : self._handle_value_changed,
+            self.SIGNAL_VALUE_REFRESHED : self._handle_value_refreshed,
+            self.SIGNAL_VALUE_REMOVED : self._handle_value_removed,
+            self.SIGNAL_POLLING_DISABLED : self._handle_polling_disabled,
+            self.SIGNAL_POLLING_ENABLED : self._handle_polling_enabled,
+            self.SIGNAL_CREATE_BUTTON : self._handle_create_button,
+            self.SIGNAL_DELETE_BUTTON : self._handle_delete_button,
+            self.SIGNAL_BUTTON_ON : self._handle_button_on,
+            self.SIGNAL_BUTTON_OFF : self._handle_button_off,
+            self.SIGNAL_ALL_NODES_QUERIED : self._handle_all_nodes_queried,
+            self.SIGNAL_ALL_NODES_QUERIED_SOME_DEAD : self._handle_all_nodes_queried_some_dead,
+            self.SIGNAL_AWAKE_NODES_QUERIED : self._handle_awake_nodes_queried,
+            self.SIGNAL_ESSENTIAL_NODE_QUERIES_COMPLETE : self._handle_essential_node_queries_complete,
+            self.SIGNAL_NODE_QUERIES_COMPLETE : self._handle_node_queries_complete,
+            self.SIGNAL_MSG_COMPLETE : self._handle_msg_complete,
+            self.SIGNAL_NOTIFICATION : self._handle_notification,
+            self.SIGNAL_CONTROLLER_COMMAND : self._handle_controller_command,
+        }
         self._started = False
         if autostart:
             self.start()
@@ -350,15 +456,20 @@ class ZWaveNetwork(ZWaveObject):
         :rtype: boolean
 
         """
-        if self.dbcon is None:
+        if self._kvals_store is None:
             return False
-        cur = self.dbcon.cursor()
-        for mycls in ['ZWaveOption', 'ZWaveOptionSingleton', 'ZWaveNetwork', 'ZWaveNetworkSingleton', 'ZWaveNode', 'ZWaveController', 'ZWaveValue']:
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (mycls,))
-            data = cur.fetchone()
-            if data is None:
-                cur.execute("CREATE TABLE %s(object_id INT, key TEXT, value TEXT)" % mycls)
-        return True
+        return self._kvals_store.check_tables()
+
+    @property
+    def kvals_store(self):
+        """
+        The store of the kvals of the objects of the network.
+        None if kvals are disabled.
+
+        :rtype: openzwave.kvals.ZWaveKvalsStore
+
+        """
+        return self._kvals_store
 
     def start(self):
         """
@@ -370,7 +481,7 @@ class ZWaveNetwork(ZWaveObject):
         if self._started == True:
             return
         logger.info(u"Start Openzwave network.")
-        self._manager.addWatcher(self.zwcallback)
+        self._manager.addWatcher(self.zwcallback, notification_types=self._notification_types)
         self._manager.addDriver(self._options.device)
         self._started = True
 
@@ -396,26 +507,8 @@ class ZWaveNetwork(ZWaveObject):
         try:
             self._semaphore_nodes.acquire()
             self._manager.removeWatcher(self.zwcallback)
-            try:
-                self.network_event.wait(1.0)
-            except AssertionError:
-                #For gevent AssertionError: Impossible to call blocking function in the event loop callback
-                pass
             self._manager.removeDriver(self._options.device)
-            try:
-                self.network_event.wait(1.0)
-            except AssertionError:
-                #For gevent AssertionError: Impossible to call blocking function in the event loop callback
-                pass
-            for i in range(0, 60):
-                if self.controller.send_queue_count <= 0:
-                    break
-                else:
-                    try:
-                        self.network_event.wait(1.0)
-                    except AssertionError:
-                        #For gevent AssertionError: Impossible to call blocking function in the event loop callback
-                        pass
+            self.controller.wait_queue_empty(timeout=60)
             self.nodes = None
         except:
             import sys, traceback
@@ -423,22 +516,21 @@ class ZWaveNetwork(ZWaveObject):
         finally:
             self._semaphore_nodes.release()
         self._started = False
-        self._state = self.STATE_STOPPED
-        try:
-            self.network_event.wait(1.0)
-        except AssertionError:
-            #For gevent AssertionError: Impossible to call blocking function in the event loop callback
-            pass
+        self._set_state(self.STATE_STOPPED)
+        self._pending_writes.fail_all(u"Network stopped")
+        if self._kvals_store is not None:
+            self._kvals_store.flush()
         if fire:
-            dispatcher.send(self.SIGNAL_NETWORK_STOPPED, **{'network': self})
+            self._send(self.SIGNAL_NETWORK_STOPPED, **{'network': self})
+        if self._executor is not None:
+            self._executor.join()
 
     def destroy(self):
         """
         Destroy the netwok and all related stuff.
         """
-        if self.dbcon is not None:
-            self.dbcon.commit()
-            self.dbcon.close()
+        if self._kvals_store is not None:
+            self._kvals_store.close()
         self._manager.destroy()
         self._options.destroy()
         self._manager = None
@@ -466,6 +558,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         self._object_id = value
+        self.outdate_dict()
 
     @property
     def home_id_str(self):
@@ -523,7 +616,54 @@ class ZWaveNetwork(ZWaveObject):
         :type value: int
 
         """
-        self._state = value
+        self._set_state(value)
+
+    def _set_state(self, state):
+        """
+        Change the state of the network and wake up the threads waiting for it.
+
+        :param state: new state
+        :type state: int
+
+        """
+        with self._state_condition:
+            self._state = state
+            self._state_condition.notify_all()
+        self.outdate_dict()
+
+    def wait_for_state(self, state, timeout=None):
+        """
+        Wait until the network reaches state. Return as soon as the
+        notification changing the state is handled, or when the network fails.
+
+        .. code-block:: python
+
+            network.start()
+            if not network.wait_for_state(network.STATE_READY, timeout=120):
+                print("Network is not ready")
+
+        :param state: The state to wait for (ie STATE_AWAKED)
+        :type state: int
+        :param timeout: The maximum time to wait, in seconds. None to wait forever
+        :type timeout: float
+        :returns: True if the state of the network is at least state. False on timeout or if it is STATE_FAILED
+        :rtype: bool
+
+        """
+        wait_for(self._state_condition, \
+            lambda: self._state >= state or self._state == self.STATE_FAILED, timeout=timeout)
+        return self._state >= state
+
+    @property
+    def node_condition(self):
+        """
+        The condition notified when a node becomes ready.
+        Used by ZWaveNode.wait_ready.
+
+        :rtype: threading.Condition
+
+        """
+        return self._node_condition
 
     @property
     def state_str(self):
@@ -563,6 +703,120 @@ class ZWaveNetwork(ZWaveObject):
         else:
             raise ZWaveException(u"Manager not initialised")
 
+    @property
+    def dispatcher(self):
+        """
+        The dispatcher used to send the signals of the network.
+
+        :rtype: openzwave.dispatch.FastDispatcher or louie.dispatcher
+
+        """
+        return self._dispatcher
+
+    @property
+    def pending_writes(self):
+        """
+        The writes of values waiting for a confirmation of the nodes.
+
+        :rtype: ZWavePendingWrites
+
+        """
+        return self._pending_writes
+
+    @property
+    def executor(self):
+        """
+        The executor delivering the signals of the network. None if they are
+        delivered from the notification thread.
+
+        :rtype: openzwave.dispatch.DispatchExecutor
+
+        """
+        return self._executor
+
+    def _send(self, signal, **named):
+        """
+        Send a signal with the dispatcher and route it to the subscriptions.
+        With an executor, the signal is queued in the worker of its node.
+
+        :param signal: The signal to send
+        :type signal: str
+
+        """
+        if self._executor is None:
+            self._deliver(signal, named)
+        else:
+            node = named.get('node')
+            self._executor.submit(node.node_id if node is not None else named.get('node_id'), \
+                self._deliver, signal, named)
+
+    def _deliver(self, signal, named):
+        """
+        Deliver a signal to the receivers of the dispatcher and to the subscriptions.
+
+        :param signal: The signal to deliver
+        :type signal: str
+        :param named: The named arguments of the signal
+        :type named: dict()
+
+        """
+        self._dispatcher.send(signal, **named)
+        if signal in self._router:
+            self._router.route(signal, named)
+
+    def subscribe(self, signal, callback, node_id=None, value_id=None, command_class=None, policy=None):
+        """
+        Subscribe to a signal of the network, filtered by node, value or command class.
+        The callback is only called for the signals matching all the filters given,
+        without going through the handlers of the other nodes and values.
+
+        .. code-block:: python
+
+                def door_changed(node, value):
+                    ...
+                network.subscribe(network.SIGNAL_VALUE_CHANGED, door_changed, node_id=5)
+
+        The callback is called with the arguments of the signal it accepts, like
+        a louie receiver. The network keeps a strong reference to it.
+
+        A slow subscriber should use a policy : its signals are buffered by the policy
+        and delivered from another thread, dropping or coalescing the ones it can't handle.
+
+        .. code-block:: python
+
+                subscription = network.subscribe(network.SIGNAL_VALUE, push_to_ui, policy=CoalescePolicy())
+                print(subscription.policy.metrics())
+
+        :param signal: The signal to subscribe to (ie SIGNAL_VALUE_CHANGED)
+        :type signal: str
+        :param callback: The callable to call when the signal is sent
+        :type callback: callable
+        :param node_id: Only receive the signals of this node
+        :type node_id: int
+        :param value_id: Only receive the signals of this value
+        :type value_id: int
+        :param command_class: Only receive the signals of the values of this command class
+        :type command_class: int
+        :param policy: The delivery policy : CoalescePolicy, DropOldestPolicy or SamplePolicy
+            from openzwave.dispatch. None to call the callback directly
+        :type policy: openzwave.dispatch.DeliveryPolicy
+        :returns: The subscription, to use with unsubscribe
+        :rtype: openzwave.dispatch.Subscription
+
+        """
+        return self._router.subscribe(signal, callback, node_id=node_id, value_id=value_id, \
+            command_class=command_class, policy=policy)
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscription.
+
+        :param subscription: The subscription returned by subscribe
+        :type subscription: openzwave.dispatch.Subscription
+
+        """
+        self._router.unsubscribe(subscription)
+
     @property
     def controller(self):
         """
@@ -597,27 +851,39 @@ class ZWaveNetwork(ZWaveObject):
         :rtype: dict()
 
         """
+        kvals = {}
+        if ('all' in extras or 'kvals' in extras) and self._kvals_store is not None:
+            #The kvals of all the nodes in one call
+            kvals = self._kvals_store.get_table('ZWaveNode', list(self._nodes.keys()))
         ret = {}
         for ndid in self._nodes.keys():
-            ret[ndid]=self._nodes[ndid].to_dict(extras=extras)
+            ret[ndid]=self._nodes[ndid].to_dict(extras=extras, kvals=kvals.get(ndid, {}))
         return ret
 
     def to_dict(self, extras=['kvals']):
         """
         Return a dict representation of the network.
+        It is kept until the state or the nodes of the network change.
 
         :param extras: The extra inforamtions to add
         :type extras: []
         :returns: A dict
         :rtype: dict()
 
+        """
+        return self._memoized_dict(extras, self._to_dict)
+
+    def _to_dict(self, extras):
+        """
+        Build the dict representation of the network.
+
         """
         ret = {}
         ret['state'] = self.state,
         ret['state_str'] = self.state_str,
         ret['home_id'] = self.home_id_str,
         ret['nodes_count'] = self.nodes_count,
-        if 'kvals' in extras and self.network.dbcon is not None:
+        if 'kvals' in extras and self.network.kvals_store is not None:
             vals = self.kvals
             for key in vals.keys():
                 ret[key]=vals[key]
@@ -636,6 +902,39 @@ class ZWaveNetwork(ZWaveObject):
             self._nodes = value
         else:
             self._nodes = dict()
+        self._values_index = dict()
+        self._values_on_network_index = dict()
+        self._values_on_network_keys = dict()
+        for node in self._nodes.values():
+            for value in node.values.values():
+                self._index_value(value)
+        self.outdate_dict()
+
+    def _index_value(self, value):
+        """
+        Add a value to the indexes of the network.
+
+        :param value: The value to index
+        :type value: ZWaveValue
+
+        """
+        self._values_index[value.value_id] = value
+        key = value.id_on_network
+        self._values_on_network_index[key] = value
+        self._values_on_network_keys[value.value_id] = key
+
+    def _unindex_value(self, value_id):
+        """
+        Remove a value from the indexes of the network.
+
+        :param value_id: The id of the value to remove
+        :type value_id: int
+
+        """
+        self._values_index.pop(value_id, None)
+        key = self._values_on_network_keys.pop(value_id, None)
+        if key is not None:
+            self._values_on_network_index.pop(key, None)
 
     def switch_all(self, state):
         """
@@ -685,18 +984,13 @@ class ZWaveNetwork(ZWaveObject):
         """
         Retrieve a value on the network.
 
-        Check every nodes to see if it holds the value
-
         :param value_id: The id of the value to find
         :type value_id: int
         :return: The value or None
         :rtype: ZWaveValue
 
         """
-        for node in self.nodes:
-            if value_id in self.nodes[node].values:
-                return self.nodes[node].values[value_id]
-        return None
+        return self._values_index.get(value_id, None)
 
     @property
     def id_separator(self):
@@ -718,24 +1012,20 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         self._id_separator = value
+        #The keys of the id_on_network index use the separator
+        self.nodes = self._nodes
 
     def get_value_from_id_on_network(self, id_on_network):
         """
         Retrieve a value on the network from it's id_on_network.
 
-        Check every nodes to see if it holds the value
-
         :param id_on_network: The id_on_network of the value to find
         :type id_on_network: str
         :return: The value or None
         :rtype: ZWaveValue
 
         """
-        for node in self.nodes.itervalues():
-            for val in node.values.itervalues():
-                if val.id_on_network == id_on_network:
-                    return val
-        return None
+        return self._values_on_network_index.get(id_on_network, None)
 
     def get_scenes(self):
         """
@@ -893,6 +1183,33 @@ class ZWaveNetwork(ZWaveObject):
         """
         self.manager.setPollInterval(milliseconds, bIntervalBetweenPolls)
 
+    def _map_notification_types(self, notification_types):
+        """
+        Map the notification types and signals to the notification types
+        of the library, adding the required ones.
+
+        :param notification_types: The notifications to handle
+        :type notification_types: list of str
+        :returns: The notification types of the library
+        :rtype: set()
+        :raises: ZWaveException if a notification type is unknown
+
+        """
+        notifications = set(libopenzwave.PyNotifications)
+        codes = set(libopenzwave.PyNotificationCodes)
+        ret = set(self._REQUIRED_NOTIFICATIONS)
+        for ntype in notification_types:
+            if ntype in notifications:
+                ret.add(ntype)
+            elif ntype in codes:
+                #The codes are carried by the Notification notification
+                ret.add(self.SIGNAL_NOTIFICATION)
+            elif ntype in self._DERIVED_NOTIFICATIONS:
+                ret.update(self._DERIVED_NOTIFICATIONS[ntype])
+            else:
+                raise ZWaveException(u"Unknown notification type %s" % ntype)
+        return ret
+
     def zwcallback(self, args):
         """
         The Callback Handler used with the libopenzwave.
@@ -915,81 +1232,168 @@ class ZWaveNetwork(ZWaveObject):
 
         }
 
-        :param args: A dict containing informations about the state of the controller
-        :type args: dict()
+        The notification is a libopenzwave.PyNotification : fields are
+        read as attributes or, for backward compatibility, like a dict.
+
+        :param args: The notification sent by the library
+        :type args: libopenzwave.PyNotification
 
         """
         logger.debug('zwcallback args=[%s]', args)
         try:
-            notify_type = args['notificationType']
-            if notify_type == self.SIGNAL_DRIVER_FAILED:
-                self._handle_driver_failed(args)
-            elif notify_type == self.SIGNAL_DRIVER_READY:
-                self._handle_driver_ready(args)
-            elif notify_type == self.SIGNAL_DRIVER_RESET:
-                self._handle_driver_reset(args)
-            elif notify_type == self.SIGNAL_NODE_ADDED:
-                self._handle_node_added(args)
-            elif notify_type == self.SIGNAL_NODE_EVENT:
-                self._handle_node_event(args)
-            elif notify_type == self.SIGNAL_NODE_NAMING:
-                self._handle_node_naming(args)
-            elif notify_type == self.SIGNAL_NODE_NEW:
-                self._handle_node_new(args)
-            elif notify_type == self.SIGNAL_NODE_PROTOCOL_INFO:
-                self._handle_node_protocol_info(args)
-            elif notify_type == self.SIGNAL_NODE_READY:
-                self._handleNodeReady(args)
-            elif notify_type == self.SIGNAL_NODE_REMOVED:
-                self._handle_node_removed(args)
-            elif notify_type == self.SIGNAL_GROUP:
-                self._handle_group(args)
-            elif notify_type == self.SIGNAL_SCENE_EVENT:
-                self._handle_scene_event(args)
-            elif notify_type == self.SIGNAL_VALUE_ADDED:
-                self._handle_value_added(args)
-            elif notify_type == self.SIGNAL_VALUE_CHANGED:
-                self._handle_value_changed(args)
-            elif notify_type == self.SIGNAL_VALUE_REFRESHED:
-                self._handle_value_refreshed(args)
-            elif notify_type == self.SIGNAL_VALUE_REMOVED:
-                self._handle_value_removed(args)
-            elif notify_type == self.SIGNAL_POLLING_DISABLED:
-                self._handle_polling_disabled(args)
-            elif notify_type == self.SIGNAL_POLLING_ENABLED:
-                self._handle_polling_enabled(args)
-            elif notify_type == self.SIGNAL_CREATE_BUTTON:
-                self._handle_create_button(args)
-            elif notify_type == self.SIGNAL_DELETE_BUTTON:
-                self._handle_delete_button(args)
-            elif notify_type == self.SIGNAL_BUTTON_ON:
-                self._handle_button_on(args)
-            elif notify_type == self.SIGNAL_BUTTON_OFF:
-                self._handle_button_off(args)
-            elif notify_type == self.SIGNAL_ALL_NODES_QUERIED:
-                self._handle_all_nodes_queried(args)
-            elif notify_type == self.SIGNAL_ALL_NODES_QUERIED_SOME_DEAD:
-                self._handle_all_nodes_queried_some_dead(args)
-            elif notify_type == self.SIGNAL_AWAKE_NODES_QUERIED:
-                self._handle_awake_nodes_queried(args)
-            elif notify_type == self.SIGNAL_ESSENTIAL_NODE_QUERIES_COMPLETE:
-                self._handle_essential_node_queries_complete(args)
-            elif notify_type == self.SIGNAL_NODE_QUERIES_COMPLETE:
-                self._handle_node_queries_complete(args)
-            elif notify_type == self.SIGNAL_MSG_COMPLETE:
-                self._handle_msg_complete(args)
-            elif notify_type == self.SIGNAL_NOTIFICATION:
-                self._handle_notification(args)
-            elif notify_type == self.SIGNAL_DRIVER_REMOVED:
-                self._handle_driver_removed(args)
-            elif notify_type == self.SIGNAL_CONTROLLER_COMMAND:
-                self._handle_controller_command(args)
+            handler = self._notification_handlers.get(args['notificationType'])
+            if handler is not None:
+                handler(args)
             else:
                 logger.warning(u'Skipping unhandled notification [%s]', args)
+            if self._controller is not None:
+                self._controller.notify_queue()
         except:
             import sys, traceback
             logger.exception(u'Error in manager callback')
 
+    def _node_changed(self, node_id):
+        """
+        Outdate the dict representation of a node and record it in the change log.
+        Called by the handlers of the notifications changing the node.
+
+        :param node_id: The id of the node, maybe removed
+        :type node_id: int
+
+        """
+        node = self._nodes.get(node_id)
+        if node is not None:
+            node.outdate_dict()
+        self._record_change(self.CHANGE_NODE, node_id, node_id)
+
+    def _value_changed(self, node_id, value_id):
+        """
+        Outdate the dict representation of a value and record it in the change log.
+        Called by the handlers of the notifications changing the value.
+
+        :param node_id: The id of the node of the value
+        :type node_id: int
+        :param value_id: The id of the value, maybe removed
+        :type value_id: int
+
+        """
+        node = self._nodes.get(node_id)
+        if node is not None:
+            if value_id in node.values:
+                node.values[value_id].outdate_dict()
+            else:
+                node.outdate_dict()
+        self._record_change(self.CHANGE_VALUE, value_id, node_id)
+
+    def _group_changed(self, node_id, group_idx):
+        """
+        Outdate the dict representation of the node of a group and record
+        the group in the change log. Called by the handler of Group notifications.
+
+        :param node_id: The id of the node of the group
+        :type node_id: int
+        :param group_idx: The index of the group
+        :type group_idx: int
+
+        """
+        node = self._nodes.get(node_id)
+        if node is not None:
+            node.outdate_dict()
+        self._record_change(self.CHANGE_GROUP, (node_id, group_idx), node_id)
+
+    def _record_object_change(self, obj):
+        """
+        Record a change of a node or a value made by the application (ie its kvals)
+        in the change log. The other objects are not in the change log.
+
+        :param obj: The changed object
+        :type obj: ZWaveObject
+
+        """
+        if isinstance(obj, ZWaveValue):
+            self._record_change(self.CHANGE_VALUE, obj.value_id, obj.parent_id)
+        elif isinstance(obj, ZWaveNode):
+            self._record_change(self.CHANGE_NODE, obj.node_id, obj.node_id)
+
+    def _record_change(self, kind, object_id, node_id):
+        """
+        Stamp an object with the next sequence number.
+
+        :param kind: The kind of the object (CHANGE_NODE, CHANGE_VALUE or CHANGE_GROUP)
+        :type kind: str
+        :param object_id: The id of the object : node_id, value_id or (node_id, group index)
+        :type object_id: int or tuple
+        :param node_id: The id of the node of the object
+        :type node_id: int
+
+        """
+        key = (kind, object_id)
+        with self._changes_lock:
+            self._sequence += 1
+            if key in self._changes:
+                del self._changes[key]
+            self._changes[key] = (self._sequence, node_id)
+            while len(self._changes) > self.MAX_CHANGES:
+                self._changes_floor = self._changes.popitem(last=False)[1][0]
+
+    @property
+    def sequence(self):
+        """
+        The sequence number of the last change of a node, a value or a group.
+        It only grows while the network object lives.
+
+        :rtype: int
+
+        """
+        return self._sequence
+
+    def changes_since(self, sequence, extras=['all']):
+        """
+        Return the nodes, values and groups changed after sequence, with their
+        dict representation (None when the object has been removed).
+
+        Pass the returned sequence to the next call. When reset is True, the
+        change log has dropped some of the changes : reload everything.
+
+        .. code-block:: python
+
+            changes = network.changes_since(0)
+            ...
+            changes = network.changes_since(changes['sequence'])
+            for value_id, value in changes['values'].items():
+                print(value_id, value['data'] if value is not None else 'removed')
+
+        :param sequence: The sequence returned by the previous call, 0 for the first one
+        :type sequence: int
+        :param extras: The extra inforamtions to add to the dicts
+        :type extras: []
+        :returns: A dict with keys sequence, reset, nodes, values and groups.
+            Groups are indexed by node_id, then by group index.
+        :rtype: dict()
+
+        """
+        changed = []
+        with self._changes_lock:
+            last = self._sequence
+            reset = sequence < self._changes_floor
+            for key in reversed(self._changes):
+                if self._changes[key][0] <= sequence:
+                    break
+                changed.append((key, self._changes[key][1]))
+        ret = {'sequence': last, 'reset': reset, 'nodes': {}, 'values': {}, 'groups': {}}
+        for (kind, object_id), node_id in reversed(changed):
+            node = self._nodes.get(node_id)
+            if kind == self.CHANGE_VALUE:
+                value = node.values.get(object_id) if node is not None else None
+                ret['values'][object_id] = value.to_dict(extras=extras) if value is not None else None
+            elif kind == self.CHANGE_GROUP:
+                group = ZWaveGroup(object_id[1], network=self, node_id=node_id) if node is not None else None
+                ret['groups'].setdefault(node_id, {})[object_id[1]] = \
+                    group.to_dict(extras=extras) if group is not None else None
+            else:
+                ret['nodes'][object_id] = node.to_dict(extras=extras) if node is not None else None
+        return ret
+
     def _handle_driver_failed(self, args):
         """
         Driver failed to load.
@@ -1004,9 +1408,9 @@ class ZWaveNetwork(ZWaveObject):
         self._manager = None
         self._controller = None
         self.nodes = None
-        self._state = self.STATE_FAILED
-        dispatcher.send(self.SIGNAL_DRIVER_FAILED, **{'network': self})
-        dispatcher.send(self.SIGNAL_NETWORK_FAILED, **{'network': self})
+        self._set_state(self.STATE_FAILED)
+        self._send(self.SIGNAL_DRIVER_FAILED, **{'network': self})
+        self._send(self.SIGNAL_NETWORK_FAILED, **{'network': self})
 
     def _handle_driver_ready(self, args):
         """
@@ -1034,12 +1438,12 @@ class ZWaveNetwork(ZWaveObject):
             #Not needed. Already sent by the lib
             #~ dispatcher.send(self.SIGNAL_DRIVER_READY, \
                 #~ **{'network': self, 'controller': self._controller})
-            self._state = self.STATE_STARTED
-            dispatcher.send(self.SIGNAL_NETWORK_STARTED, \
+            self._set_state(self.STATE_STARTED)
+            self._send(self.SIGNAL_NETWORK_STARTED, \
                 **{'network': self})
             ctrl_state = libopenzwave.PyControllerState[0]
             ctrl_message = libopenzwave.PyControllerState[0].doc
-            dispatcher.send(self.controller.SIGNAL_CONTROLLER, \
+            self._send(self.controller.SIGNAL_CONTROLLER, \
                 **{'state': ctrl_state, 'message': ctrl_message, 'network': self, 'controller': self.controller})
         except:
             import sys, traceback
@@ -1067,10 +1471,10 @@ class ZWaveNetwork(ZWaveObject):
             self._semaphore_nodes.acquire()
             logger.debug(u'DriverReset received. Remove all nodes')
             self.nodes = None
-            self._state = self.STATE_RESETTED
-            dispatcher.send(self.SIGNAL_DRIVER_RESET, \
+            self._set_state(self.STATE_RESETTED)
+            self._send(self.SIGNAL_DRIVER_RESET, \
                 **{'network': self})
-            dispatcher.send(self.SIGNAL_NETWORK_RESETTED, \
+            self._send(self.SIGNAL_NETWORK_RESETTED, \
                 **{'network': self})
         finally:
             self._semaphore_nodes.release()
@@ -1089,8 +1493,8 @@ class ZWaveNetwork(ZWaveObject):
         logger.debug(u'Z-Wave Notification DriverRemoved : %s', args)
         try:
             self._semaphore_nodes.acquire()
-            self._state = self.STATE_STOPPED
-            dispatcher.send(self.SIGNAL_DRIVER_REMOVED, \
+            self._set_state(self.STATE_STOPPED)
+            self._send(self.SIGNAL_DRIVER_REMOVED, \
                 **{'network': self})
         finally:
             self._semaphore_nodes.release()
@@ -1108,7 +1512,8 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification Group : %s', args)
-        dispatcher.send(self.SIGNAL_GROUP, \
+        self._group_changed(args['nodeId'], args['groupIdx'])
+        self._send(self.SIGNAL_GROUP, \
                 **{'network': self, 'node': self.nodes[args['nodeId']], 'groupidx': args['groupIdx']})
 
     def _handle_node(self, node):
@@ -1124,7 +1529,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification Node : %s', node)
-        dispatcher.send(self.SIGNAL_NODE, \
+        self._send(self.SIGNAL_NODE, \
                 **{'network': self, 'node':node})
 
     def _handle_node_added(self, args):
@@ -1145,7 +1550,9 @@ class ZWaveNetwork(ZWaveObject):
             node = ZWaveNode(args['nodeId'], network=self)
             self._semaphore_nodes.acquire()
             self.nodes[args['nodeId']] = node
-            dispatcher.send(self.SIGNAL_NODE_ADDED, \
+            self.outdate_dict()
+            self._node_changed(args['nodeId'])
+            self._send(self.SIGNAL_NODE_ADDED, \
                 **{'network': self, 'node': self.nodes[args['nodeId']]})
             self._handle_node(self.nodes[args['nodeId']])
         finally:
@@ -1162,7 +1569,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification SceneEvent : %s', args)
-        dispatcher.send(self.SIGNAL_SCENE_EVENT, \
+        self._send(self.SIGNAL_SCENE_EVENT, \
             **{'network': self, 'node': self.nodes[args['nodeId']],
                'scene_id': args['sceneId']})
 
@@ -1179,7 +1586,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification NodeEvent : %s', args)
-        dispatcher.send(self.SIGNAL_NODE_EVENT,
+        self._send(self.SIGNAL_NODE_EVENT,
                         **{'network': self, 'node': self.nodes[args['nodeId']], 'value': args['event']})
 
     def _handle_node_naming(self, args):
@@ -1194,7 +1601,8 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification NodeNaming : %s', args)
-        dispatcher.send(self.SIGNAL_NODE_NAMING, \
+        self._node_changed(args['nodeId'])
+        self._send(self.SIGNAL_NODE_NAMING, \
             **{'network': self, 'node': self.nodes[args['nodeId']]})
         self._handle_node(self.nodes[args['nodeId']])
 
@@ -1207,7 +1615,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug('Z-Wave Notification NodeNew : %s', args)
-        dispatcher.send(self.SIGNAL_NODE_NEW, \
+        self._send(self.SIGNAL_NODE_NEW, \
             **{'network': self, 'node_id': args['nodeId']})
 
     def _handle_node_protocol_info(self, args):
@@ -1223,7 +1631,9 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification NodeProtocolInfo : %s', args)
-        dispatcher.send(self.SIGNAL_NODE_PROTOCOL_INFO, \
+        self.nodes[args['nodeId']].outdate_command_classes()
+        self._node_changed(args['nodeId'])
+        self._send(self.SIGNAL_NODE_PROTOCOL_INFO, \
             **{'network': self, 'node': self.nodes[args['nodeId']]})
         self._handle_node(self.nodes[args['nodeId']])
 
@@ -1246,7 +1656,11 @@ class ZWaveNetwork(ZWaveObject):
             if args['nodeId'] in self.nodes:
                 node = self.nodes[args['nodeId']]
                 del self.nodes[args['nodeId']]
-                dispatcher.send(self.SIGNAL_NODE_REMOVED, \
+                self.outdate_dict()
+                self._node_changed(args['nodeId'])
+                for value_id in node.values:
+                    self._unindex_value(value_id)
+                self._send(self.SIGNAL_NODE_REMOVED, \
                     **{'network': self, 'node': node})
                 self._handle_node(node)
         finally:
@@ -1264,7 +1678,9 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification EssentialNodeQueriesComplete : %s', args)
-        dispatcher.send(self.SIGNAL_ESSENTIAL_NODE_QUERIES_COMPLETE, \
+        self.nodes[args['nodeId']].outdate_command_classes()
+        self._node_changed(args['nodeId'])
+        self._send(self.SIGNAL_ESSENTIAL_NODE_QUERIES_COMPLETE, \
             **{'network': self, 'node': self.nodes[args['nodeId']]})
 
     def _handle_node_queries_complete(self, args):
@@ -1283,7 +1699,8 @@ class ZWaveNetwork(ZWaveObject):
         logger.debug(u'Z-Wave Notification NodeQueriesComplete : %s', args)
         #the query stage are now completed, set the flag is ready to operate
         self.nodes[args['nodeId']].is_ready = True
-        dispatcher.send(self.SIGNAL_NODE_QUERIES_COMPLETE, \
+        self._node_changed(args['nodeId'])
+        self._send(self.SIGNAL_NODE_QUERIES_COMPLETE, \
             **{'network': self, 'node': self.nodes[args['nodeId']]})
         self._handle_node(self.nodes[args['nodeId']])
 
@@ -1300,9 +1717,9 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification AllNodesQueried : %s', args)
-        self._state = self.STATE_READY
-        dispatcher.send(self.SIGNAL_NETWORK_READY, **{'network': self})
-        dispatcher.send(self.SIGNAL_ALL_NODES_QUERIED, \
+        self._set_state(self.STATE_READY)
+        self._send(self.SIGNAL_NETWORK_READY, **{'network': self})
+        self._send(self.SIGNAL_ALL_NODES_QUERIED, \
             **{'network': self, 'controller': self._controller})
 
     def _handle_all_nodes_queried_some_dead(self, args):
@@ -1318,9 +1735,9 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification AllNodesQueriedSomeDead : %s', args)
-        self._state = self.STATE_READY
-        dispatcher.send(self.SIGNAL_NETWORK_READY, **{'network': self})
-        dispatcher.send(self.SIGNAL_ALL_NODES_QUERIED_SOME_DEAD, \
+        self._set_state(self.STATE_READY)
+        self._send(self.SIGNAL_NETWORK_READY, **{'network': self})
+        self._send(self.SIGNAL_ALL_NODES_QUERIED_SOME_DEAD, \
             **{'network': self, 'controller': self._controller})
 
     def _handle_awake_nodes_queried(self, args):
@@ -1341,9 +1758,9 @@ class ZWaveNetwork(ZWaveObject):
         self._object_id = args['homeId']
         try:
             if self._state < self.STATE_AWAKED:
-                self._state = self.STATE_AWAKED
-            dispatcher.send(self.SIGNAL_NETWORK_AWAKED, **{'network': self})
-            dispatcher.send(self.SIGNAL_AWAKE_NODES_QUERIED, \
+                self._set_state(self.STATE_AWAKED)
+            self._send(self.SIGNAL_NETWORK_AWAKED, **{'network': self})
+            self._send(self.SIGNAL_AWAKE_NODES_QUERIED, \
                 **{'network': self, 'controller': self._controller})
         except:
             import sys, traceback
@@ -1363,7 +1780,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification PollingDisabled : %s', args)
-        dispatcher.send(self.SIGNAL_POLLING_DISABLED, \
+        self._send(self.SIGNAL_POLLING_DISABLED, \
             **{'network': self, 'node' : self.nodes[args['nodeId']]})
 
     def _handle_polling_enabled(self, args):
@@ -1378,7 +1795,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification PollingEnabled : %s', args)
-        dispatcher.send(self.SIGNAL_POLLING_ENABLED, \
+        self._send(self.SIGNAL_POLLING_ENABLED, \
             **{'network': self, 'node' : self.nodes[args['nodeId']]})
 
     def _handle_create_button(self, args):
@@ -1392,7 +1809,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification CreateButton : %s', args)
-        dispatcher.send(self.SIGNAL_CREATE_BUTTON, \
+        self._send(self.SIGNAL_CREATE_BUTTON, \
             **{'network': self, 'node' : self.nodes[args['nodeId']]})
 
     def _handle_delete_button(self, args):
@@ -1406,7 +1823,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification DeleteButton : %s', args)
-        dispatcher.send(self.SIGNAL_DELETE_BUTTON, \
+        self._send(self.SIGNAL_DELETE_BUTTON, \
             **{'network': self, 'node' : self.nodes[args['nodeId']]})
 
     def _handle_button_on(self, args):
@@ -1420,7 +1837,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification ButtonOn : %s', args)
-        dispatcher.send(self.SIGNAL_BUTTON_ON, \
+        self._send(self.SIGNAL_BUTTON_ON, \
             **{'network': self, 'node' : self.nodes[args['nodeId']]})
 
     def _handle_button_off(self, args):
@@ -1434,7 +1851,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification ButtonOff : %s', args)
-        dispatcher.send(self.SIGNAL_BUTTON_OFF, \
+        self._send(self.SIGNAL_BUTTON_OFF, \
             **{'network': self, 'node' : self.nodes[args['nodeId']]})
 
     def _handle_value(self, node=None, value=None):
@@ -1451,7 +1868,7 @@ class ZWaveNetwork(ZWaveObject):
         :type valueid: int
 
         """
-        dispatcher.send(self.SIGNAL_VALUE, \
+        self._send(self.SIGNAL_VALUE, \
             **{'network': self, 'node' : node, \
                 'value' : value})
 
@@ -1473,8 +1890,10 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification ValueAdded : %s', args)
-        self.nodes[args['nodeId']].add_value(args['valueId']['id'])
-        dispatcher.send(self.SIGNAL_VALUE_ADDED, \
+        self.nodes[args['nodeId']].add_value(args['valueId']['id'], metadata=args['valueId'])
+        self._index_value(self.nodes[args['nodeId']].values[args['valueId']['id']])
+        self._value_changed(args['nodeId'], args['valueId']['id'])
+        self._send(self.SIGNAL_VALUE_ADDED, \
             **{'network': self, \
                'node' : self.nodes[args['nodeId']], \
                'value' : self.nodes[args['nodeId']].values[args['valueId']['id']]})
@@ -1499,7 +1918,11 @@ class ZWaveNetwork(ZWaveObject):
             logger.warning('Z-Wave Notification ValueChanged (%s) for an unknown node %s', args['valueId'], args['nodeId'])
             return False
         self.nodes[args['nodeId']].change_value(args['valueId']['id'])
-        dispatcher.send(self.SIGNAL_VALUE_CHANGED, \
+        if args['valueId']['id'] in self._pending_writes:
+            self._pending_writes.resolve(args['valueId']['id'], \
+                self.nodes[args['nodeId']].values[args['valueId']['id']].data)
+        self._value_changed(args['nodeId'], args['valueId']['id'])
+        self._send(self.SIGNAL_VALUE_CHANGED, \
             **{'network': self, 'node' : self.nodes[args['nodeId']], \
                 'value' : self.nodes[args['nodeId']].values[args['valueId']['id']]})
         self._handle_value(node=self.nodes[args['nodeId']], value=self.nodes[args['nodeId']].values[args['valueId']['id']])
@@ -1521,8 +1944,12 @@ class ZWaveNetwork(ZWaveObject):
         if args['nodeId'] not in self.nodes:
             logger.warning('Z-Wave Notification ValueRefreshed (%s) for an unknown node %s', args['valueId'], args['nodeId'])
             return False
-        self.nodes[args['nodeId']].refresh_value(args['valueId']['id'])
-        dispatcher.send(self.SIGNAL_VALUE_REFRESHED, \
+        self.nodes[args['nodeId']].change_value(args['valueId']['id'])
+        if args['valueId']['id'] in self._pending_writes:
+            self._pending_writes.resolve(args['valueId']['id'], \
+                self.nodes[args['nodeId']].values[args['valueId']['id']].data)
+        self._value_changed(args['nodeId'], args['valueId']['id'])
+        self._send(self.SIGNAL_VALUE_REFRESHED, \
             **{'network': self, 'node' : self.nodes[args['nodeId']], \
                 'value' : self.nodes[args['nodeId']].values[args['valueId']['id']]})
         self._handle_value(node=self.nodes[args['nodeId']], value=self.nodes[args['nodeId']].values[args['valueId']['id']])
@@ -1545,15 +1972,18 @@ class ZWaveNetwork(ZWaveObject):
         if args['nodeId'] not in self.nodes:
             logger.warning(u'Z-Wave Notification ValueRemoved (%s) for an unknown node %s', args['valueId'], args['nodeId'])
             return False
-        if args['valueId']['id'] in self.nodes[args['nodeId']].values:
+        self._unindex_value(args['valueId']['id'])
+        self._pending_writes.fail(args['valueId']['id'], u"Value %s removed" % args['valueId']['id'])
+        if args['valueId']['id'] not in self.nodes[args['nodeId']].values:
             logger.warning(u'Z-Wave Notification ValueRemoved for an unknown value (%s) on node %s', args['valueId'], args['nodeId'])
-            dispatcher.send(self.SIGNAL_VALUE_REMOVED, \
+            self._send(self.SIGNAL_VALUE_REMOVED, \
                 **{'network': self, 'node' : self.nodes[args['nodeId']], \
                     'value' : None, 'valueId' : args['valueId']['id']})
             return False
         val = self.nodes[args['nodeId']].values[args['valueId']['id']]
         if self.nodes[args['nodeId']].remove_value(args['valueId']['id']):
-            dispatcher.send(self.SIGNAL_VALUE_REMOVED, \
+            self._value_changed(args['nodeId'], args['valueId']['id'])
+            self._send(self.SIGNAL_VALUE_REMOVED, \
                 **{'network': self, 'node' : self.nodes[args['nodeId']], \
                     'value' : val, 'valueId' : args['valueId']['id']})
             #self._handle_value(node=self.nodes[args['nodeId']], value=val)
@@ -1572,7 +2002,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification : %s', args)
-        dispatcher.send(self.SIGNAL_NOTIFICATION, \
+        self._send(self.SIGNAL_NOTIFICATION, \
             **{'network': self, 'args': args})
 
     def _handle_controller_command(self, args):
@@ -1611,7 +2041,7 @@ class ZWaveNetwork(ZWaveObject):
 
         """
         logger.debug(u'Z-Wave Notification MsgComplete : %s', args)
-        dispatcher.send(self.SIGNAL_MSG_COMPLETE, \
+        self._send(self.SIGNAL_MSG_COMPLETE, \
             **{'network': self})
 
     def write_config(self):
@@ -24,8 +24,10 @@ along with python-openzwave. If not, see http://www.gnu.org/licenses.
 
 """
 import sys
+import time
 from libopenzwave import PyStatNode
-from openzwave.object import ZWaveObject
+from libopenzwave import PyGenres, PyValueTypes
+from openzwave.object import ZWaveObject, wait_for
 from openzwave.group import ZWaveGroup
 from openzwave.value import ZWaveValue
 from openzwave.command import ZWaveNodeBasic, ZWaveNodeSwitch
@@ -52,8 +54,8 @@ class ZWaveNode(ZWaveObject,
     Represents a single Node within the Z-Wave Network.
 
     """
-
-    _isReady = False
+    __slots__ = ('values', '_is_locked', '_isReady', '_command_classes', \
+        '_values_indexes', '_values_keys')
 
     def __init__(self, node_id, network):
         """
@@ -71,6 +73,13 @@ class ZWaveNode(ZWaveObject,
         self.values = dict()
         self._is_locked = False
         self._isReady = False
+        #The command classes supported by the node. Filled on first access
+        self._command_classes = None
+        #Indexes of the values ids by command class, genre, type, index and (instance, index)
+        self._values_indexes = dict(command_class=dict(), genre=dict(), \
+            type=dict(), index=dict(), instance_index=dict())
+        #The keys of a value in the indexes
+        self._values_keys = dict()
 
     def __str__(self):
         """
@@ -116,6 +125,7 @@ class ZWaveNode(ZWaveObject,
 
         """
         self._network.manager.setNodeName(self.home_id, self.object_id, value)
+        self.outdate_dict()
 
     @property
     def location(self):
@@ -137,6 +147,7 @@ class ZWaveNode(ZWaveObject,
 
         """
         self._network.manager.setNodeLocation(self.home_id, self.object_id, value)
+        self.outdate_dict()
 
     @property
     def product_name(self):
@@ -158,6 +169,7 @@ class ZWaveNode(ZWaveObject,
 
         """
         self._network.manager.setNodeProductName(self.home_id, self.object_id, value)
+        self.outdate_dict()
 
     @property
     def product_type(self):
@@ -199,23 +211,34 @@ class ZWaveNode(ZWaveObject,
         """
         return self._network.manager.getNodeRoleString(self.home_id, self.object_id)
 
-    def to_dict(self, extras=['all']):
+    def to_dict(self, extras=['all'], kvals=None):
         """
         Return a dict representation of the node.
+        It is kept until a notification changes the node or one of its values.
 
         :param extras: The extra inforamtions to add
         :type extras: []
+        :param kvals: The kvals of the node, when already read from the store. None to read them
+        :type kvals: dict()
         :returns: A dict
         :rtype: dict()
 
+        """
+        return self._memoized_dict(extras, lambda extras: self._to_dict(extras, kvals))
+
+    def _to_dict(self, extras, kvals):
+        """
+        Build the dict representation of the node.
+
         """
         if 'all' in extras:
             extras = ['kvals', 'capabilities', 'neighbors', 'groups', 'values']
+        info = self._network.manager.getNodeInfo(self.home_id, self.object_id)
         ret={}
-        ret['name'] = self.name
-        ret['location'] = self.location
-        ret['product_type'] = self.product_type
-        ret['product_name'] = self.product_name
+        ret['name'] = info.name
+        ret['location'] = info.location
+        ret['product_type'] = info.productType
+        ret['product_name'] = info.productName
         ret['node_id'] = self.node_id
         if 'values' in extras :
             ret['values'] = self.values_to_dict(extras=extras)
@@ -224,9 +247,9 @@ class ZWaveNode(ZWaveObject,
         if 'neighbors' in extras :
             ret['neighbors'] = dict.fromkeys(self.neighbors, 0)
         if 'capabilities' in extras :
-            ret['capabilities'] = dict.fromkeys(self.capabilities, 0)
-        if 'kvals' in extras and self.network.dbcon is not None:
-            vals = self.kvals
+            ret['capabilities'] = dict.fromkeys(self.capabilities_from_info(info), 0)
+        if 'kvals' in extras and self.network.kvals_store is not None:
+            vals = self.kvals if kvals is None else kvals
             for key in vals.keys():
                 ret[key]=vals[key]
         return ret
@@ -238,19 +261,30 @@ class ZWaveNode(ZWaveObject,
 
         :rtype: set()
 
+        """
+        return self.capabilities_from_info(self._network.manager.getNodeInfo(self.home_id, self.object_id))
+
+    def capabilities_from_info(self, info):
+        """
+        Build the capabilities of the node from its attributes.
+
+        :param info: The attributes of the node returned by getNodeInfo
+        :type info: libopenzwave.PyNodeInfo
+        :rtype: set()
+
         """
         caps = set()
-        if self.is_routing_device:
+        if info.routing:
             caps.add('routing')
-        if self.is_listening_device:
+        if info.listening:
             caps.add('listening')
-        if self.is_frequent_listening_device:
+        if info.frequentListening:
             caps.add('frequent')
-        if self.is_security_device:
+        if info.securityDevice:
             caps.add('security')
-        if self.is_beaming_device:
+        if info.beaming:
             caps.add('beaming')
-        if self.is_zwave_plus:
+        if info.zwavePlus:
             caps.add('zwave_plus')
         if self.node_id == self._network.controller.node_id:
             for cap in self._network.controller.capabilities:
@@ -334,11 +368,27 @@ class ZWaveNode(ZWaveObject,
         :rtype: set()
 
         """
-        command_classes = set()
-        for cls in self._network.manager.COMMAND_CLASS_DESC:
-            if self._network.manager.getNodeClassInformation(self.home_id, self.object_id, cls):
-                command_classes.add(cls)
-        return command_classes
+        return set(self._get_command_classes())
+
+    def _get_command_classes(self):
+        """
+        The commandClasses of the node, read from the manager in one call
+        the first time. Don't modify the returned set.
+
+        :rtype: set()
+
+        """
+        if self._command_classes is None:
+            self._command_classes = set(self._network.manager.getNodeCommandClasses(self.home_id, self.object_id))
+        return self._command_classes
+
+    def outdate_command_classes(self):
+        """
+        Says that the command classes of the node must be read again.
+        Called by the network when node informations are received.
+
+        """
+        self._command_classes = None
 
     @property
     def command_classes_as_string(self):
@@ -351,7 +401,8 @@ class ZWaveNode(ZWaveObject,
         commands = self.command_classes
         command_str = set()
         for cls in commands:
-            command_str.add(self._network.manager.COMMAND_CLASS_DESC[cls])
+            if cls in self._network.manager.COMMAND_CLASS_DESC:
+                command_str.add(self._network.manager.COMMAND_CLASS_DESC[cls])
         return command_str
 
     def get_command_class_as_string(self, class_id):
@@ -396,14 +447,13 @@ class ZWaveNode(ZWaveObject,
 
         """
         values = dict()
-        for value in self.values:
-            if (genre == 'All' or self.values[value].genre == genre) and \
-              (type == 'All' or self.values[value].type == type) and \
-              (readonly == 'All' or self.values[value].is_read_only == readonly) and \
-              (writeonly == 'All' or self.values[value].is_write_only == writeonly):
-                if self.values[value].command_class not in values:
-                    values[self.values[value].command_class] = dict()
-                values[self.values[value].command_class][value] = self.values[value]
+        selected = self.get_values(genre=genre, type=type, readonly=readonly, writeonly=writeonly)
+        for command_class, ids in self._values_indexes['command_class'].items():
+            for value in ids:
+                if value in selected:
+                    if command_class not in values:
+                        values[command_class] = dict()
+                    values[command_class][value] = selected[value]
         return values
 
     def get_values_for_command_class(self, class_id):
@@ -449,18 +499,94 @@ class ZWaveNode(ZWaveObject,
 
         """
         ret = dict()
-        valkeys = self.values.keys()
-        for value in valkeys:
-            if (class_id == 'All' or self.values[value].command_class == class_id) and \
-              (genre == 'All' or self.values[value].genre == genre) and \
-              (type == 'All' or self.values[value].type == type) and \
-              (readonly == 'All' or self.values[value].is_read_only == readonly) and \
+        for value in self._indexed_values(class_id=class_id, genre=genre, type=type, index=index):
+            if (readonly == 'All' or self.values[value].is_read_only == readonly) and \
               (writeonly == 'All' or self.values[value].is_write_only == writeonly) and \
-              (index == 'All' or self.values[value].index == index) and \
               (label == 'All' or self.values[value].label == label):
                 ret[value] = self.values[value]
         return ret
 
+    def _indexed_values(self, class_id='All', genre='All', type='All', index='All', instance='All'):
+        """
+        Retrieve the ids of the values matching the filters from the indexes.
+
+        :param class_id: the COMMAND_CLASS to get values
+        :type class_id: hexadecimal code
+        :param genre: the genre of value
+        :type genre: 'All' or PyGenres
+        :param type: the type of value
+        :type type: 'All' or PyValueTypes
+        :param index: Index of value within all the values
+        :type index: int
+        :param instance: Instance of the value. Needs an index
+        :type instance: int
+        :rtype: set() of value ids
+
+        """
+        filters = []
+        if class_id != 'All':
+            filters.append(self._values_indexes['command_class'].get(class_id, ()))
+        if genre != 'All':
+            filters.append(self._values_indexes['genre'].get(genre, ()))
+        if type != 'All':
+            filters.append(self._values_indexes['type'].get(type, ()))
+        if index != 'All':
+            if instance != 'All':
+                filters.append(self._values_indexes['instance_index'].get((instance, index), ()))
+            else:
+                filters.append(self._values_indexes['index'].get(index, ()))
+        if len(filters) == 0:
+            return set(self.values.keys())
+        filters.sort(key=len)
+        if len(filters[0]) == 0:
+            #A key is missing from an index : no value matches
+            return set()
+        ret = set(filters[0])
+        for ids in filters[1:]:
+            ret &= ids
+        #Values could have been removed from self.values without remove_value
+        return set([value_id for value_id in ret if value_id in self.values])
+
+    def _index_value(self, value, metadata=None):
+        """
+        Add a value to the indexes of the node.
+
+        :param value: The value to index
+        :type value: ZWaveValue
+        :param metadata: The value of the ValueAdded notification. Avoid to query the manager.
+        :type metadata: libopenzwave.PyValueId
+
+        """
+        if metadata is None:
+            keys = (value.command_class, value.genre, value.type, value.index, \
+                (value.instance, value.index))
+        else:
+            keys = (metadata.commandClassId, PyGenres[metadata.genreInt], \
+                PyValueTypes[metadata.typeInt], metadata.index, \
+                (metadata.instance, metadata.index))
+        self._unindex_value(value.value_id)
+        self._values_keys[value.value_id] = keys
+        for name, key in zip(('command_class', 'genre', 'type', 'index', 'instance_index'), keys):
+            self._values_indexes[name].setdefault(key, set()).add(value.value_id)
+
+    def _unindex_value(self, value_id):
+        """
+        Remove a value from the indexes of the node.
+
+        :param value_id: The id of the value to remove
+        :type value_id: int
+
+        """
+        keys = self._values_keys.pop(value_id, None)
+        if keys is None:
+            return
+        for name, key in zip(('command_class', 'genre', 'type', 'index', 'instance_index'), keys):
+            ids = self._values_indexes[name].get(key)
+            if ids is not None:
+                ids.discard(value_id)
+                if len(ids) == 0:
+                    del self._values_indexes[name][key]
+
     def values_to_dict(self, extras=['all']):
         """
         Return a dict representation of the values.
@@ -471,45 +597,61 @@ class ZWaveNode(ZWaveObject,
         :rtype: dict()
 
         """
+        kvals = {}
+        if ('all' in extras or 'kvals' in extras) and self.network.kvals_store is not None:
+            #The kvals of all the values in one call
+            kvals = self.network.kvals_store.get_table('ZWaveValue', list(self.values.keys()))
         ret={}
         for vid in self.values.keys():
-            ret[vid] = self.values[vid].to_dict(extras=extras)
+            ret[vid] = self.values[vid].to_dict(extras=extras, kvals=kvals.get(vid, {}))
         return ret
 
-    def add_value(self, value_id):
+    def add_value(self, value_id, metadata=None):
         """
         Add a value to the node
 
         :param value_id: The id of the value to add
         :type value_id: int
-        :param command_class: The command_class of the value
-        :type command_class: str
+        :param metadata: The value of the ValueAdded notification, used to index the value
+        :type metadata: libopenzwave.PyValueId
         :rtype: bool
 
         """
         value = ZWaveValue(value_id, network=self.network, parent=self)
+        value.seed_cache(metadata)
         self.values[value_id] = value
+        self._index_value(value, metadata)
 
     def change_value(self, value_id):
         """
-        Change a value of the node.
-        Not implemented
+        The data of a value of the node has been changed or refreshed
+        from the Z-Wave network : outdate it in the cache and add its new
+        data to its history.
 
         :param value_id: The id of the value to change
         :type value_id: int
 
         """
-        pass
+        if value_id in self.values:
+            value = self.values[value_id]
+            value.outdate_data()
+            value.last_update = time.time()
+            if value.history is not None:
+                try:
+                    value.history.append(float(value.data))
+                except (TypeError, ValueError):
+                    logger.warning(u"Can't add data of value %s to its history", value_id)
 
     def refresh_value(self, value_id):
         """
-        Refresh a value of the node.
-        Not implemented
+        Refresh a value of the node from the Z-Wave network.
 
         :param value_id: The id of the value to change
         :type value_id: int
 
         """
+        if value_id in self.values:
+            self.values[value_id].outdate_data()
         return self._network.manager.refreshValue(value_id)
 
     def remove_value(self, value_id):
@@ -522,6 +664,7 @@ class ZWaveNode(ZWaveObject,
         :rtype: bool
 
         """
+        self._unindex_value(value_id)
         if value_id in self.values:
             logger.debug("Remove value : %s", self.values[value_id])
             del self.values[value_id]
@@ -557,7 +700,7 @@ class ZWaveNode(ZWaveObject,
         :rtype: bool
 
         """
-        return class_id in self.command_classes
+        return class_id in self._get_command_classes()
 
     @property
     def manufacturer_id(self):
@@ -1037,7 +1180,25 @@ class ZWaveNode(ZWaveObject,
         :type value: bool
 
         """
-        self._isReady = value
+        if self._network is None:
+            self._isReady = value
+            return
+        with self._network.node_condition:
+            self._isReady = value
+            self._network.node_condition.notify_all()
+
+    def wait_ready(self, timeout=None):
+        """
+        Wait until the node is ready to operate (QueryStage Completed).
+        Return as soon as the notification SIGNAL_NODE_QUERIES_COMPLETE is handled.
+
+        :param timeout: The maximum time to wait, in seconds. None to wait forever
+        :type timeout: float
+        :returns: True if the node is ready
+        :rtype: bool
+
+        """
+        return wait_for(self._network.node_condition, lambda: self._isReady, timeout=timeout)
 
     @property
     def is_info_received(self):
@@ -26,6 +26,7 @@ along with python-openzwave. If not, see http://www.gnu.org/licenses.
 # Set default logging handler to avoid "No handler found" warnings.
 import logging
 import warnings
+import time
 try:  # Python 2.7+
     from logging import NullHandler
 except ImportError:
@@ -51,6 +52,29 @@ def deprecated(func):
     new_func.__dict__.update(func.__dict__)
     return new_func
 
+def wait_for(condition, predicate, timeout=None, interval=None):
+    """Wait on condition until predicate() is true or timeout expires.
+    The condition is notified by the notification handlers : interval
+    only bounds each wait, for predicates no notification announces.
+    Return the last result of predicate()."""
+    deadline = None if timeout is None else time.time() + timeout
+    with condition:
+        result = predicate()
+        while not result:
+            wait = interval
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                wait = remaining if wait is None else min(wait, remaining)
+            try:
+                condition.wait(wait)
+            except AssertionError:
+                #For gevent AssertionError: Impossible to call blocking function in the event loop callback
+                return predicate()
+            result = predicate()
+    return result
+
 class ZWaveException(Exception):
     """
     Exception class for OpenZWave
@@ -99,11 +123,26 @@ class ZWaveCommandClassException(ZWaveException):
     def __str__(self):
         return repr(self.msg+' : '+self.value)
 
+class ZWaveWriteException(ZWaveException):
+    """
+    Exception class for OpenZWave
+    """
+    def __init__(self, value):
+        ZWaveException.__init__(self, value)
+        self.msg = u"Zwave Write Exception"
+        self.value = value
+
+    def __str__(self):
+        return repr(self.msg+' : '+self.value)
+
 class ZWaveObject(object):
     """
     Represents a Zwave object. Values, nodes, ... can be changer by
     other managers on the network.
     """
+    #Thousands of values and nodes are created : don't give them a __dict__
+    __slots__ = ('_network', '_last_update', '_outdated', '_use_cache', \
+        '_object_id', '_cached_properties', '_dict_cache', '__weakref__')
 
     def __init__(self, object_id, network=None, use_cache=True):
         """
@@ -120,10 +159,10 @@ class ZWaveObject(object):
         self._outdated = True
         self._use_cache = use_cache
         self._object_id = object_id
-        if self._use_cache:
-            self._cached_properties = dict()
-        else:
-            self._cached_properties = None
+        #Allocated by cache_property
+        self._cached_properties = None
+        #The dict representations built by to_dict, by extras
+        self._dict_cache = None
 
     @property
     def home_id(self):
@@ -204,9 +243,11 @@ class ZWaveObject(object):
         """
         if self._use_cache:
             if value:
-                for prop in self._cached_properties:
-                    self._cached_properties[prop] = True
+                if self._cached_properties is not None:
+                    for prop in self._cached_properties:
+                        self._cached_properties[prop] = True
                 self._outdated = value
+                self.outdate_dict()
             else:
                 raise ZWaveCacheException(u"Can't set outdated to False manually. It is done automatically.")
         else:
@@ -222,7 +263,7 @@ class ZWaveObject(object):
 
         """
         if self._use_cache:
-            if str(prop) in self._cached_properties:
+            if self._cached_properties is not None and str(prop) in self._cached_properties:
                 #print "property in cache %s" % self._cached_properties[str(prop)]
                 return self._cached_properties[str(prop)]
             else:
@@ -240,12 +281,51 @@ class ZWaveObject(object):
 
         """
         if self._use_cache:
-            if str(prop) in self._cached_properties:
+            if self._cached_properties is not None and str(prop) in self._cached_properties:
                 self._cached_properties[str(prop)] = True
                 self._outdated = True
+            self.outdate_dict()
         else:
             raise ZWaveCacheException(u"Cache not enabled")
 
+    def outdate_dict(self):
+        """
+        Says that the dict representation of the object must be built again
+        by the next call to to_dict.
+        Called by the network when a notification changes the object.
+
+        """
+        self._dict_cache = None
+
+    def _memoized_dict(self, extras, build):
+        """
+        Return the dict representation built by build(extras), keeping it
+        until the object is outdated. When the cache is disabled, it is built
+        on each call.
+
+        The returned dict is a copy, but the dicts it contains are shared
+        between the calls : don't modify them.
+
+        :param extras: The extra inforamtions to add
+        :type extras: []
+        :param build: The method building the dict representation
+        :type build: lambda
+        :rtype: dict()
+
+        """
+        if not self._use_cache:
+            return build(extras)
+        key = tuple(extras)
+        cache = self._dict_cache
+        if cache is not None and key in cache:
+            return dict(cache[key])
+        if cache is None:
+            #If the object is outdated while building, the dict is built in an orphan cache
+            cache = self._dict_cache = {}
+        ret = build(extras)
+        cache[key] = ret
+        return dict(ret)
+
     def update(self, prop):
         """
         Says that the property are updated.
@@ -255,7 +335,7 @@ class ZWaveObject(object):
 
         """
         if self._use_cache:
-            if str(prop) in self._cached_properties:
+            if self._cached_properties is not None and str(prop) in self._cached_properties:
                 self._cached_properties[str(prop)] = False
                 out_dated = False
                 for prop in self._cached_properties:
@@ -275,6 +355,8 @@ class ZWaveObject(object):
 
         """
         if self._use_cache:
+            if self._cached_properties is None:
+                self._cached_properties = dict()
             self._cached_properties[str(prop)] = True
         else:
             raise ZWaveCacheException(u"Cache not enabled")
@@ -298,40 +380,28 @@ class ZWaveObject(object):
         :rtype: {}
 
         """
-        if self.network.dbcon is None:
+        if self.network.kvals_store is None:
             return None
-        res = {}
-        cur = self.network.dbcon.cursor()
-        cur.execute("SELECT key,value FROM %s WHERE object_id=?"%(self.__class__.__name__), (self.object_id,))
-        while True:
-            row = cur.fetchone()
-            if row == None:
-                break
-            res[row[0]] = row[1]
-        return res
+        return self.network.kvals_store.get(self.__class__.__name__, self.object_id)
 
     @kvals.setter
     def kvals(self, kvs):
         """
         The keyvals store in db for this object.
+        They are written to the database by the write-behind thread of the store.
 
         :param kvs: The key/valuse to store in db. Setting a value to None will remove it.
         :type kvs: {}
         :rtype: boolean
 
         """
-        if self.network.dbcon is None:
+        if self.network.kvals_store is None:
             return False
         if len(kvs) == 0:
             return True
-        cur = self.network.dbcon.cursor()
-        for key in kvs.keys():
-            logger.debug(u"DELETE FROM %s WHERE object_id=%s and key='%s'", self.__class__.__name__, self.object_id, key)
-            cur.execute("DELETE FROM %s WHERE object_id=? and key=?"%(self.__class__.__name__), (self.object_id, key))
-            if kvs[key] is not None:
-                logger.debug(u"INSERT INTO %s(object_id, 'key', 'value') VALUES (%s,'%s','%s');", self.__class__.__name__, self.object_id, key, kvs[key])
-                cur.execute("INSERT INTO %s(object_id, 'key', 'value') VALUES (?,?,?)"%(self.__class__.__name__), (self.object_id, key, kvs[key]))
-        self.network.dbcon.commit()
+        self.network.kvals_store.set(self.__class__.__name__, self.object_id, kvs)
+        self.outdate_dict()
+        self.network._record_object_change(self)
         return True
 
 class ZWaveNodeInterface(object):
@@ -340,6 +410,9 @@ class ZWaveNodeInterface(object):
     specific commandClasses (ie a switch, a dimmer, a thermostat, ...).
     Don't know what to do with it now but sure it must exist
     """
+    #Mixed with ZWaveObject in ZWaveNode : no instance attributes
+    __slots__ = ()
+    _class = "unknown"
 
     def __init__(self):
         """
@@ -351,4 +424,4 @@ class ZWaveNodeInterface(object):
         :type network: ZWaveNetwork
 
         """
-        self._class = "unknown"
+        pass
@@ -41,6 +41,7 @@ class ZWaveScene(ZWaveObject):
     """
     Represents a single scene within the Z-Wave Network
     """
+    __slots__ = ('values',)
 
     def __init__(self, scene_id, network=None):
         """
@@ -216,7 +217,7 @@ class ZWaveScene(ZWaveObject):
         ret = {}
         ret['label'] = self.label
         ret['scene_id'] = self.scene_id
-        if 'kvals' in extras and self.network.dbcon is not None:
+        if 'kvals' in extras and self.network.kvals_store is not None:
             vals = self.kvals
             for key in vals.keys():
                 ret[key]=vals[key]
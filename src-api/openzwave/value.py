@@ -23,8 +23,14 @@ You should have received a copy of the GNU General Public License
 along with python-openzwave. If not, see http://www.gnu.org/licenses.
 
 """
+import bisect
+import heapq
+import threading
+import time
+from array import array
+from concurrent.futures import Future
 from six import string_types
-from openzwave.object import ZWaveObject
+from openzwave.object import ZWaveObject, ZWaveWriteException, ZWaveTypeException
 
 # Set default logging handler to avoid "No handler found" warnings.
 import logging
@@ -38,13 +44,352 @@ except ImportError:
 logger = logging.getLogger('openzwave')
 logger.addHandler(NullHandler())
 
+class ZWavePendingWrites(object):
+    """
+    The writes waiting for a confirmation of the nodes, indexed by value_id.
+
+    A write is resolved by the first ValueChanged or ValueRefreshed notification
+    of its value whose data matches the written one. The timeouts are handled
+    by a single thread sleeping until the next deadline.
+    """
+
+    def __init__(self):
+        """
+        Initialize the table.
+
+        """
+        self._condition = threading.Condition()
+        #The futures of each value_id
+        self._pending = {}
+        #The match function of the futures, if any
+        self._matches = {}
+        #A heap of (deadline, sequence, value_id, future)
+        self._deadlines = []
+        self._sequence = 0
+        self._thread = None
+
+    def __contains__(self, value_id):
+        return value_id in self._pending
+
+    def __len__(self):
+        with self._condition:
+            return sum([len(futures) for futures in self._pending.values()])
+
+    def add(self, value_id, timeout=None, match=None):
+        """
+        Add a pending write.
+
+        :param value_id: The value written
+        :type value_id: int
+        :param timeout: The time to wait for the confirmation, in seconds. None to wait forever
+        :type timeout: float
+        :param match: Return True if the data of a notification confirms the write. None to accept any data
+        :type match: lambda
+        :returns: The future of the write
+        :rtype: concurrent.futures.Future
+
+        """
+        future = Future()
+        with self._condition:
+            self._pending.setdefault(value_id, []).append(future)
+            if match is not None:
+                self._matches[future] = match
+            if timeout is not None:
+                self._sequence += 1
+                heapq.heappush(self._deadlines, (time.time() + timeout, self._sequence, value_id, future))
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='openzwave-writes')
+                    self._thread.daemon = True
+                    self._thread.start()
+                self._condition.notify()
+        return future
+
+    def _pop(self, value_id, future=None):
+        """
+        Remove the futures of a value, or only future. Must be called with the lock.
+
+        """
+        futures = self._pending.get(value_id, [])
+        if future is None:
+            self._pending.pop(value_id, None)
+        elif future in futures:
+            futures.remove(future)
+            if not futures:
+                del self._pending[value_id]
+            futures = [future]
+        else:
+            return []
+        for future in futures:
+            self._matches.pop(future, None)
+        return futures
+
+    def resolve(self, value_id, data):
+        """
+        Resolve the pending writes of a value confirmed by data, with data.
+        The other ones keep waiting. Called on ValueChanged and ValueRefreshed.
+
+        :param value_id: The value confirmed
+        :type value_id: int
+        :param data: The data of the value
+        :type data: variable
+
+        """
+        if value_id not in self._pending:
+            return
+        futures = []
+        with self._condition:
+            for future in list(self._pending.get(value_id, [])):
+                match = self._matches.get(future)
+                try:
+                    confirmed = match is None or match(data)
+                except Exception:
+                    logger.exception(u'Error when matching the data of value %s', value_id)
+                    confirmed = False
+                if confirmed:
+                    futures.extend(self._pop(value_id, future))
+        for future in futures:
+            if not future.done():
+                future.set_result(data)
+
+    def fail(self, value_id, message, future=None):
+        """
+        Fail the pending writes of a value, or only future.
+
+        :param value_id: The value written
+        :type value_id: int
+        :param message: The message of the exception
+        :type message: str
+
+        """
+        with self._condition:
+            futures = self._pop(value_id, future)
+        for future in futures:
+            if not future.done():
+                future.set_exception(ZWaveWriteException(message))
+
+    def fail_all(self, message):
+        """
+        Fail all the pending writes. Called when the network is stopped.
+
+        :param message: The message of the exception
+        :type message: str
+
+        """
+        with self._condition:
+            value_ids = list(self._pending.keys())
+        for value_id in value_ids:
+            self.fail(value_id, message)
+
+    def _run(self):
+        """
+        Fail the writes whose deadline is reached.
+
+        """
+        while True:
+            expired = []
+            with self._condition:
+                while not self._deadlines:
+                    self._condition.wait()
+                now = time.time()
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    expired.append(heapq.heappop(self._deadlines))
+                if not expired:
+                    self._condition.wait(self._deadlines[0][0] - now)
+            for deadline, sequence, value_id, future in expired:
+                if not future.done():
+                    self.fail(value_id, u"No confirmation for value %s" % value_id, future=future)
+
 # TODO: don't report controller node as sleeping
 # TODO: allow value identification by device/index/instance
+#The timestamps of the history : time.time on python 2
+_monotonic = getattr(time, 'monotonic', time.time)
+
+class ZWaveValueHistory(object):
+    """
+    The last data of a numeric value, kept in a ring buffer.
+
+    The timestamps and the data are stored in two arrays of doubles :
+    a history takes 16 bytes by sample, whatever its type.
+    The timestamps come from the monotonic clock : use clock() to get the
+    current time.
+    """
+    __slots__ = ('_times', '_data', '_capacity', '_next', '_count', '_lock')
+
+    #The clock of the timestamps
+    clock = staticmethod(_monotonic)
+
+    def __init__(self, capacity=1000):
+        """
+        Allocate the ring buffer.
+
+        :param capacity: The number of samples kept
+        :type capacity: int
+
+        """
+        if capacity < 1:
+            raise ValueError(u"The capacity of a history must be positive")
+        self._times = array('d', [0.0]) * capacity
+        self._data = array('d', [0.0]) * capacity
+        self._capacity = capacity
+        #The index of the next sample
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        """
+        The number of samples kept.
+
+        :rtype: int
+
+        """
+        return self._capacity
+
+    def __len__(self):
+        return self._count
+
+    def append(self, data, timestamp=None):
+        """
+        Add a sample, replacing the oldest one when the history is full.
+
+        :param data: The data
+        :type data: float
+        :param timestamp: The time of the sample. None for now
+        :type timestamp: float
+
+        """
+        if timestamp is None:
+            timestamp = _monotonic()
+        with self._lock:
+            self._times[self._next] = timestamp
+            self._data[self._next] = data
+            self._next = (self._next + 1) % self._capacity
+            if self._count < self._capacity:
+                self._count += 1
+
+    def clear(self):
+        """
+        Remove all the samples.
+
+        """
+        with self._lock:
+            self._next = 0
+            self._count = 0
+
+    def _select(self, start, end):
+        """
+        Return the arrays of the timestamps and the data of the samples
+        between start and end, from the oldest to the newest.
+
+        """
+        with self._lock:
+            if self._count < self._capacity:
+                times = self._times[:self._count]
+                data = self._data[:self._count]
+            else:
+                times = self._times[self._next:] + self._times[:self._next]
+                data = self._data[self._next:] + self._data[:self._next]
+        low = 0 if start is None else bisect.bisect_left(times, start)
+        high = len(times) if end is None else bisect.bisect_right(times, end)
+        return times[low:high], data[low:high]
+
+    def window(self, start=None, end=None):
+        """
+        The samples between start and end, from the oldest to the newest.
+
+        .. code-block:: python
+
+                #The samples of the last hour
+                value.history.window(start=value.history.clock() - 3600)
+
+        :param start: The oldest timestamp. None for the oldest sample
+        :type start: float
+        :param end: The newest timestamp. None for the newest sample
+        :type end: float
+        :returns: The (timestamp, data) of the samples
+        :rtype: list of tuple
+
+        """
+        times, data = self._select(start, end)
+        return list(zip(times, data))
+
+    def min(self, start=None, end=None):
+        """
+        The minimum of the samples between start and end, None if there is no sample.
+
+        :rtype: float
+
+        """
+        data = self._select(start, end)[1]
+        return min(data) if len(data) > 0 else None
+
+    def max(self, start=None, end=None):
+        """
+        The maximum of the samples between start and end, None if there is no sample.
+
+        :rtype: float
+
+        """
+        data = self._select(start, end)[1]
+        return max(data) if len(data) > 0 else None
+
+    def mean(self, start=None, end=None):
+        """
+        The mean of the samples between start and end, None if there is no sample.
+
+        :rtype: float
+
+        """
+        data = self._select(start, end)[1]
+        return sum(data) / len(data) if len(data) > 0 else None
+
+    def downsample(self, interval, start=None, end=None):
+        """
+        The mean of the samples between start and end, by buckets of interval
+        seconds. The buckets without sample are skipped.
+
+        :param interval: The duration of a bucket, in seconds
+        :type interval: float
+        :returns: The (start of the bucket, mean) of the buckets
+        :rtype: list of tuple
+
+        """
+        times, data = self._select(start, end)
+        ret = []
+        if len(times) == 0:
+            return ret
+        origin = start if start is not None else times[0]
+        bucket = None
+        total = 0.0
+        count = 0
+        for i in range(len(times)):
+            current = origin + ((times[i] - origin) // interval) * interval
+            if current != bucket:
+                if count > 0:
+                    ret.append((bucket, total / count))
+                bucket = current
+                total = 0.0
+                count = 0
+            total += data[i]
+            count += 1
+        ret.append((bucket, total / count))
+        return ret
+
 class ZWaveValue(ZWaveObject):
     """
     Represents a single value.
+
+    When the cache is enabled, the attributes of the value are read once from
+    the manager and kept until a notification or a write outdates them.
+    The command class, genre, type, label and units are kept in a descriptor
+    shared by all the values with the same metadata.
     """
-    def __init__(self, value_id, network=None, parent=None):
+    #The types of the values having an history
+    _HISTORY_TYPES = ('Bool', 'Byte', 'Decimal', 'Int', 'Short')
+    __slots__ = ('_parent', '_cache', '_history')
+
+    def __init__(self, value_id, network=None, parent=None, use_cache=None):
         """
         Initialize value
 
@@ -69,10 +414,141 @@ class ZWaveValue(ZWaveObject):
         :type value_id: int
         :param network: The network object to access the manager
         :type network: ZWaveNetwork
+        :param use_cache: Serve the attributes from a cache. None to use the setting of the network
+        :type use_cache: bool
         """
-        ZWaveObject.__init__(self, value_id, network=network)
+        if use_cache is None:
+            use_cache = network.use_cache if network is not None else True
+        ZWaveObject.__init__(self, value_id, network=network, use_cache=use_cache)
         logger.debug(u"Create object value (valueId:%s)", value_id)
         self._parent = parent
+        #Allocated on first cached read
+        self._cache = None
+        #Allocated by enable_history
+        self._history = None
+
+    def _cached(self, prop, getter):
+        """
+        Return the property from the cache. Read it with getter if it is outdated.
+
+        :param prop: The property to read
+        :type prop: str
+        :param getter: The method of the manager to read the property
+        :type getter: lambda
+
+        """
+        if not self._use_cache:
+            return getter(self.value_id)
+        if self.is_outdated(prop):
+            self._set_cached(prop, getter(self.value_id))
+        return self._cache[prop]
+
+    def _set_cached(self, prop, value):
+        """
+        Store a property in the cache.
+
+        :param prop: The property to store
+        :type prop: str
+        :param value: The value of the property
+        :type value: variable
+
+        """
+        if self._use_cache:
+            if self._cache is None:
+                self._cache = dict()
+            self._cache[prop] = value
+            if self._cached_properties is None or prop not in self._cached_properties:
+                self.cache_property(prop)
+            self.update(prop)
+
+    def _described(self, prop, getter):
+        """
+        Return a property of the shared descriptor. Read it with getter if the cache is disabled.
+
+        :param prop: The attribute of the descriptor
+        :type prop: str
+        :param getter: The method of the manager to read the property
+        :type getter: lambda
+
+        """
+        if not self._use_cache:
+            return getter(self.value_id)
+        descriptor = self.descriptor
+        if descriptor is None:
+            return None
+        return getattr(descriptor, prop)
+
+    def seed_cache(self, metadata):
+        """
+        Fill the cache with the static attributes of a ValueAdded notification.
+        The descriptor and data are read on first access.
+
+        :param metadata: The value of the ValueAdded notification
+        :type metadata: libopenzwave.PyValueId
+
+        """
+        if not self._use_cache or metadata is None:
+            return
+        self._set_cached('instance', metadata.instance)
+        self._set_cached('index', metadata.index)
+
+    @property
+    def history(self):
+        """
+        The history of the data of the value. None if it is not enabled.
+
+        :rtype: ZWaveValueHistory
+
+        """
+        return self._history
+
+    def enable_history(self, capacity=1000):
+        """
+        Keep the last data of the value, received with ValueChanged and
+        ValueRefreshed notifications. Only numeric values have an history.
+
+        :param capacity: The number of samples kept
+        :type capacity: int
+        :returns: The history
+        :rtype: ZWaveValueHistory
+        :raises: ZWaveTypeException if the value is not numeric
+
+        """
+        if self.type not in self._HISTORY_TYPES:
+            raise ZWaveTypeException(u"No history for values of type %s" % self.type)
+        if self._history is None or self._history.capacity != capacity:
+            self._history = ZWaveValueHistory(capacity)
+        return self._history
+
+    def disable_history(self):
+        """
+        Stop keeping the data of the value and free its history.
+
+        """
+        self._history = None
+
+    def outdate_dict(self):
+        """
+        Says that the dict representation of the value, and of its node,
+        must be built again by the next call to to_dict.
+
+        """
+        self._dict_cache = None
+        if self._parent is not None:
+            self._parent.outdate_dict()
+
+    def outdate_data(self):
+        """
+        Says that the data of the value must be read again from the manager.
+        The descriptor (label, units, ...) and the read only flag can be changed
+        by the same notifications : they are read again too.
+        Called on ValueChanged and ValueRefreshed notifications, writes and refreshes.
+
+        """
+        if self._use_cache:
+            self.outdate('data')
+            self.outdate('descriptor')
+            self.outdate('is_read_only')
 
     def __str__(self):
         """
@@ -130,6 +606,17 @@ class ZWaveValue(ZWaveObject):
         """
         return self._parent
 
+    @property
+    def descriptor(self):
+        """
+        Get the metadata of the value : command class, genre, type, label and units.
+        The values with the same metadata share the same descriptor, so comparing
+        the descriptors of two values is cheap.
+
+        :rtype: libopenzwave.PyValueDescriptor
+        """
+        return self._cached('descriptor', self._network.manager.getValueDescriptor)
+
     @property
     def label(self):
         """
@@ -137,7 +624,7 @@ class ZWaveValue(ZWaveObject):
 
         :rtype: str
         """
-        return self._network.manager.getValueLabel(self.value_id)
+        return self._described('label', self._network.manager.getValueLabel)
 
     @label.setter
     def label(self, value):
@@ -148,6 +635,8 @@ class ZWaveValue(ZWaveObject):
         :type value: str
         """
         self._network.manager.setValueLabel(self.value_id, value)
+        if self._use_cache:
+            self.outdate('descriptor')
 
     @property
     def help(self):
@@ -177,7 +666,7 @@ class ZWaveValue(ZWaveObject):
         :rtype: str
 
         """
-        return self._network.manager.getValueUnits(self.value_id)
+        return self._described('units', self._network.manager.getValueUnits)
 
     @units.setter
     def units(self, value):
@@ -189,6 +678,8 @@ class ZWaveValue(ZWaveObject):
 
         """
         self._network.manager.setValueUnits(self.value_id, value)
+        if self._use_cache:
+            self.outdate('descriptor')
 
     @property
     def max(self):
@@ -221,7 +712,7 @@ class ZWaveValue(ZWaveObject):
         :rtype: str
 
         """
-        return self._network.manager.getValueType(self.value_id)
+        return self._described('type', self._network.manager.getValueType)
 
     @property
     def genre(self):
@@ -234,7 +725,7 @@ class ZWaveValue(ZWaveObject):
         :rtype: str
 
         """
-        return self._network.manager.getValueGenre(self.value_id)
+        return self._described('genre', self._network.manager.getValueGenre)
 
     @property
     def index(self):
@@ -248,7 +739,7 @@ class ZWaveValue(ZWaveObject):
         :rtype: int
 
         """
-        return self._network.manager.getValueIndex(self.value_id)
+        return self._cached('index', self._network.manager.getValueIndex)
 
     @property
     def instance(self):
@@ -261,7 +752,7 @@ class ZWaveValue(ZWaveObject):
         :rtype: int
 
         """
-        return self._network.manager.getValueInstance(self.value_id)
+        return self._cached('instance', self._network.manager.getValueInstance)
 
     @property
     def data(self):
@@ -272,7 +763,7 @@ class ZWaveValue(ZWaveObject):
         :rtype: depending of the type of the value
 
         """
-        return self._network.manager.getValue(self.value_id)
+        return self._cached('data', self._network.manager.getValue)
 
     @data.setter
     def data(self, value):
@@ -290,6 +781,75 @@ class ZWaveValue(ZWaveObject):
 
         """
         self._network.manager.setValue(self.value_id, value)
+        self.outdate_data()
+
+    def set(self, data, confirm=True, timeout=None):
+        """
+        Set the data of the value and return a future of the write.
+
+        With confirm, the future is resolved with the data reported by the node
+        with the first ValueChanged or ValueRefreshed notification matching data,
+        once converted to the type of the value (see check_data). The reports of
+        other data, ie the old one, are ignored : without timeout, the future
+        waits until the node reports the written data.
+        It fails with a ZWaveWriteException when the write is rejected or
+        not confirmed before timeout.
+
+        .. code-block:: python
+
+                future = value.set(50, timeout=5)
+                data = future.result()
+
+        :param data: The new data of the value
+        :type data: variable
+        :param confirm: Wait for the confirmation of the node. Otherwise, the future is resolved when the command is queued.
+        :type confirm: bool
+        :param timeout: The time to wait for the confirmation, in seconds. None to wait forever
+        :type timeout: float
+        :returns: The future of the write
+        :rtype: concurrent.futures.Future
+
+        """
+        if confirm:
+            future = self._network.pending_writes.add(self.value_id, timeout=timeout, \
+                match=self._write_match(data))
+        else:
+            future = Future()
+        ret = self._network.manager.setValue(self.value_id, data)
+        self.outdate_data()
+        if ret != 1:
+            if confirm:
+                self._network.pending_writes.fail(self.value_id, u"Can't set value %s" % self.value_id, future=future)
+            else:
+                future.set_exception(ZWaveWriteException(u"Can't set value %s" % self.value_id))
+        elif not confirm:
+            future.set_result(data)
+        return future
+
+    #The types whose reported data can be compared to the written one
+    _MATCHED_TYPES = ('Bool', 'Byte', 'Decimal', 'Int', 'Short', 'String', 'List')
+
+    def _write_match(self, data):
+        """
+        Return the function checking that the data of a notification confirms
+        a write of data. None to accept any data, ie for buttons.
+
+        :param data: The data written
+        :type data: variable
+        :rtype: lambda
+
+        """
+        if self.type not in self._MATCHED_TYPES:
+            return None
+        target = self.check_data(data)
+        if target is None:
+            return None
+        if self.type == 'Decimal':
+            #The node rounds the data to the precision of the value
+            precision = self.precision
+            tolerance = 0.5 * 10 ** -precision if precision is not None and precision >= 0 else 0.0
+            return lambda received: received is not None and abs(float(received) - target) <= tolerance + 1e-9
+        return lambda received: received == target
 
     @property
     def data_as_string(self):
@@ -331,6 +891,40 @@ class ZWaveValue(ZWaveObject):
         else:
             return "Unknown"
 
+    def data_items_from_info(self, info):
+        """
+        Build data_items from the attributes of the value already read by getValueInfo.
+        Used by to_dict : reading data_items directly costs less than getValueInfo.
+
+        :param info: The attributes of the value returned by getValueInfo
+        :type info: libopenzwave.PyValueInfo
+        :return: The valid values or a help string
+        :rtype: string or set
+
+        """
+        if info is None:
+            return "Unknown"
+        if info.readOnly:
+            return "Read only"
+        if info.type == "Bool":
+            return "True or False"
+        elif info.type == "Byte":
+            return "A byte between %s and %s" % (info.min, info.max)
+        elif info.type == "Decimal":
+            return "A decimal"
+        elif info.type == "Int":
+            return "An integer between %s and %s" % (info.min, info.max)
+        elif info.type == "Short":
+            return "A short between %s and %s" % (info.min, info.max)
+        elif info.type == "String":
+            return "A string"
+        elif info.type == "Button":
+            return "True or False"
+        elif info.type == "List":
+            return info.listItems
+        else:
+            return "Unknown"
+
     def check_data(self, data):
         """
         Check that data is correct for this value.
@@ -434,7 +1028,7 @@ class ZWaveValue(ZWaveObject):
         :rtype: bool
 
         """
-        return self._network.manager.isValueReadOnly(self.value_id)
+        return self._cached('is_read_only', self._network.manager.isValueReadOnly)
 
     @property
     def is_write_only(self):
@@ -500,7 +1094,7 @@ class ZWaveValue(ZWaveObject):
         :rtype: int
 
         """
-        return self._network.manager.getValueCommandClass(self.value_id)
+        return self._described('commandClassId', self._network.manager.getValueCommandClass)
 
     def refresh(self):
         """
@@ -510,6 +1104,7 @@ class ZWaveValue(ZWaveObject):
         :rtype: bool
 
         """
+        self.outdate_data()
         return self._network.manager.refreshValue(self.value_id)
 
     @property
@@ -545,32 +1140,57 @@ class ZWaveValue(ZWaveObject):
         logger.debug(u'Set change verified %s for valueId [%s]', verify, self.value_id)
         self._network.manager.setChangeVerified(self.value_id, verify)
 
-    def to_dict(self, extras=['all']):
+    def to_dict(self, extras=['all'], kvals=None):
         """
         Return a dict representation of the node.
+        It is kept until a notification or a write changes the value.
 
         :param extras: The extra inforamtions to add
         :type extras: []
+        :param kvals: The kvals of the value, when already read from the store. None to read them
+        :type kvals: dict()
         :returns: A dict
         :rtype: dict()
 
+        """
+        return self._memoized_dict(extras, lambda extras: self._to_dict(extras, kvals))
+
+    def _to_dict(self, extras, kvals):
+        """
+        Build the dict representation of the value.
+
         """
         attrs = []
         if 'all' in extras:
             extras = ['kvals']
             attrs = ['data_items', 'command_class', 'is_read_only', 'is_write_only', 'type', 'index']
+        info = self._network.manager.getValueInfo(self.value_id)
         ret={}
-        ret['label'] = self.label
         ret['value_id'] = self.value_id
         ret['node_id'] = self.node.node_id
-        ret['units'] = self.units
-        ret['genre'] = self.genre
-        ret['data'] = self.data
-
-        for k in attrs:
-            ret[k] = getattr(self, k)
-        if 'kvals' in extras and self.network.dbcon is not None:
-            vals = self.kvals
+        if info is None:
+            ret['label'] = None
+            ret['units'] = None
+            ret['genre'] = None
+            ret['data'] = None
+            for k in attrs:
+                ret[k] = getattr(self, k)
+        else:
+            if self._use_cache:
+                self._set_cached('descriptor', info.descriptor)
+            ret['label'] = info.label
+            ret['units'] = info.units
+            ret['genre'] = info.genre
+            ret['data'] = info.data
+            if attrs:
+                ret['data_items'] = self.data_items_from_info(info)
+                ret['command_class'] = info.commandClassId
+                ret['is_read_only'] = info.readOnly
+                ret['is_write_only'] = info.writeOnly
+                ret['type'] = info.type
+                ret['index'] = info.index
+        if 'kvals' in extras and self.network.kvals_store is not None:
+            vals = self.kvals if kvals is None else kvals
             for key in vals.keys():
                 ret[key]=vals[key]
         return ret
@@ -49,7 +49,11 @@ from notification cimport Type_CreateButton, Type_DeleteButton, Type_ButtonOn, T
 from notification cimport Type_ValueAdded, Type_ValueRemoved, Type_ValueChanged, Type_ValueRefreshed
 from notification cimport Type_ControllerCommand
 from notification cimport const_notification, pfnOnNotification_t
+from notificationqueue cimport NotificationData_t, NotificationQueue
 from values cimport ValueGenre, ValueType, ValueID
+from values cimport ValueGenre_Basic
+from values cimport ValueType_Bool, ValueType_Byte, ValueType_Decimal, ValueType_Int, ValueType_List
+from values cimport ValueType_Short, ValueType_String, ValueType_Button, ValueType_Raw
 from options cimport Options, Create as CreateOptions, OptionType, OptionType_Invalid, OptionType_Bool, OptionType_Int, OptionType_String
 from manager cimport Manager, Create as CreateManager, Get as GetManager
 from manager cimport struct_associations, int_associations
@@ -57,6 +61,8 @@ from log cimport LogLevel
 import os
 import sys
 import warnings
+import threading
+import weakref
 import six
 from shutil import copyfile
 
@@ -389,7 +395,7 @@ PyLogLevels = {
 
 cdef map[uint64_t, ValueID] values_map
 
-cdef getValueFromType(Manager *manager, valueId):
+cdef getValueFromType(Manager *manager, uint64_t valueId):
     """
     Translate a value in the right type
     """
@@ -399,204 +405,941 @@ cdef getValueFromType(Manager *manager, valueId):
     cdef int32_t type_int
     cdef int16_t type_short
     cdef string type_string
-    cdef vector[string] vect
     cdef uint8_t* vectraw = NULL
     cdef uint8_t size
-    cdef string s
-    c = ""
+    cdef bool cret
+    cdef map[uint64_t, ValueID].iterator it = values_map.find(valueId)
+    cdef ValueID* vid
+    cdef ValueType datatype
     ret = None
-    if values_map.find(valueId) != values_map.end():
-        datatype = PyValueTypes[values_map.at(valueId).GetType()]
-        if datatype == "Bool":
-            cret = manager.GetValueAsBool(values_map.at(valueId), &type_bool)
+    if it != values_map.end():
+        vid = &deref(it).second
+        datatype = vid.GetType()
+        #Cython compiles this chain of comparisons on the C enum into a switch
+        if datatype == ValueType_Bool or datatype == ValueType_Button:
+            cret = manager.GetValueAsBool(deref(vid), &type_bool)
             ret = type_bool if cret else None
-            return ret
-        elif datatype == "Byte":
-            cret = manager.GetValueAsByte(values_map.at(valueId), &type_byte)
+        elif datatype == ValueType_Byte:
+            cret = manager.GetValueAsByte(deref(vid), &type_byte)
             ret = type_byte if cret else None
-            return ret
-        elif datatype == "Raw":
-            cret = manager.GetValueAsRaw(values_map.at(valueId), &vectraw, &size)
+        elif datatype == ValueType_Raw:
+            cret = manager.GetValueAsRaw(deref(vid), &vectraw, &size)
             if cret:
-                for x in range (0, size):
-                    c += chr(vectraw[x])
-            ret = c if cret else None
+                ret = ''.join([chr(vectraw[x]) for x in range(size)])
             free(vectraw)
-            return ret
-        elif datatype == "Decimal":
-            cret = manager.GetValueAsFloat(values_map.at(valueId), &type_float)
+        elif datatype == ValueType_Decimal:
+            cret = manager.GetValueAsFloat(deref(vid), &type_float)
             ret = type_float if cret else None
-            return ret
-        elif datatype == "Int":
-            cret = manager.GetValueAsInt(values_map.at(valueId), &type_int)
+        elif datatype == ValueType_Int:
+            cret = manager.GetValueAsInt(deref(vid), &type_int)
             ret = type_int if cret else None
-            return ret
-        elif datatype == "Short":
-            cret = manager.GetValueAsShort(values_map.at(valueId), &type_short)
+        elif datatype == ValueType_Short:
+            cret = manager.GetValueAsShort(deref(vid), &type_short)
             ret = type_short if cret else None
-            return ret
-        elif datatype == "String":
-            cret = manager.GetValueAsString(values_map.at(valueId), &type_string)
+        elif datatype == ValueType_List:
+            cret = manager.GetValueListSelection(deref(vid), &type_string)
             ret = type_string.c_str() if cret else None
-            return ret
-        elif datatype == "Button":
-            cret = manager.GetValueAsBool(values_map.at(valueId), &type_bool)
-            ret = type_bool if cret else None
-            return ret
-        elif datatype == "List":
-            cret = manager.GetValueListSelection(values_map.at(valueId), &type_string)
-            ret = type_string.c_str() if cret else None
-            return ret
-        else :
-            cret = manager.GetValueAsString(values_map.at(valueId), &type_string)
+        else:
+            #ValueType_String and ValueType_Schedule
+            cret = manager.GetValueAsString(deref(vid), &type_string)
             ret = type_string.c_str() if cret else None
     logger.debug("getValueFromType return %s", ret)
     return ret
 
-cdef delValueId(ValueID v, n):
-    logger.debug("delValueId : ValueID : %s", v.GetId())
-    if values_map.find(v.GetId()) != values_map.end():
-        values_map.erase(values_map.find(v.GetId()))
+cdef delValueId(uint64_t id):
+    logger.debug("delValueId : ValueID : %s", id)
+    if values_map.find(id) != values_map.end():
+        values_map.erase(values_map.find(id))
+    _value_descriptors_by_id.pop(id, None)
+
+#The strings of labels and units already seen, to share them between values.
+#Cleared when the manager is destroyed.
+_interned_strings = {}
+
+cdef internString(s):
+    """
+    Return the shared copy of a label or units string.
+
+    """
+    if s is None:
+        return None
+    return _interned_strings.setdefault(s, s)
+
+#The descriptors already built, indexed by their fields.
+#A descriptor is dropped when no value uses it anymore.
+_value_descriptors = weakref.WeakValueDictionary()
+
+#The descriptors of the values, by value id : buildValueDescriptor don't call the manager
+#for a value already seen. Dropped on ValueRemoved, ValueChanged, ValueRefreshed,
+#label and units changes, and when the manager is destroyed.
+_value_descriptors_by_id = {}
+
+cdef clearValueDescriptors():
+    """
+    Forget the descriptors of the values and the shared strings.
+
+    """
+    _value_descriptors_by_id.clear()
+    _interned_strings.clear()
+
+cdef class PyValueDescriptor:
+    """
+    The metadata shared by many values : command class, genre, type, label and units.
+
+    There is only one descriptor for each combination of these fields, so values
+    with the same metadata share the same object and the same strings. Two
+    descriptors are equal only if they are the same object.
+
+    :see: PyManager.getValueDescriptor, PyValueId.descriptor, PyValueInfo.descriptor
+
+    """
+    cdef readonly uint8_t commandClassId
+    cdef readonly int genreInt
+    cdef readonly int typeInt
+    cdef readonly object label
+    cdef readonly object units
+    cdef object __weakref__
+
+    @property
+    def commandClass(self):
+        """
+        The command class of the values as string.
+
+        :rtype: str
+
+        """
+        return PyManager.COMMAND_CLASS_DESC[self.commandClassId]
+
+    @property
+    def genre(self):
+        """
+        The genre of the values as string (one of PyGenres).
+
+        :rtype: str
+
+        """
+        return PyGenres[self.genreInt]
+
+    @property
+    def type(self):
+        """
+        The type of the values as string (one of PyValueTypes).
+
+        :rtype: str
+
+        """
+        return PyValueTypes[self.typeInt]
+
+    def __reduce__(self):
+        return (internValueDescriptor, (self.commandClassId, self.genreInt, self.typeInt,
+                                        self.label, self.units))
+
+    def __repr__(self):
+        return 'PyValueDescriptor(%r)' % {'commandClass' : self.commandClass,
+                                          'genre' : self.genre, 'type' : self.type,
+                                          'label' : self.label, 'units' : self.units}
+
+cpdef PyValueDescriptor internValueDescriptor(uint8_t commandClassId, int genreInt, int typeInt, label, units):
+    """
+    Return the shared descriptor for this metadata. Build it on first use.
+
+    :param commandClassId: The command class of the values
+    :type commandClassId: int
+    :param genreInt: The genre of the values
+    :type genreInt: int
+    :param typeInt: The type of the values
+    :type typeInt: int
+    :param label: The label of the values
+    :type label: str
+    :param units: The units of the values
+    :type units: str
+    :rtype: PyValueDescriptor
+
+    """
+    key = (commandClassId, genreInt, typeInt, label, units)
+    cdef PyValueDescriptor descriptor = _value_descriptors.get(key)
+    if descriptor is None:
+        descriptor = PyValueDescriptor.__new__(PyValueDescriptor)
+        descriptor.commandClassId = commandClassId
+        descriptor.genreInt = genreInt
+        descriptor.typeInt = typeInt
+        descriptor.label = internString(label)
+        descriptor.units = internString(units)
+        _value_descriptors[key] = descriptor
+    return descriptor
+
+cdef PyValueDescriptor buildValueDescriptor(Manager *manager, ValueID* vid):
+    """
+    Read the label and units of a value and return its shared descriptor.
+    The descriptor of a value already seen is returned without calling the manager.
+
+    """
+    cdef string c_string
+    cdef PyValueDescriptor descriptor = _value_descriptors_by_id.get(vid.GetId())
+    if descriptor is not None:
+        return descriptor
+    c_string = manager.GetValueLabel(deref(vid))
+    label = cstr_to_str(c_string.c_str())
+    c_string = manager.GetValueUnits(deref(vid))
+    units = cstr_to_str(c_string.c_str())
+    descriptor = internValueDescriptor(vid.GetCommandClassId(), vid.GetGenre(), vid.GetType(), label, units)
+    _value_descriptors_by_id[vid.GetId()] = descriptor
+    return descriptor
+
+#The keys available in a value of a notification.
+#Used to emulate the dict which was sent to the watchers before PyValueId.
+_VALUEID_KEYS = ('homeId', 'nodeId', 'commandClass', 'instance', 'index', 'id',
+                 'genre', 'type', 'value', 'label', 'units', 'readOnly')
+
+cdef class PyValueId:
+    """
+    The value part of a ValueAdded, ValueChanged or ValueRefreshed notification.
+
+    The static fields come with the ValueID. The label, units, data and read-only
+    flag are read from the manager on first access and memoized : a handler which
+    only looks at the id costs no call to the manager.
+    Note that the data is the one of the value at the time of the first access.
+
+    For backward compatibility, it can also be read like a dict : value['label'], ...
+
+    """
+    cdef readonly uint64_t id
+    cdef readonly uint32_t homeId
+    cdef readonly uint8_t nodeId
+    cdef readonly uint8_t commandClassId
+    cdef readonly uint8_t instance
+    cdef readonly uint8_t index
+    cdef readonly int genreInt
+    cdef readonly int typeInt
+    cdef bint _has_value
+    cdef bint _has_label
+    cdef bint _has_units
+    cdef bint _has_read_only
+    cdef object _value
+    cdef object _label
+    cdef object _units
+    cdef bint _read_only
+    cdef PyValueDescriptor _descriptor
+
+    @property
+    def commandClass(self):
+        """
+        The command class of the value as string.
+
+        :rtype: str
+
+        """
+        return PyManager.COMMAND_CLASS_DESC[self.commandClassId]
+
+    @property
+    def genre(self):
+        """
+        The genre of the value as string. Empty for Basic values.
+
+        :rtype: str
+
+        """
+        if self.genreInt == ValueGenre_Basic:
+            return ''
+        return PyGenres[self.genreInt]
+
+    @property
+    def type(self):
+        """
+        The type of the value as string (one of PyValueTypes).
+
+        :rtype: str
+
+        """
+        return PyValueTypes[self.typeInt]
+
+    @property
+    def value(self):
+        """
+        The data of the value. Read from the manager on first access.
+
+        :rtype: variable
+
+        """
+        if not self._has_value:
+            self._value = getValueFromType(GetManager(), self.id)
+            self._has_value = True
+        return self._value
+
+    @property
+    def label(self):
+        """
+        The label of the value. Read from the manager on first access.
+
+        :rtype: str
+
+        """
+        cdef string c_string
+        if not self._has_label:
+            if values_map.find(self.id) != values_map.end():
+                c_string = GetManager().GetValueLabel(values_map.at(self.id))
+                self._label = internString(cstr_to_str(c_string.c_str()))
+            self._has_label = True
+        return self._label
+
+    @property
+    def units(self):
+        """
+        The units of the value. Read from the manager on first access.
+
+        :rtype: str
+
+        """
+        cdef string c_string
+        if not self._has_units:
+            if values_map.find(self.id) != values_map.end():
+                c_string = GetManager().GetValueUnits(values_map.at(self.id))
+                self._units = internString(cstr_to_str(c_string.c_str()))
+            self._has_units = True
+        return self._units
+
+    @property
+    def descriptor(self):
+        """
+        The shared metadata of the value. Read the label and units on first access.
+
+        :rtype: PyValueDescriptor
+
+        """
+        if self._descriptor is None:
+            self._descriptor = internValueDescriptor(self.commandClassId, self.genreInt,
+                                                     self.typeInt, self.label, self.units)
+        return self._descriptor
+
+    @property
+    def readOnly(self):
+        """
+        Is the value read only. Read from the manager on first access.
+
+        :rtype: bool
+
+        """
+        if not self._has_read_only:
+            if values_map.find(self.id) != values_map.end():
+                self._read_only = GetManager().IsValueReadOnly(values_map.at(self.id))
+            self._has_read_only = True
+        return self._read_only
+
+    def keys(self):
+        """
+        The keys of the value.
 
-cdef addValueId(ValueID v, n):
+        :rtype: tuple
+
+        """
+        return _VALUEID_KEYS
+
+    def get(self, key, default=None):
+        """
+        Return the field key of the value, else default.
+
+        :param key: The name of the field
+        :type key: str
+        :param default: The value to return if the field is not available
+        :type default: variable
+
+        """
+        if key in _VALUEID_KEYS:
+            return getattr(self, key)
+        return default
+
+    def items(self):
+        """
+        The (key, value) pairs of the value. Read all the lazy fields.
+
+        :rtype: list
+
+        """
+        return [(key, getattr(self, key)) for key in _VALUEID_KEYS]
+
+    def to_dict(self):
+        """
+        Return a dict representation of the value, as sent by previous versions.
+        Read all the lazy fields.
+
+        :rtype: dict()
+
+        """
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        if key in _VALUEID_KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in _VALUEID_KEYS
+
+    def __iter__(self):
+        return iter(_VALUEID_KEYS)
+
+    def __len__(self):
+        return len(_VALUEID_KEYS)
+
+    def __repr__(self):
+        #Don't read the lazy fields : logging must not call the manager
+        ret = {'id' : self.id, 'homeId' : self.homeId, 'nodeId' : self.nodeId,
+               'commandClass' : self.commandClass, 'instance' : self.instance,
+               'index' : self.index, 'genre' : self.genre, 'type' : self.type}
+        if self._has_value:
+            ret['value'] = self._value
+        if self._has_label:
+            ret['label'] = self._label
+        if self._has_units:
+            ret['units'] = self._units
+        if self._has_read_only:
+            ret['readOnly'] = self._read_only
+        return repr(ret)
+
+#The attributes of a PyValueInfo
+_VALUEINFO_KEYS = ('id', 'homeId', 'nodeId', 'commandClassId', 'instance', 'index',
+                   'genre', 'type', 'label', 'units', 'help', 'min', 'max',
+                   'readOnly', 'writeOnly', 'isSet', 'polled', 'pollIntensity',
+                   'changeVerified', 'precision', 'data', 'listItems')
+
+cdef class PyValueInfo:
+    """
+    A snapshot of all the attributes of a value, read in one call to the library.
+
+    :see: PyManager.getValueInfo, PyManager.getValuesInfo
+
+    """
+    cdef readonly uint64_t id
+    cdef readonly uint32_t homeId
+    cdef readonly uint8_t nodeId
+    cdef readonly uint8_t commandClassId
+    cdef readonly uint8_t instance
+    cdef readonly uint8_t index
+    cdef readonly object genre
+    cdef readonly object type
+    cdef readonly object label
+    cdef readonly object units
+    cdef readonly object help
+    cdef readonly uint32_t min
+    cdef readonly uint32_t max
+    cdef readonly bint readOnly
+    cdef readonly bint writeOnly
+    cdef readonly bint isSet
+    cdef readonly bint polled
+    cdef readonly uint8_t pollIntensity
+    cdef readonly bint changeVerified
+    #The precision of a Decimal value, None otherwise
+    cdef readonly object precision
+    cdef readonly object data
+    #The items of a List value, None otherwise
+    cdef readonly object listItems
+    #The shared metadata of the value
+    cdef readonly PyValueDescriptor descriptor
+
+    def to_dict(self):
+        """
+        Return a dict representation of the value info.
+
+        :rtype: dict()
+
+        """
+        return dict([(key, getattr(self, key)) for key in _VALUEINFO_KEYS])
+
+    def __repr__(self):
+        return 'PyValueInfo(%r)' % self.to_dict()
+
+cdef PyValueInfo buildValueInfo(Manager *manager, ValueID* vid):
+    """
+    Read all the attributes of a value.
+
+    """
+    cdef string c_string
+    cdef vector[string] vect
+    cdef uint8_t precision
+    cdef PyValueInfo info = PyValueInfo.__new__(PyValueInfo)
+    cdef ValueType vtype = vid.GetType()
+    info.id = vid.GetId()
+    info.homeId = vid.GetHomeId()
+    info.nodeId = vid.GetNodeId()
+    info.commandClassId = vid.GetCommandClassId()
+    info.instance = vid.GetInstance()
+    info.index = vid.GetIndex()
+    info.genre = PyGenres[vid.GetGenre()]
+    info.type = PyValueTypes[vtype]
+    info.descriptor = buildValueDescriptor(manager, vid)
+    info.label = info.descriptor.label
+    info.units = info.descriptor.units
+    c_string = manager.GetValueHelp(deref(vid))
+    info.help = cstr_to_str(c_string.c_str())
+    info.min = manager.GetValueMin(deref(vid))
+    info.max = manager.GetValueMax(deref(vid))
+    info.readOnly = manager.IsValueReadOnly(deref(vid))
+    info.writeOnly = manager.IsValueWriteOnly(deref(vid))
+    info.isSet = manager.IsValueSet(deref(vid))
+    info.polled = manager.isPolled(deref(vid))
+    info.pollIntensity = manager.GetPollIntensity(deref(vid))
+    info.changeVerified = manager.GetChangeVerified(deref(vid))
+    if vtype == ValueType_Decimal and manager.GetValueFloatPrecision(deref(vid), &precision):
+        info.precision = precision
+    if vtype == ValueType_List:
+        info.listItems = set()
+        if manager.GetValueListItems(deref(vid), &vect):
+            for i in range(vect.size()):
+                info.listItems.add(vect[i].c_str())
+    info.data = getValueFromType(manager, info.id)
+    return info
+
+#The attributes of a PyNodeInfo
+_NODEINFO_KEYS = ('homeId', 'nodeId', 'name', 'location', 'manufacturerId', 'manufacturerName',
+                  'productType', 'productId', 'productName', 'type', 'basic', 'generic', 'specific',
+                  'security', 'version', 'maxBaudRate', 'deviceType', 'deviceTypeString', 'role',
+                  'roleString', 'plusType', 'plusTypeString', 'listening', 'frequentListening',
+                  'beaming', 'routing', 'securityDevice', 'zwavePlus', 'infoReceived',
+                  'plusInfoReceived', 'awake', 'failed', 'queryStage')
+
+cdef class PyNodeInfo:
+    """
+    A snapshot of all the scalar attributes of a node, read in one call to the library.
+
+    :see: PyManager.getNodeInfo
+
+    """
+    cdef readonly uint32_t homeId
+    cdef readonly uint8_t nodeId
+    cdef readonly object name
+    cdef readonly object location
+    cdef readonly object manufacturerId
+    cdef readonly object manufacturerName
+    cdef readonly object productType
+    cdef readonly object productId
+    cdef readonly object productName
+    cdef readonly object type
+    cdef readonly uint8_t basic
+    cdef readonly uint8_t generic
+    cdef readonly uint8_t specific
+    cdef readonly uint8_t security
+    cdef readonly uint8_t version
+    cdef readonly uint32_t maxBaudRate
+    cdef readonly uint16_t deviceType
+    cdef readonly object deviceTypeString
+    cdef readonly uint8_t role
+    cdef readonly object roleString
+    cdef readonly uint8_t plusType
+    cdef readonly object plusTypeString
+    cdef readonly bint listening
+    cdef readonly bint frequentListening
+    cdef readonly bint beaming
+    cdef readonly bint routing
+    cdef readonly bint securityDevice
+    cdef readonly bint zwavePlus
+    cdef readonly bint infoReceived
+    cdef readonly bint plusInfoReceived
+    cdef readonly bint awake
+    cdef readonly bint failed
+    cdef readonly object queryStage
+
+    def to_dict(self):
+        """
+        Return a dict representation of the node info.
+
+        :rtype: dict()
+
+        """
+        return dict([(key, getattr(self, key)) for key in _NODEINFO_KEYS])
+
+    def __repr__(self):
+        return 'PyNodeInfo(%r)' % self.to_dict()
+
+cdef PyNodeInfo buildNodeInfo(Manager *manager, uint32_t homeid, uint8_t nodeid):
+    """
+    Read all the scalar attributes of a node.
+
+    """
+    cdef string c_string
+    cdef PyNodeInfo info = PyNodeInfo.__new__(PyNodeInfo)
+    info.homeId = homeid
+    info.nodeId = nodeid
+    c_string = manager.GetNodeName(homeid, nodeid)
+    info.name = cstr_to_str(c_string.c_str())
+    c_string = manager.GetNodeLocation(homeid, nodeid)
+    info.location = cstr_to_str(c_string.c_str())
+    c_string = manager.GetNodeManufacturerId(homeid, nodeid)
+    info.manufacturerId = cstr_to_str(c_string.c_str())
+    c_string = manager.GetNodeManufacturerName(homeid, nodeid)
+    info.manufacturerName = cstr_to_str(c_string.c_str())
+    c_string = manager.GetNodeProductType(homeid, nodeid)
+    info.productType = cstr_to_str(c_string.c_str())
+    c_string = manager.GetNodeProductId(homeid, nodeid)
+    info.productId = cstr_to_str(c_string.c_str())
+    c_string = manager.GetNodeProductName(homeid, nodeid)
+    info.productName = cstr_to_str(c_string.c_str())
+    c_string = manager.GetNodeType(homeid, nodeid)
+    info.type = cstr_to_str(c_string.c_str())
+    info.basic = manager.GetNodeBasic(homeid, nodeid)
+    info.generic = manager.GetNodeGeneric(homeid, nodeid)
+    info.specific = manager.GetNodeSpecific(homeid, nodeid)
+    info.security = manager.GetNodeSecurity(homeid, nodeid)
+    info.version = manager.GetNodeVersion(homeid, nodeid)
+    info.maxBaudRate = manager.GetNodeMaxBaudRate(homeid, nodeid)
+    info.deviceType = manager.GetNodeDeviceType(homeid, nodeid)
+    c_string = manager.GetNodeDeviceTypeString(homeid, nodeid)
+    info.deviceTypeString = cstr_to_str(c_string.c_str())
+    info.role = manager.GetNodeRole(homeid, nodeid)
+    c_string = manager.GetNodeRoleString(homeid, nodeid)
+    info.roleString = cstr_to_str(c_string.c_str())
+    info.plusType = manager.GetNodePlusType(homeid, nodeid)
+    c_string = manager.GetNodePlusTypeString(homeid, nodeid)
+    info.plusTypeString = cstr_to_str(c_string.c_str())
+    info.listening = manager.IsNodeListeningDevice(homeid, nodeid)
+    info.frequentListening = manager.IsNodeFrequentListeningDevice(homeid, nodeid)
+    info.beaming = manager.IsNodeBeamingDevice(homeid, nodeid)
+    info.routing = manager.IsNodeRoutingDevice(homeid, nodeid)
+    info.securityDevice = manager.IsNodeSecurityDevice(homeid, nodeid)
+    info.zwavePlus = manager.IsNodeZWavePlus(homeid, nodeid)
+    info.infoReceived = manager.IsNodeInfoReceived(homeid, nodeid)
+    info.plusInfoReceived = manager.IsNodePlusInfoReceived(homeid, nodeid)
+    info.awake = manager.IsNodeAwake(homeid, nodeid)
+    info.failed = manager.IsNodeFailed(homeid, nodeid)
+    c_string = manager.GetNodeQueryStage(homeid, nodeid)
+    info.queryStage = cstr_to_str(c_string.c_str())
+    return info
+
+cdef addValueId(ValueID v, PyNotification n):
     logger.debug("addValueId : ValueID : %s", v.GetId())
     #check is a valid value
     if v.GetInstance() == 0:
         return
     logger.debug("addValueId : GetCommandClassId : %s, GetType : %s", v.GetCommandClassId(), v.GetType())
-    cdef Manager *manager = GetManager()
     item = new pair[uint64_t, ValueID](v.GetId(), v)
     values_map.insert(deref(item))
     del item
-    genre = PyGenres[v.GetGenre()]
+    cdef PyValueId value = PyValueId.__new__(PyValueId)
+    value.id = v.GetId()
+    value.homeId = v.GetHomeId()
+    value.nodeId = v.GetNodeId()
+    value.commandClassId = v.GetCommandClassId()
+    value.instance = v.GetInstance()
+    value.index = v.GetIndex()
+    value.genreInt = v.GetGenre()
+    value.typeInt = v.GetType()
     #handle basic value in different way
-    if genre =="Basic":
-        n['valueId'] = {'homeId' : v.GetHomeId(),
-                    'nodeId' : v.GetNodeId(),
-                    'commandClass' : PyManager.COMMAND_CLASS_DESC[v.GetCommandClassId()],
-                    'instance' : v.GetInstance(),
-                    'index' : v.GetIndex(),
-                    'id' : v.GetId(),
-                    'genre' : '',
-                    'type' : PyValueTypes[v.GetType()],
-                    'value' : None,
-                    'label' : None,
-                    'units' : None,
-                    'readOnly': False,
-                    }
-    else:
-        n['valueId'] = {'homeId' : v.GetHomeId(),
-                        'nodeId' : v.GetNodeId(),
-                        'commandClass' : PyManager.COMMAND_CLASS_DESC[v.GetCommandClassId()],
-                        'instance' : v.GetInstance(),
-                        'index' : v.GetIndex(),
-                        'id' : v.GetId(),
-                        'genre' : genre,
-                        'type' : PyValueTypes[v.GetType()],
-                        'value' : getValueFromType(manager,v.GetId()),
-                        'label' : manager.GetValueLabel(v).c_str(),
-                        'units' : manager.GetValueUnits(v).c_str(),
-                        'readOnly': manager.IsValueReadOnly(v),
-                        }
+    if value.genreInt == ValueGenre_Basic:
+        value._has_value = True
+        value._has_label = True
+        value._has_units = True
+        value._has_read_only = True
+    n.valueId = value
     logger.debug("addValueId : Notification : %s", n)
 
-cdef void notif_callback(const_notification _notification, void* _context) with gil:
+#The keys available in a notification, depending of its type.
+#Used to emulate the dict which was sent to the watchers before PyNotification.
+_NOTIFICATION_BASE_KEYS = ('notificationType', 'homeId', 'nodeId')
+_NOTIFICATION_KEYS = {
+    Type_Group : ('groupIdx',),
+    Type_NodeEvent : ('event',),
+    Type_Notification : ('notificationCode',),
+    Type_ControllerCommand : ('controllerStateInt', 'controllerState', 'controllerStateDoc',
+                              'controllerErrorInt', 'controllerError', 'controllerErrorDoc'),
+    Type_CreateButton : ('buttonId',),
+    Type_DeleteButton : ('buttonId',),
+    Type_ButtonOn : ('buttonId',),
+    Type_ButtonOff : ('buttonId',),
+    Type_SceneEvent : ('sceneId',),
+}
+
+cdef class PyNotification:
     """
-    Notification callback to the C++ library
+    A notification sent by the OpenZWave library to the watchers.
+
+    Fields are typed and stored in the object itself : only one small
+    object is allocated for each notification.
+    For backward compatibility, it can also be read like the dict
+    sent by previous versions : notification['nodeId'], 'valueId' in notification, ...
 
     """
-    logger.debug("notif_callback : new notification")
-    cdef Notification* notification = <Notification*>_notification
-    logger.debug("notif_callback : Notification type : %s, nodeId : %s", notification.GetType(), notification.GetNodeId())
-    try:
-        n = {'notificationType' : PyNotifications[notification.GetType()],
-             'homeId' : notification.GetHomeId(),
-             'nodeId' : notification.GetNodeId(),
-            }
-    except:
-        logger.exception("notif_callback exception")
-    if notification.GetType() == Type_Group:
-        try:
-            n['groupIdx'] = notification.GetGroupIdx()
-        except:
-            logger.exception("notif_callback exception Type_Group")
-    elif notification.GetType() == Type_NodeEvent:
-        try:
-            n['event'] = notification.GetEvent()
-        except:
-            logger.exception("notif_callback exception Type_NodeEvent")
-            raise
-    elif notification.GetType() == Type_Notification:
-        try:
-            n['notificationCode'] = notification.GetNotification()
-        except:
-            logger.exception("notif_callback exception Type_Notification")
-            raise
-    elif notification.GetType() == Type_ControllerCommand:
-        try:
-            state = notification.GetEvent()
-            n['controllerStateInt'] = state
-            n['controllerState'] = PyControllerState[state]
-            n['controllerStateDoc'] = PyControllerState[state].doc
-            #Notification is filled with error
-            error = notification.GetNotification()
-            n['controllerErrorInt'] = error
-            n['controllerError'] = PyControllerError[error]
-            n['controllerErrorDoc'] = PyControllerError[error].doc
-        except:
-            logger.exception("notif_callback exception Type_ControllerCommand")
-            raise
-    elif notification.GetType() in (Type_CreateButton, Type_DeleteButton, Type_ButtonOn, Type_ButtonOff):
-        try:
-            n['buttonId'] = notification.GetButtonId()
-        except:
-            logger.exception("notif_callback exception Type_CreateButton, Type_DeleteButton, Type_ButtonOn, Type_ButtonOff")
-            raise
-    elif notification.GetType() == Type_DriverRemoved:
-        try:
-            logger.debug("Notification : Type_DriverRemoved received : clean all valueids")
-            values_map.empty()
-        except:
-            logger.exception("notif_callback exception Type_DriverRemoved")
-            raise
-    elif notification.GetType() == Type_DriverReset:
-        try:
-            logger.debug("Notification : Type_DriverReset received : clean all valueids")
-            values_map.empty()
-        except:
-            logger.exception("notif_callback exception Type_DriverReset")
-            raise
-    elif notification.GetType() == Type_SceneEvent:
-        try:
-            n['sceneId'] = notification.GetSceneId()
-        except:
-            logger.exception("notif_callback exception Type_SceneEvent")
-            raise
-    elif notification.GetType() in (Type_ValueAdded, Type_ValueChanged, Type_ValueRefreshed):
-        try:
-            addValueId(notification.GetValueID(), n)
-        except:
-            logger.exception("notif_callback exception Type_ValueAdded, Type_ValueChanged, Type_ValueRefreshed")
-            raise
-    elif notification.GetType() == Type_ValueRemoved:
+    cdef readonly int type
+    cdef readonly uint32_t homeId
+    cdef readonly uint8_t nodeId
+    cdef readonly object valueId
+    cdef readonly uint8_t groupIdx
+    cdef readonly uint8_t event
+    cdef readonly uint8_t buttonId
+    cdef readonly uint8_t sceneId
+    cdef readonly uint8_t notificationCode
+
+    @property
+    def notificationType(self):
+        """
+        The type of the notification as string (one of PyNotifications).
+
+        :rtype: str
+
+        """
+        return PyNotifications[self.type]
+
+    @property
+    def controllerStateInt(self):
+        """
+        The state of the controller command (ControllerCommand notification only).
+
+        :rtype: int
+
+        """
+        return self.event
+
+    @property
+    def controllerState(self):
+        """
+        The state of the controller command as string (one of PyControllerState).
+
+        :rtype: str
+
+        """
+        return PyControllerState[self.event]
+
+    @property
+    def controllerStateDoc(self):
+        """
+        The documentation of the state of the controller command.
+
+        :rtype: str
+
+        """
+        return PyControllerState[self.event].doc
+
+    @property
+    def controllerErrorInt(self):
+        """
+        The error of the controller command (ControllerCommand notification only).
+
+        :rtype: int
+
+        """
+        return self.notificationCode
+
+    @property
+    def controllerError(self):
+        """
+        The error of the controller command as string (one of PyControllerError).
+
+        :rtype: str
+
+        """
+        return PyControllerError[self.notificationCode]
+
+    @property
+    def controllerErrorDoc(self):
+        """
+        The documentation of the error of the controller command.
+
+        :rtype: str
+
+        """
+        return PyControllerError[self.notificationCode].doc
+
+    def keys(self):
+        """
+        The keys available for this type of notification.
+
+        :rtype: tuple
+
+        """
+        keys = _NOTIFICATION_BASE_KEYS + _NOTIFICATION_KEYS.get(self.type, ())
+        if self.valueId is not None:
+            keys = keys + ('valueId',)
+        return keys
+
+    def get(self, key, default=None):
+        """
+        Return the field key if available for this type of notification, else default.
+
+        :param key: The name of the field
+        :type key: str
+        :param default: The value to return if the field is not available
+        :type default: variable
+
+        """
+        if key in self.keys():
+            return getattr(self, key)
+        return default
+
+    def items(self):
+        """
+        The (key, value) pairs of this notification.
+
+        :rtype: list
+
+        """
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def to_dict(self):
+        """
+        Return a dict representation of the notification, as sent by previous versions.
+
+        :rtype: dict()
+
+        """
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        if key in _NOTIFICATION_BASE_KEYS or key in self.keys():
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in _NOTIFICATION_BASE_KEYS or key in self.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+cdef void fillNotificationData(Notification* notification, NotificationData_t* data) noexcept nogil:
+    """
+    Copy the data of a notification, which is only valid during the callback.
+    Don't need the GIL.
+
+    """
+    cdef NotificationType ntype = notification.GetType()
+    data.type = ntype
+    data.homeId = notification.GetHomeId()
+    data.nodeId = notification.GetNodeId()
+    data.valueId = 0
+    data.groupIdx = 0
+    data.event = 0
+    data.buttonId = 0
+    data.sceneId = 0
+    data.notification = 0
+    if ntype == Type_Group:
+        data.groupIdx = notification.GetGroupIdx()
+    elif ntype == Type_NodeEvent:
+        data.event = notification.GetEvent()
+    elif ntype == Type_Notification:
+        data.notification = notification.GetNotification()
+    elif ntype == Type_ControllerCommand:
+        #Event is filled with state
+        data.event = notification.GetEvent()
+        #Notification is filled with error
+        data.notification = notification.GetNotification()
+    elif ntype == Type_CreateButton or ntype == Type_DeleteButton \
+            or ntype == Type_ButtonOn or ntype == Type_ButtonOff:
+        data.buttonId = notification.GetButtonId()
+    elif ntype == Type_SceneEvent:
+        data.sceneId = notification.GetSceneId()
+    elif ntype == Type_ValueAdded or ntype == Type_ValueChanged \
+            or ntype == Type_ValueRefreshed or ntype == Type_ValueRemoved:
+        data.valueId = notification.GetValueID().GetId()
+
+cdef PyNotification buildNotification(NotificationData_t* data):
+    """
+    Build the notification sent to python from the copied data.
+
+    """
+    cdef NotificationType ntype = <NotificationType>data.type
+    cdef ValueID* vid
+    cdef PyNotification n = PyNotification.__new__(PyNotification)
+    n.type = ntype
+    n.homeId = data.homeId
+    n.nodeId = data.nodeId
+    n.groupIdx = data.groupIdx
+    n.event = data.event
+    n.buttonId = data.buttonId
+    n.sceneId = data.sceneId
+    n.notificationCode = data.notification
+    if ntype == Type_DriverRemoved:
+        logger.debug("Notification : Type_DriverRemoved received : clean all valueids")
+        values_map.empty()
+    elif ntype == Type_DriverReset:
+        logger.debug("Notification : Type_DriverReset received : clean all valueids")
+        values_map.empty()
+    elif ntype in (Type_ValueAdded, Type_ValueChanged, Type_ValueRefreshed):
+        vid = new ValueID(data.homeId, data.valueId)
         try:
-            n['valueId'] = {'id' : notification.GetValueID().GetId()}
-        except:
-            logger.exception("notif_callback exception Type_ValueRemoved")
-            raise
-    #elif notification.GetType() in (Type_PollingEnabled, Type_PollingDisabled):
+            addValueId(deref(vid), n)
+        finally:
+            del vid
+    elif ntype == Type_ValueRemoved:
+        n.valueId = {'id' : data.valueId}
+    #elif ntype in (Type_PollingEnabled, Type_PollingDisabled):
     #    #Maybe we should enable/disable this
     #    addValueId(notification.GetValueID(), n)
+    return n
+
+cdef struct WatcherContext_t:
+    #The python watcher in direct mode
+    void* callback
+    #The queue of notifications in batch mode
+    NotificationQueue* queue
+    #A bit by NotificationType to send to the watcher
+    uint64_t typesMask
+
+cdef inline bint notificationAllowed(WatcherContext_t* context, uint8_t ntype) nogil:
+    """
+    Check the notification type against the mask of the watcher.
+    Don't need the GIL.
+
+    """
+    return ntype < 64 and (context.typesMask >> ntype) & 1
+
+cdef void deliverNotification(NotificationData_t* data, object callback):
+    """
+    Build the python notification and send it to the watcher.
+
+    """
+    cdef PyNotification n
+    logger.debug("notif_callback : Notification type : %s, nodeId : %s", data.type, data.nodeId)
+    try:
+        n = buildNotification(data)
+    except:
+        logger.exception("notif_callback exception")
+        raise
     logger.debug("notif_callback : call callback context")
-    (<object>_context)(n)
-    if notification.GetType() == Type_ValueRemoved:
+    if data.type == Type_ValueChanged or data.type == Type_ValueRefreshed:
+        #The label and units may have changed too
+        _value_descriptors_by_id.pop(data.valueId, None)
+    callback(n)
+    if data.type == Type_ValueRemoved:
         try:
-            delValueId(notification.GetValueID(), n)
+            delValueId(data.valueId)
         except:
             logger.exception("notif_callback exception Type_ValueRemoved delete")
             raise
     logger.debug("notif_callback : end")
 
+cdef void notif_callback(const_notification _notification, void* _context) noexcept nogil:
+    """
+    Notification callback to the C++ library.
+    The GIL is only acquired for the notifications allowed by the watcher.
+
+    """
+    cdef WatcherContext_t* context = <WatcherContext_t*>_context
+    cdef Notification* notification = <Notification*>_notification
+    cdef NotificationData_t data
+    if not notificationAllowed(context, notification.GetType()):
+        return
+    fillNotificationData(notification, &data)
+    with gil:
+        deliverNotification(&data, <object>context.callback)
+
+cdef void notif_callback_batch(const_notification _notification, void* _context) noexcept nogil:
+    """
+    Notification callback to the C++ library in batch mode.
+    Copy the notification in the queue of the watcher without acquiring the GIL.
+    The notifications are sent to python by the drain thread of the manager.
+
+    """
+    cdef WatcherContext_t* context = <WatcherContext_t*>_context
+    cdef Notification* notification = <Notification*>_notification
+    cdef NotificationData_t data
+    if not notificationAllowed(context, notification.GetType()):
+        return
+    fillNotificationData(notification, &data)
+    context.queue.Push(data)
+
 cdef void ctrl_callback(ControllerState _state, ControllerError _error, void* _context) with gil:
     """
     Controller callback to the C++ library
@@ -1145,6 +1888,9 @@ sleeping) have been polled, an "AllNodesQueried" notification is sent.
 
     cdef Manager *manager
     cdef object _watcherCallback
+    cdef WatcherContext_t _watcherContext
+    cdef int32_t _watcherMaxDelay
+    cdef object _watcherThread
     cdef object _controllerCallback
 
     def create(self):
@@ -1177,6 +1923,7 @@ Deletes the Manager and cleans up any associated objects.
 :see: create_
         '''
         self.manager.Destroy()
+        clearValueDescriptors()
 
 #
 # -----------------------------------------------------------------------------
@@ -2661,6 +3408,33 @@ Helper method to return whether a particular class is available in a node
         else :
             return False
 
+    def getNodeCommandClasses(self, homeid, nodeid):
+        '''
+.. _getNodeCommandClasses:
+
+Get the command classes supported by a node and their versions in one call.
+
+:param homeId: The Home ID of the Z-Wave controller that manages the node.
+:type homeId: int
+:param nodeId: The ID of the node to query.
+:type nodeId: int
+:return: The versions of the command classes supported by the node, indexed by command class id.
+:rtype: dict
+:see: getNodeClassInformation_
+
+        '''
+        cdef string oclassName
+        cdef uint8_t oclassVersion
+        cdef uint32_t chomeid = homeid
+        cdef uint8_t cnodeid = nodeid
+        cdef int commandClassId
+        ret = {}
+        #Only the command classes known by the library can be supported
+        for commandClassId in self.COMMAND_CLASS_DESC:
+            if self.manager.GetNodeClassInformation(chomeid, cnodeid, commandClassId, &oclassName, &oclassVersion):
+                ret[commandClassId] = oclassVersion
+        return ret
+
 
     def isNodeAwake(self, homeId, nodeId):
         '''
@@ -2807,6 +3581,24 @@ Get whether the node is a ZWave+ one
             return 16
         return None
 
+    def getNodeInfo(self, homeid, nodeid):
+        '''
+.. _getNodeInfo:
+
+Get all the scalar attributes of a node in one call : names, product, types,
+capabilities, version, baud rate, Z-Wave+ informations and query stage.
+
+:param homeId: The Home ID of the Z-Wave controller that manages the node.
+:type homeId: int
+:param nodeId: The ID of the node to query.
+:type nodeId: int
+:return: The attributes of the node.
+:rtype: PyNodeInfo
+:see: getNodeName_, getNodeType_, isNodeListeningDevice_, getNodeQueryStage_
+
+        '''
+        return buildNodeInfo(self.manager, homeid, nodeid)
+
 #
 # -----------------------------------------------------------------------------
 # Values
@@ -2844,58 +3636,54 @@ if the Z-Wave message actually failed to get through.  Notification callbacks wi
         cdef int16_t type_short
         cdef string type_string
         cdef uint8_t* type_raw
-        ret = 2
-        if values_map.find(id) != values_map.end():
-            datatype = PyValueTypes[values_map.at(id).GetType()]
-            if datatype == "Bool":
-                type_bool = value
-                cret = self.manager.SetValue(values_map.at(id), type_bool)
-                ret = 1 if cret else 0
-            elif datatype == "Byte":
-                type_byte = value
-                cret = self.manager.SetValue(values_map.at(id), type_byte)
-                ret = 1 if cret else 0
-            elif datatype == "Raw":
-                type_raw = <uint8_t*> malloc(len(value)*sizeof(uint8_t))
-                for x in range(0, len(value)):
-                    #print value[x]
-                    type_raw[x] = ord(value[x])
-                cret = self.manager.SetValue(values_map.at(id), type_raw, len(value))
-                ret = 1 if cret else 0
-                free(type_raw)
-            elif datatype == "Decimal":
-                type_float = value
-                cret = self.manager.SetValue(values_map.at(id), type_float)
-                ret = 1 if cret else 0
-            elif datatype == "Int":
-                type_int = value
-                cret = self.manager.SetValue(values_map.at(id), type_int)
-                ret = 1 if cret else 0
-            elif datatype == "Short":
-                type_short = value
-                cret = self.manager.SetValue(values_map.at(id), type_short)
-                ret = 1 if cret else 0
-            elif datatype == "String":
-                if six.PY3:
-                    type_string = str_to_cppstr(value)
-                else:
-                    type_string = str_to_cppstr(string(value))
-                cret = self.manager.SetValue(values_map.at(id), type_string)
-                ret = 1 if cret else 0
-            elif datatype == "Button":
-                type_bool = value
-                cret = self.manager.SetValue(values_map.at(id), type_bool)
-                ret = 1 if cret else 0
-            elif datatype == "List":
-                logger.debug("SetValueListSelection %s", value)
-                if six.PY3:
-                    type_string = str_to_cppstr(value)
-                else:
-                    type_string = str_to_cppstr(string(value))
-                cret = self.manager.SetValueListSelection(values_map.at(id), type_string)
-                logger.debug("SetValueListSelection %s", cret)
-                ret = 1 if cret else 0
-        return ret
+        cdef bool cret
+        cdef map[uint64_t, ValueID].iterator it = values_map.find(id)
+        cdef ValueID* vid
+        cdef ValueType datatype
+        if it == values_map.end():
+            return 2
+        vid = &deref(it).second
+        datatype = vid.GetType()
+        #Cython compiles this chain of comparisons on the C enum into a switch
+        if datatype == ValueType_Bool or datatype == ValueType_Button:
+            type_bool = value
+            cret = self.manager.SetValue(deref(vid), type_bool)
+        elif datatype == ValueType_Byte:
+            type_byte = value
+            cret = self.manager.SetValue(deref(vid), type_byte)
+        elif datatype == ValueType_Raw:
+            type_raw = <uint8_t*> malloc(len(value)*sizeof(uint8_t))
+            for x in range(0, len(value)):
+                type_raw[x] = ord(value[x])
+            cret = self.manager.SetValue(deref(vid), type_raw, len(value))
+            free(type_raw)
+        elif datatype == ValueType_Decimal:
+            type_float = value
+            cret = self.manager.SetValue(deref(vid), type_float)
+        elif datatype == ValueType_Int:
+            type_int = value
+            cret = self.manager.SetValue(deref(vid), type_int)
+        elif datatype == ValueType_Short:
+            type_short = value
+            cret = self.manager.SetValue(deref(vid), type_short)
+        elif datatype == ValueType_String:
+            if six.PY3:
+                type_string = str_to_cppstr(value)
+            else:
+                type_string = str_to_cppstr(string(value))
+            cret = self.manager.SetValue(deref(vid), type_string)
+        elif datatype == ValueType_List:
+            logger.debug("SetValueListSelection %s", value)
+            if six.PY3:
+                type_string = str_to_cppstr(value)
+            else:
+                type_string = str_to_cppstr(string(value))
+            cret = self.manager.SetValueListSelection(deref(vid), type_string)
+            logger.debug("SetValueListSelection %s", cret)
+        else:
+            #ValueType_Schedule can't be set
+            return 2
+        return 1 if cret else 0
 
     def refreshValue(self, id):
         '''
@@ -2928,7 +3716,7 @@ Gets the user-friendly label for the value
         cdef string c_string
         if values_map.find(id) != values_map.end():
             c_string = self.manager.GetValueLabel(values_map.at(id))
-            return cstr_to_str(c_string.c_str())
+            return internString(cstr_to_str(c_string.c_str()))
         else :
             return None
 
@@ -2947,6 +3735,7 @@ Sets the user-friendly label for the value
         '''
         if values_map.find(id) != values_map.end():
             self.manager.SetValueLabel(values_map.at(id), str_to_cppstr(label))
+            _value_descriptors_by_id.pop(id, None)
 
     def getValueUnits(self, id):
         '''
@@ -2964,7 +3753,7 @@ Gets the units that the value is measured in.
         cdef string c_string
         if values_map.find(id) != values_map.end():
             c_string = self.manager.GetValueUnits(values_map.at(id))
-            return cstr_to_str(c_string.c_str())
+            return internString(cstr_to_str(c_string.c_str()))
         else :
             return None
 
@@ -2983,6 +3772,7 @@ Sets the units that the value is measured in.
         '''
         if values_map.find(id) != values_map.end():
             self.manager.SetValueUnits(values_map.at(id), str_to_cppstr(unit))
+            _value_descriptors_by_id.pop(id, None)
 
     def getValueHelp(self, id):
         '''
@@ -3580,6 +4370,68 @@ If so, the library will immediately refresh the value a second time whenever a c
         if values_map.find(id) != values_map.end():
             self.manager.SetChangeVerified(values_map.at(id), verify)
 
+    def getValueDescriptor(self, id):
+        '''
+.. _getValueDescriptor:
+
+Gets the metadata of a value : command class, genre, type, label and units.
+The values with the same metadata share the same descriptor.
+
+:param id: The ID of a value.
+:type id: int
+:return: The shared descriptor of the value. None if the value is not found.
+:rtype: PyValueDescriptor
+:see: getValueInfo_, getValueLabel_, getValueUnits_
+
+        '''
+        cdef map[uint64_t, ValueID].iterator it = values_map.find(id)
+        if it == values_map.end():
+            return None
+        return buildValueDescriptor(self.manager, &deref(it).second)
+
+    def getValueInfo(self, id):
+        '''
+.. _getValueInfo:
+
+Gets all the attributes of a value in one call : label, units, help, genre, type,
+command class, instance, index, min, max, read-only, write-only, set, polling,
+precision, data and list items.
+
+:param id: The ID of a value.
+:type id: int
+:return: The attributes of the value. None if the value is not found.
+:rtype: PyValueInfo
+:see: getValuesInfo_
+
+        '''
+        cdef map[uint64_t, ValueID].iterator it = values_map.find(id)
+        if it == values_map.end():
+            return None
+        return buildValueInfo(self.manager, &deref(it).second)
+
+    def getValuesInfo(self, ids):
+        '''
+.. _getValuesInfo:
+
+Gets all the attributes of many values in one call.
+
+:param ids: The IDs of the values.
+:type ids: list of int
+:return: The attributes of the values found, indexed by ID.
+:rtype: dict of PyValueInfo
+:see: getValueInfo_
+
+        '''
+        cdef map[uint64_t, ValueID].iterator it
+        cdef uint64_t vid
+        ret = {}
+        for id in ids:
+            vid = id
+            it = values_map.find(vid)
+            if it != values_map.end():
+                ret[id] = buildValueInfo(self.manager, &deref(it).second)
+        return ret
+
 #
 # -----------------------------------------------------------------------------
 # Climate Control Schedules
@@ -4047,7 +4899,7 @@ in both cases.
 # -----------------------------------------------------------------------------
 # For notification of changes to the Z-Wave network or device values and associations.
 #
-    def addWatcher(self, pythonfunc):
+    def addWatcher(self, pythonfunc, batch=False, max_batch=100, max_delay_ms=50, notification_types=None):
         '''
 .. _addWatcher:
 
@@ -4058,30 +4910,158 @@ via callbacks.  This method allows the application to add a notification
 callback handler, known as a "watcher" to OpenZWave.  An application needs only
 add a single watcher - all notifications will be reported to it.
 
+In batch mode, the notifications are copied in a native queue without
+acquiring the GIL. A drain thread sends them to the watcher as lists of
+at most max_batch notifications, waiting at most max_delay_ms milliseconds
+to fill a list.
+
+The notifications whose type is not in notification_types are dropped
+before acquiring the GIL.
+
+A watcher already added is removed first : its pending notifications are
+sent before the new one is added.
+
 :param pythonfunc: Watcher pointer to a function that will be called by the notification system.
 :type pythonfunc: callback
-:see: removeWatcher_
-
-        '''
+:param batch: Send lists of notifications to the watcher.
+:type batch: bool
+:param max_batch: The maximum number of notifications in a list.
+:type max_batch: int
+:param max_delay_ms: The maximum delay in milliseconds before sending a list.
+:type max_delay_ms: int
+:param notification_types: The types of notification to send to the watcher (ie 'ValueChanged'). None for all.
+:type notification_types: list of str or int
+:see: removeWatcher_, notificationTypesMask_
+
+        '''
+        cdef uint64_t mask = self.notificationTypesMask(notification_types)
+        if batch:
+            if max_batch < 1:
+                raise ValueError("max_batch must be greater than 0")
+            if max_delay_ms < 0:
+                raise ValueError("max_delay_ms must be positive")
+        if self._watcherCallback is not None:
+            #Only one context : tear down the queue and the drain thread of the previous watcher
+            self.removeWatcher(self._watcherCallback)
         self._watcherCallback = pythonfunc # need to keep a reference to this
-        if not self.manager.AddWatcher(notif_callback, <void*>pythonfunc):
+        self._watcherContext.callback = <void*>pythonfunc
+        self._watcherContext.typesMask = mask
+        self._watcherContext.queue = NULL
+        if not batch:
+            if not self.manager.AddWatcher(notif_callback, <void*>&self._watcherContext):
+                self._watcherCallback = None
+                raise ValueError("call to AddWatcher failed")
+            return
+        self._watcherMaxDelay = max_delay_ms
+        self._watcherContext.queue = new NotificationQueue(max_batch)
+        if not self.manager.AddWatcher(notif_callback_batch, <void*>&self._watcherContext):
+            del self._watcherContext.queue
+            self._watcherContext.queue = NULL
+            self._watcherCallback = None
             raise ValueError("call to AddWatcher failed")
+        self._watcherThread = threading.Thread(target=self._drainWatcherQueue, name='openzwave-notifications')
+        self._watcherThread.daemon = True
+        self._watcherThread.start()
+
+    def notificationTypesMask(self, notification_types=None):
+        '''
+.. _notificationTypesMask:
+
+Build the mask of notification types used by addWatcher.
+
+:param notification_types: The types of notification (ie 'ValueChanged' or 2). None for all.
+:type notification_types: list of str or int
+:return: The mask, a bit by notification type
+:rtype: int
+:see: addWatcher_
+
+        '''
+        cdef uint64_t mask = 0
+        if notification_types is None:
+            return 0xFFFFFFFFFFFFFFFF
+        for ntype in notification_types:
+            if not isinstance(ntype, six.integer_types):
+                try:
+                    ntype = PyNotifications.index(ntype)
+                except ValueError:
+                    raise ValueError("Unknown notification type %s" % ntype)
+            if ntype < 0 or ntype >= 64:
+                raise ValueError("Unknown notification type %s" % ntype)
+            mask |= (<uint64_t>1) << <int>ntype
+        return mask
+
+    def _drainWatcherQueue(self):
+        '''
+Send the notifications of the queue to the watcher by batches.
+Run in the drain thread until the queue is stopped and empty.
+
+        '''
+        cdef NotificationQueue* queue = self._watcherContext.queue
+        cdef int32_t max_delay = self._watcherMaxDelay
+        cdef vector[NotificationData_t] datas
+        cdef size_t count
+        cdef size_t i
+        callback = self._watcherCallback
+        logger.debug("_drainWatcherQueue : start")
+        while True:
+            with nogil:
+                count = queue.PopBatch(datas, max_delay)
+            if count == 0:
+                if queue.IsStopped():
+                    break
+                continue
+            notifications = []
+            for i in range(count):
+                if datas[i].type == Type_ValueChanged or datas[i].type == Type_ValueRefreshed:
+                    #The label and units may have changed too
+                    _value_descriptors_by_id.pop(datas[i].valueId, None)
+                try:
+                    notifications.append(buildNotification(&datas[i]))
+                except:
+                    logger.exception("_drainWatcherQueue exception")
+            try:
+                callback(notifications)
+            except:
+                logger.exception("_drainWatcherQueue exception in watcher")
+            for i in range(count):
+                if datas[i].type == Type_ValueRemoved:
+                    delValueId(datas[i].valueId)
+        if self._watcherContext.queue != queue:
+            #removeWatcher was called from the watcher : the queue is freed here
+            del queue
+        logger.debug("_drainWatcherQueue : end")
 
     def removeWatcher(self, pythonfunc):
         '''
 .. _removeWatcher:
 
 Remove a notification watcher.
+In batch mode, the pending notifications are sent before the drain thread exits.
 
 :param pythonfunc: Watcher pointer to a function
 :type pythonfunc: callback
 :see: addWatcher_
 
         '''
-        if not self.manager.RemoveWatcher(notif_callback, <void*>self._watcherCallback):
+        if self._watcherContext.queue == NULL:
+            if not self.manager.RemoveWatcher(notif_callback, <void*>&self._watcherContext):
+                raise ValueError("call to RemoveWatcher failed")
+            else:
+                self._watcherCallback = None
+            return
+        if not self.manager.RemoveWatcher(notif_callback_batch, <void*>&self._watcherContext):
             raise ValueError("call to RemoveWatcher failed")
+        self._watcherContext.queue.Stop()
+        if self._watcherThread is threading.current_thread():
+            #Called from the watcher : the drain thread still use the queue.
+            #It frees it when it exits, once it is empty.
+            logger.debug("removeWatcher called from the watcher in batch mode : the drain thread frees the queue")
         else:
-            self._watcherCallback = None
+            self._watcherThread.join()
+            del self._watcherContext.queue
+        self._watcherContext.queue = NULL
+        self._watcherThread = None
+        self._watcherCallback = None
 
 
 #
@@ -73,7 +73,7 @@ cdef extern from "Notification.h" namespace "OpenZWave::Notification":
         Code_Dead = 5                           # Report when a node is presumed dead.
         Code_Alive = 6                          # Report when a node is revived.
 
-cdef extern from "Notification.h" namespace "OpenZWave":
+cdef extern from "Notification.h" namespace "OpenZWave" nogil:
 
     cdef cppclass Notification:
         NotificationType GetType()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+from libc.stdint cimport uint32_t, int32_t, uint64_t, uint8_t
+from libcpp cimport bool
+from libcpp.vector cimport vector
+
+cdef extern from "pynotificationqueue.h" nogil:
+
+    cdef struct NotificationData_t:
+        uint8_t type
+        uint32_t homeId
+        uint8_t nodeId
+        uint64_t valueId
+        uint8_t groupIdx
+        uint8_t event
+        uint8_t buttonId
+        uint8_t sceneId
+        uint8_t notification
+
+    cdef cppclass NotificationQueue:
+        NotificationQueue(uint32_t maxBatch)
+        void Push(NotificationData_t& data)
+        size_t PopBatch(vector[NotificationData_t]& out, int32_t maxDelay)
+        void Stop()
+        bool IsStopped()
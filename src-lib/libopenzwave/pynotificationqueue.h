@@ -0,0 +1,158 @@
+/*
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+A queue of notifications filled by the OpenZWave thread without the GIL
+and drained by batches by a python thread.
+It uses the platform classes of OpenZWave, so no need of C++11.
+*/
+#ifndef PY_NOTIFICATION_QUEUE_H
+#define PY_NOTIFICATION_QUEUE_H
+
+#include <deque>
+#include <vector>
+#include "Defs.h"
+#include "Mutex.h"
+#include "Event.h"
+#include "Wait.h"
+#include "TimeStamp.h"
+
+/* The data of a notification copied from OpenZWave::Notification,
+   which is only valid during the callback. */
+struct NotificationData_t
+{
+    uint8 type;
+    uint32 homeId;
+    uint8 nodeId;
+    uint64 valueId;
+    uint8 groupIdx;
+    uint8 event;
+    uint8 buttonId;
+    uint8 sceneId;
+    uint8 notification;
+};
+
+class NotificationQueue
+{
+public:
+    NotificationQueue(uint32 _maxBatch):
+        m_maxBatch(_maxBatch > 0 ? _maxBatch : 1),
+        m_stopped(false)
+    {
+        m_mutex = new OpenZWave::Mutex();
+        m_event = new OpenZWave::Event();
+    }
+
+    ~NotificationQueue()
+    {
+        m_event->Release();
+        m_mutex->Release();
+    }
+
+    /* Add a notification to the queue.
+       The drain thread is only woken up for the first notification
+       of a batch and when the batch is full. */
+    void Push(NotificationData_t const& _data)
+    {
+        m_mutex->Lock();
+        m_queue.push_back(_data);
+        size_t size = m_queue.size();
+        m_mutex->Unlock();
+        if (size == 1 || size >= m_maxBatch)
+        {
+            m_event->Set();
+        }
+    }
+
+    /* Wait for notifications and move at most maxBatch of them in _out.
+       Return when the batch is full, when _maxDelay milliseconds are elapsed
+       since the first notification was seen or when the queue is stopped.
+       Return 0 only when the queue is stopped and empty. */
+    size_t PopBatch(std::vector<NotificationData_t>& _out, int32 _maxDelay)
+    {
+        _out.clear();
+        for (;;)
+        {
+            m_mutex->Lock();
+            bool empty = m_queue.empty();
+            bool stopped = m_stopped;
+            if (empty && !stopped)
+            {
+                m_event->Reset();
+            }
+            m_mutex->Unlock();
+            if (!empty || stopped)
+            {
+                break;
+            }
+            OpenZWave::Wait::Single(m_event, -1);
+        }
+        OpenZWave::TimeStamp deadline;
+        deadline.SetTime(_maxDelay);
+        for (;;)
+        {
+            m_mutex->Lock();
+            bool full = m_queue.size() >= m_maxBatch;
+            bool stopped = m_stopped;
+            if (!full && !stopped)
+            {
+                m_event->Reset();
+            }
+            m_mutex->Unlock();
+            int32 remaining = deadline.TimeRemaining();
+            if (full || stopped || remaining <= 0)
+            {
+                break;
+            }
+            OpenZWave::Wait::Single(m_event, remaining);
+        }
+        m_mutex->Lock();
+        while (!m_queue.empty() && _out.size() < m_maxBatch)
+        {
+            _out.push_back(m_queue.front());
+            m_queue.pop_front();
+        }
+        m_mutex->Unlock();
+        return _out.size();
+    }
+
+    /* Stop the queue : wake up the drain thread, which will empty the queue
+       and exit. */
+    void Stop()
+    {
+        m_mutex->Lock();
+        m_stopped = true;
+        m_mutex->Unlock();
+        m_event->Set();
+    }
+
+    bool IsStopped()
+    {
+        m_mutex->Lock();
+        bool stopped = m_stopped;
+        m_mutex->Unlock();
+        return stopped;
+    }
+
+private:
+    std::deque<NotificationData_t> m_queue;
+    size_t m_maxBatch;
+    bool m_stopped;
+    OpenZWave::Mutex* m_mutex;
+    OpenZWave::Event* m_event;
+};
+
+#endif
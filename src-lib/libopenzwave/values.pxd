@@ -41,8 +41,9 @@ cdef extern from "ValueID.h" namespace "OpenZWave::ValueID":
         ValueType_Raw = 9                   # Used as a list of Bytes
         ValueType_Max = ValueType_Raw       # The highest-number type defined.  Not to be used as a type itself.
 
-cdef extern from "ValueID.h" namespace "OpenZWave":
+cdef extern from "ValueID.h" namespace "OpenZWave" nogil:
     cdef cppclass ValueID:
+        ValueID(uint32_t homeId, uint64_t id)
         uint32_t GetHomeId()
         uint8_t GetNodeId()
         ValueGenre GetGenre()
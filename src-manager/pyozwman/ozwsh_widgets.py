@@ -700,12 +700,13 @@ class NodesTree(OldestTree):
         self.lines.append(self.node_header.get_header())
         self.size += 1
         for node in self.window.network.nodes:
-            self.lines.append(NodesItem(self.window.network.nodes[node].node_id, \
-                self.window.network.nodes[node].name, \
-                self.window.network.nodes[node].location, \
-                self.window.network.nodes[node].max_baud_rate, \
+            info = self.window.network.manager.getNodeInfo(self.window.network.home_id, node)
+            self.lines.append(NodesItem(info.nodeId, \
+                info.name, \
+                info.location, \
+                info.maxBaudRate, \
                 self.window.network.nodes[node].get_battery_level(), \
-                self.window.network.nodes[node].is_awake, \
+                info.awake, \
                 ))
             self.size += 1
         self._modified()
@@ -1273,18 +1274,23 @@ class ValuesTree(OldestTree):
         self.lines.append(self.value_header.get_header())
         self.size += 1
         values = self.window.network.nodes[self.node_id].get_values_by_command_classes(genre=self.key)
+        infos = self.window.network.manager.getValuesInfo( \
+            [val for cmd in values for val in values[cmd]])
         for cmd in values :
             self.lines.append(urwid.Text(    "      %s" % (self.window.network.nodes[self.node_id].get_command_class_as_string(cmd)), align='left'))
             self.size += 1
             for val in values[cmd]:
-                self.lines.append(ValuesItem(values[cmd][val].value_id, \
-                    values[cmd][val].label, \
-                    values[cmd][val].help, \
-                    values[cmd][val].data, \
-                    values[cmd][val].type, \
-                    values[cmd][val].data_items, \
-                    values[cmd][val].is_read_only, \
-                    values[cmd][val].is_polled, \
+                if val not in infos:
+                    continue
+                info = infos[val]
+                self.lines.append(ValuesItem(info.id, \
+                    info.label, \
+                    info.help, \
+                    info.data, \
+                    info.type, \
+                    values[cmd][val].data_items_from_info(info), \
+                    info.readOnly, \
+                    info.polled, \
                     ))
                 self.size += 1
         self._modified()
@@ -204,11 +204,7 @@ def list_nodes(args):
     print("Start network")
     network = ZWaveNetwork(options, log=None)
 
-    delta = 0.5
-    for i in range(0, int(args.timeout/delta)):
-        time.sleep(delta)
-        if network.state >= network.STATE_AWAKED:
-            break
+    network.wait_for_state(network.STATE_AWAKED, timeout=args.timeout)
 
     print("-------------------------------------------------------------------------------")
     print("Network is awaked. Talk to controller.")
@@ -225,10 +221,7 @@ def list_nodes(args):
     if args.timeout > 1800:
         print("You defined a really long timneout. Please use --help to change this feature.")
     print("Wait for network ready ({0}s)".format(args.timeout))
-    for i in range(0, int(args.timeout/delta)):
-        time.sleep(delta)
-        if network.state == network.STATE_READY:
-            break
+    network.wait_for_state(network.STATE_READY, timeout=args.timeout)
     print("-------------------------------------------------------------------------------")
     if network.state == network.STATE_READY:
         print("Network is ready. Get nodes")
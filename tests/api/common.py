@@ -101,18 +101,10 @@ class TestApi(TestPyZWave):
         dispatcher.disconnect(self.node_update, ZWaveNetwork.SIGNAL_NODE)
 
     def wait_for_queue(self):
-        for i in range(0,60):
-            if self.network.controller.send_queue_count <= 0:
-                break
-            else:
-                time.sleep(0.5)
+        self.network.controller.wait_queue_empty(timeout=30)
 
     def wait_for_network_state(self, state, multiply=1):
-        for i in range(0,SLEEP*multiply):
-            if self.network.state>=state:
-                break
-            else:
-                time.sleep(1.0)
+        self.network.wait_for_state(state, timeout=SLEEP*multiply)
 
     def ctrl_message(self, network, controller, node, node_id,
             state_int, state, state_full,
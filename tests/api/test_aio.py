@@ -0,0 +1,74 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+.. module:: tests
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave Library
+
+.. moduleauthor: bibi21000 aka Sébastien GALLET <bibi21000@gmail.com>
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+
+import sys, os
+import unittest
+import six
+from nose.plugins.skip import SkipTest
+from openzwave.network import ZWaveNetwork
+from tests.api.common import TestApi
+
+class TestAio(TestApi):
+
+    def setUp(self):
+        if six.PY2:
+            raise SkipTest("asyncio needs python 3")
+        import asyncio
+        from openzwave.aio import AsyncZWaveNetwork
+        self.loop = asyncio.new_event_loop()
+        self.anetwork = AsyncZWaveNetwork(self.network, loop=self.loop)
+
+    def tearDown(self):
+        self.anetwork.close()
+        self.loop.close()
+
+    def test_010_wait_ready(self):
+        state = self.loop.run_until_complete(self.anetwork.wait_ready(timeout=60))
+        self.assertTrue(state >= ZWaveNetwork.STATE_READY)
+
+    def test_020_values_stream(self):
+        value = None
+        for node in self.network.nodes.values():
+            for val in node.values.values():
+                if val.genre == 'User' and not val.is_write_only:
+                    value = val
+                    break
+            if value is not None:
+                break
+        if value is None:
+            self.skipTest("No value found")
+        stream = self.anetwork.values(value_id=value.value_id)
+        value.refresh()
+        import asyncio
+        event = self.loop.run_until_complete(asyncio.wait_for(stream.__anext__(), 30))
+        stream.close()
+        self.assertEqual(event.value.value_id, value.value_id)
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()
@@ -0,0 +1,218 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+.. module:: tests
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave Library
+
+.. moduleauthor: bibi21000 aka Sébastien GALLET <bibi21000@gmail.com>
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+
+import sys, os
+import gc
+import time
+import threading
+import unittest
+from openzwave.dispatch import FastDispatcher, SignalRouter, DispatchExecutor, All
+from openzwave.dispatch import CoalescePolicy, DropOldestPolicy, SamplePolicy
+from openzwave.network import ZWaveNetwork
+from openzwave.object import ZWaveException
+
+from tests.common import TestPyZWave
+
+class Item(object):
+    def __init__(self, **kwargs):
+        for key in kwargs:
+            setattr(self, key, kwargs[key])
+
+class Receiver(object):
+    def __init__(self):
+        self.received = []
+
+    def value_update(self, network, node, value):
+        self.received.append((network, node, value))
+
+class TestDispatch(TestPyZWave):
+    """
+    Test the fast dispatcher. No controller needed.
+    """
+
+    def test_010_send_accepted_arguments(self):
+        dispatcher = FastDispatcher()
+        received = []
+        def louie_network_started(network):
+            received.append(network)
+        def louie_all(**kwargs):
+            received.append(kwargs['signal'])
+        dispatcher.connect(louie_network_started, ZWaveNetwork.SIGNAL_NETWORK_STARTED)
+        dispatcher.connect(louie_all, All)
+        dispatcher.send(ZWaveNetwork.SIGNAL_NETWORK_STARTED, **{'network': 'net', 'controller': 'ctrl'})
+        self.assertEqual(received, ['net', ZWaveNetwork.SIGNAL_NETWORK_STARTED])
+        dispatcher.disconnect(louie_network_started, ZWaveNetwork.SIGNAL_NETWORK_STARTED)
+        dispatcher.send(ZWaveNetwork.SIGNAL_NETWORK_STARTED, **{'network': 'net', 'controller': 'ctrl'})
+        self.assertEqual(len(received), 3)
+
+    def test_020_weak_receivers(self):
+        dispatcher = FastDispatcher()
+        receiver = Receiver()
+        dispatcher.connect(receiver.value_update, ZWaveNetwork.SIGNAL_VALUE)
+        dispatcher.send(ZWaveNetwork.SIGNAL_VALUE, **{'network': 1, 'node': 2, 'value': 3})
+        self.assertEqual(receiver.received, [(1, 2, 3)])
+        del receiver
+        gc.collect()
+        self.assertEqual(dispatcher.receivers(ZWaveNetwork.SIGNAL_VALUE), [])
+
+    def test_030_router_filters(self):
+        router = SignalRouter()
+        received = []
+        def on_node(value):
+            received.append(('node', value.value_id))
+        def on_value(value):
+            received.append(('value', value.value_id))
+        def on_class(node, value):
+            received.append(('class', value.value_id))
+        def on_node_class(value):
+            received.append(('node_class', value.value_id))
+        router.subscribe(ZWaveNetwork.SIGNAL_VALUE_CHANGED, on_node, node_id=2)
+        router.subscribe(ZWaveNetwork.SIGNAL_VALUE_CHANGED, on_value, value_id=30)
+        router.subscribe(ZWaveNetwork.SIGNAL_VALUE_CHANGED, on_class, command_class=0x25)
+        subscription = router.subscribe(ZWaveNetwork.SIGNAL_VALUE_CHANGED, on_node_class, node_id=3, command_class=0x25)
+        node2 = Item(node_id=2)
+        node3 = Item(node_id=3)
+        router.route(ZWaveNetwork.SIGNAL_VALUE_CHANGED, {'node': node2, 'value': Item(value_id=20, command_class=0x31)})
+        router.route(ZWaveNetwork.SIGNAL_VALUE_CHANGED, {'node': node3, 'value': Item(value_id=30, command_class=0x25)})
+        router.route(ZWaveNetwork.SIGNAL_VALUE_REFRESHED, {'node': node3, 'value': Item(value_id=30, command_class=0x25)})
+        self.assertEqual(received, [('node', 20), ('value', 30), ('node_class', 30), ('class', 30)])
+        router.unsubscribe(subscription)
+        del received[:]
+        router.route(ZWaveNetwork.SIGNAL_VALUE_CHANGED, {'node': node3, 'value': Item(value_id=31, command_class=0x25)})
+        self.assertEqual(received, [('class', 31)])
+
+    def test_040_executor_ordering(self):
+        executor = DispatchExecutor(workers=3, max_queue=10)
+        received = {}
+        def handler(node_id, index):
+            if index % 10 == 0:
+                time.sleep(0.001)
+            received.setdefault(node_id, []).append(index)
+        for index in range(100):
+            for node_id in range(1, 6):
+                executor.submit(node_id, handler, node_id, index)
+        executor.submit(None, handler, None, 0)
+        executor.join()
+        for node_id in range(1, 6):
+            self.assertEqual(received[node_id], list(range(100)))
+        metrics = executor.metrics()
+        self.assertEqual(metrics['submitted'], 501)
+        self.assertEqual(metrics['delivered'], 501)
+        self.assertTrue(metrics['max_queue_depth'] <= 10)
+        self.assertTrue(metrics['handler_max'] >= 0.001)
+        executor.stop()
+
+    def test_045_executor_reentrant_submit(self):
+        executor = DispatchExecutor(workers=2, max_queue=2)
+        received = []
+        def handler(depth):
+            received.append(depth)
+            if depth == 0:
+                #Would wait for room in its own full queue : queued after the waiting one
+                executor.submit(1, handler, 2)
+                executor.submit(1, handler, 3)
+        release = threading.Event()
+        executor.submit(1, release.wait, 5)
+        for i in range(500):
+            if sum(executor.metrics()['queue_depth']) == 0:
+                break
+            time.sleep(0.01)
+        executor.submit(1, handler, 0)
+        executor.submit(1, handler, 1)
+        release.set()
+        executor.join()
+        self.assertEqual(received, [0, 1, 2, 3])
+        executor.stop()
+        executor.submit(1, handler, 4)
+        self.assertEqual(received, [0, 1, 2, 3, 4])
+        self.assertEqual(executor.metrics()['delivered'], 6)
+
+    def test_046_executor_stop_while_submitting(self):
+        executor = DispatchExecutor(workers=2, max_queue=1)
+        received = []
+        def sender(key):
+            for i in range(50):
+                executor.submit(key, received.append, (key, i))
+        threads = [threading.Thread(target=sender, args=(key,)) for key in range(4)]
+        for thread in threads:
+            thread.start()
+        executor.stop()
+        for thread in threads:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(len(received), 200)
+        for key in range(4):
+            self.assertEqual([i for k, i in received if k == key], list(range(50)))
+
+    def _slow_subscriber(self, policy):
+        router = SignalRouter()
+        release = threading.Event()
+        received = []
+        def on_value(value):
+            release.wait(5)
+            received.append((value.value_id, value.data))
+        subscription = router.subscribe(ZWaveNetwork.SIGNAL_VALUE, on_value, policy=policy)
+        for data in range(50):
+            for value_id in (10, 11):
+                router.route(ZWaveNetwork.SIGNAL_VALUE, {'value': Item(value_id=value_id, data=data)})
+        release.set()
+        for i in range(500):
+            if policy.metrics()['pending'] == 0 and len(received) == policy.metrics()['delivered']:
+                break
+            time.sleep(0.01)
+        router.unsubscribe(subscription)
+        return received, policy.metrics()
+
+    def test_050_coalesce_policy(self):
+        received, metrics = self._slow_subscriber(CoalescePolicy())
+        self.assertEqual(received[-2:], [(10, 49), (11, 49)])
+        self.assertEqual(metrics['delivered'] + metrics['coalesced'], 100)
+        self.assertEqual(metrics['dropped'], 0)
+
+    def test_060_drop_oldest_policy(self):
+        received, metrics = self._slow_subscriber(DropOldestPolicy(max_queue=4))
+        self.assertEqual(received[-4:], [(10, 48), (11, 48), (10, 49), (11, 49)])
+        self.assertEqual(metrics['delivered'] + metrics['dropped'], 100)
+
+    def test_065_sample_policy(self):
+        received, metrics = self._slow_subscriber(SamplePolicy(interval=0.5))
+        #The latest signal of the interval is delivered when it expires
+        self.assertEqual(received, [(10, 0), (11, 0), (10, 49), (11, 49)])
+        self.assertEqual(metrics['coalesced'], 96)
+        self.assertEqual(metrics['dropped'], 0)
+
+    def test_066_policy_started_once(self):
+        policy = CoalescePolicy()
+        policy.start(lambda signal, named: None)
+        self.assertRaises(ZWaveException, policy.start, lambda signal, named: None)
+        policy.stop()
+        self.assertRaises(ZWaveException, policy.start, lambda signal, named: None)
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+.. module:: tests
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave Library
+
+.. moduleauthor: bibi21000 aka Sébastien GALLET <bibi21000@gmail.com>
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+
+import sys, os
+import unittest
+from openzwave.value import ZWaveValueHistory
+
+from tests.common import TestPyZWave
+
+class TestValueHistory(TestPyZWave):
+    """
+    Test the history of the values. No controller needed.
+    """
+
+    def test_010_history_ring_buffer(self):
+        history = ZWaveValueHistory(capacity=5)
+        self.assertEqual(history.window(), [])
+        self.assertEqual(history.mean(), None)
+        for i in range(8):
+            history.append(float(i), timestamp=100.0 + i)
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history.window(), [(103.0, 3.0), (104.0, 4.0), (105.0, 5.0), (106.0, 6.0), (107.0, 7.0)])
+        self.assertEqual(history.window(start=104.5, end=106.0), [(105.0, 5.0), (106.0, 6.0)])
+        self.assertEqual(history.min(), 3.0)
+        self.assertEqual(history.max(start=105.0, end=106.0), 6.0)
+        self.assertEqual(history.mean(start=104.0), 5.5)
+        history.clear()
+        self.assertEqual(len(history), 0)
+
+    def test_020_history_downsample(self):
+        history = ZWaveValueHistory(capacity=100)
+        for i in range(10):
+            history.append(float(i), timestamp=10.0 + i)
+        self.assertEqual(history.downsample(5), [(10.0, 2.0), (15.0, 7.0)])
+        self.assertEqual(history.downsample(4, start=12.0), [(12.0, 3.5), (16.0, 7.5)])
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()
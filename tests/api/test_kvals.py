@@ -0,0 +1,128 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+.. module:: tests
+
+This file is part of **python-openzwave** project https://github.com/OpenZWave/python-openzwave.
+    :platform: Unix, Windows, MacOS X
+    :sinopsis: openzwave Library
+
+.. moduleauthor: bibi21000 aka Sébastien GALLET <bibi21000@gmail.com>
+
+License : GPL(v3)
+
+**python-openzwave** is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+**python-openzwave** is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with python-openzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+
+import sys, os
+import sqlite3
+import unittest
+from openzwave.kvals import ZWaveKvalsStore
+
+from tests.common import TestPyZWave
+
+class TestKvals(TestPyZWave):
+    """
+    Test the kvals store. No controller needed.
+    """
+
+    def setUp(self):
+        self.path = os.path.join(self.userpath, 'kvals.sqlite')
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_010_kvals_write_behind(self):
+        store = ZWaveKvalsStore(self.path, flush_interval=60)
+        for node_id in range(1, 201):
+            store.set('ZWaveNode', node_id, {'room': 'kitchen', 'floor': 1})
+        store.set('ZWaveNode', 1, {'room': 'garage', 'floor': None})
+        self.assertEqual(store.get('ZWaveNode', 1), {'room': 'garage'})
+        self.assertEqual(store.get('ZWaveNode', 2), {'room': 'kitchen', 'floor': '1'})
+        self.assertEqual(store.pending, 400)
+        store.close()
+        self.assertEqual(store.flushes, 1)
+        self.assertEqual(store.flushed, 400)
+        store = ZWaveKvalsStore(self.path)
+        self.assertEqual(store.get('ZWaveNode', 1), {'room': 'garage'})
+        self.assertEqual(store.get('ZWaveNode', 200), {'room': 'kitchen', 'floor': '1'})
+        self.assertEqual(store.get('ZWaveValue', 1), {})
+        store.close()
+
+    def test_020_kvals_migrate_tables(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE ZWaveNode(object_id INT, key TEXT, value TEXT)")
+        connection.executemany("INSERT INTO ZWaveNode(object_id, 'key', 'value') VALUES (?,?,?)", \
+            [(1, 'room', 'kitchen'), (1, 'room', 'garage'), (2, 'room', 'attic')])
+        connection.commit()
+        connection.close()
+        store = ZWaveKvalsStore(self.path)
+        self.assertEqual(store.get('ZWaveNode', 1), {'room': 'garage'})
+        store.set('ZWaveNode', 2, {'room': 'cellar'})
+        store.flush()
+        self.assertEqual(store.connection.execute("SELECT count(*) FROM ZWaveNode").fetchone()[0], 2)
+        store.close()
+
+    def test_030_kvals_get_table(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE ZWaveValue(object_id INT, key TEXT, value TEXT, PRIMARY KEY(object_id, key))")
+        connection.executemany("INSERT INTO ZWaveValue(object_id, key, value) VALUES (?,?,?)", \
+            [(value_id, 'alias', 'value %s' % value_id) for value_id in range(100)])
+        connection.commit()
+        connection.close()
+        store = ZWaveKvalsStore(self.path)
+        queries = []
+        if hasattr(store.connection, 'set_trace_callback'):
+            store.connection.set_trace_callback(queries.append)
+        for value_id in range(200):
+            store.get('ZWaveValue', value_id)
+        table = store.get_table('ZWaveValue')
+        self.assertEqual(len(table), 100)
+        self.assertEqual(table[10], {'alias': 'value 10'})
+        if hasattr(store.connection, 'set_trace_callback'):
+            self.assertEqual(len([query for query in queries if query.startswith('SELECT')]), 1)
+            store.connection.set_trace_callback(None)
+        store.close()
+
+    def test_040_kvals_flush_failure(self):
+        store = ZWaveKvalsStore(self.path, flush_interval=60)
+        store.set('ZWaveScene', 1, {'name': 'morning', 'room': 'kitchen'})
+        store.connection.execute("DROP TABLE ZWaveScene")
+        self.assertEqual(store.flush(), 0)
+        self.assertEqual(store.pending, 2)
+        store.set('ZWaveScene', 1, {'name': 'evening'})
+        store.check_tables(['ZWaveScene'])
+        self.assertEqual(store.flush(), 2)
+        self.assertEqual(store.connection.execute("SELECT value FROM ZWaveScene WHERE key='name'").fetchone()[0], 'evening')
+        store.connection.execute("DROP TABLE ZWaveScene")
+        store.set('ZWaveScene', 2, {'name': 'night'})
+        self.assertFalse(store.close())
+
+    def test_050_kvals_get_without_kvals(self):
+        store = ZWaveKvalsStore(self.path, flush_interval=60)
+        store.set('ZWaveValue', 1, {'alias': 'temperature'})
+        store.set('ZWaveValue', 2, {'alias': 'humidity'})
+        for value_id in range(3, 1000):
+            self.assertEqual(store.get('ZWaveValue', value_id), {})
+        store.set('ZWaveValue', 2, {'alias': None})
+        self.assertEqual(store.get_table('ZWaveValue'), {1: {'alias': 'temperature'}})
+        self.assertEqual(store.get_table('ZWaveValue', [2, 3]), {})
+        self.assertEqual(store.get_table('ZWaveValue', [1, 3]), {1: {'alias': 'temperature'}})
+        #Only the objects having kvals are kept in memory
+        self.assertEqual(len(store._cache['ZWaveValue']), 1)
+        store.close()
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()
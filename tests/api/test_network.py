@@ -47,12 +47,103 @@ from openzwave.value import ZWaveValue
 from openzwave.scene import ZWaveScene
 from openzwave.controller import ZWaveController
 from openzwave.network import ZWaveNetwork
+from openzwave.object import wait_for
+from openzwave.dispatch import FastDispatcher, SignalRouter
+from openzwave.value import ZWavePendingWrites
+import collections
+import threading
 from openzwave.option import ZWaveOption
 from tests.common import pyozw_version
 from tests.common import SLEEP
 from tests.api.common import TestApi
 from tests.common import TestPyZWave, json_dumps, json_loads
 
+class TestNetworkState(TestPyZWave):
+    """
+    Test the wait for the state of the network. No controller needed.
+    """
+
+    def test_070_wait_for(self):
+        condition = threading.Condition()
+        state = []
+        def notify():
+            with condition:
+                state.append(True)
+                condition.notify_all()
+        timer = threading.Timer(0.05, notify)
+        started = time.time()
+        timer.start()
+        self.assertTrue(wait_for(condition, lambda: state, timeout=5))
+        self.assertTrue(time.time() - started < 1.0)
+        self.assertFalse(wait_for(condition, lambda: len(state) > 1, timeout=0.05))
+
+    def test_075_network_wait_for_state_failed(self):
+        network = ZWaveNetwork.__new__(ZWaveNetwork)
+        network._state = network.STATE_STARTED
+        network._state_condition = threading.Condition()
+        network._dict_cache = None
+        self.assertTrue(network.wait_for_state(network.STATE_STARTED, timeout=0.05))
+        timer = threading.Timer(0.05, network._set_state, args=(network.STATE_FAILED,))
+        started = time.time()
+        timer.start()
+        #Return as soon as the network fails
+        self.assertFalse(network.wait_for_state(network.STATE_READY, timeout=5))
+        self.assertTrue(time.time() - started < 1.0)
+        self.assertEqual(network.state, network.STATE_FAILED)
+
+class TestNetworkValueRemoved(TestPyZWave):
+    """
+    Test the handler of the ValueRemoved notifications. No controller needed.
+    """
+
+    def _network(self):
+        network = ZWaveNetwork.__new__(ZWaveNetwork)
+        network._dict_cache = None
+        network._dispatcher = FastDispatcher()
+        network._router = SignalRouter()
+        network._executor = None
+        network._pending_writes = ZWavePendingWrites()
+        network._changes = collections.OrderedDict()
+        network._changes_lock = threading.Lock()
+        network._sequence = 0
+        network._changes_floor = 0
+        network._nodes = {}
+        network._values_index = {}
+        network._values_on_network_index = {}
+        network._values_on_network_keys = {}
+        return network
+
+    def test_080_network_value_removed(self):
+        network = self._network()
+        node = ZWaveNode(5, network)
+        network._nodes[5] = node
+        value = ZWaveValue(0x1000, network=network, parent=node, use_cache=True)
+        node.values[value.value_id] = value
+        keys = (0x25, 'User', 'Bool', 0, (1, 0))
+        node._values_keys[value.value_id] = keys
+        for name, key in zip(('command_class', 'genre', 'type', 'index', 'instance_index'), keys):
+            node._values_indexes[name][key] = set([value.value_id])
+        network._values_index[value.value_id] = value
+        network._values_on_network_keys[value.value_id] = 'value 5'
+        network._values_on_network_index['value 5'] = value
+        received = []
+        def removed(node, value, valueId):
+            received.append((node, value, valueId))
+        network._dispatcher.connect(removed, ZWaveNetwork.SIGNAL_VALUE_REMOVED, weak=False)
+        args = {'nodeId': 5, 'valueId': {'id': 0x1000}}
+        self.assertTrue(network._handle_value_removed(args))
+        self.assertEqual(received, [(node, value, 0x1000)])
+        self.assertFalse(0x1000 in node.values)
+        self.assertEqual(network.get_value(0x1000), None)
+        self.assertEqual(network._values_on_network_index, {})
+        self.assertEqual(node._values_keys, {})
+        self.assertEqual(node.get_values(class_id=0x25), {})
+        #The removed value is in the change log, without dict
+        self.assertEqual(network.changes_since(0)['values'], {0x1000: None})
+        #A second notification for the same value is for an unknown value
+        self.assertFalse(network._handle_value_removed(args))
+        self.assertEqual(received[-1], (node, None, 0x1000))
+
 class TestNetwork(TestApi):
 
     def test_000_network_awake(self):
@@ -68,6 +159,50 @@ class TestNetwork(TestApi):
             self.skipNotReady("Newtork is not ready ... but continue")
         self.assertTrue(self.network.state>=self.network.STATE_READY)
 
+    def test_020_network_wait(self):
+        started = time.time()
+        self.assertTrue(self.network.wait_for_state(self.network.STATE_AWAKED, timeout=SLEEP))
+        self.assertTrue(time.time() - started < 1.0)
+        self.assertTrue(self.network.controller.wait_queue_empty(timeout=SLEEP))
+        self.assertTrue(self.network.controller.node.wait_ready(timeout=SLEEP))
+        self.assertTrue(self.network.controller.node.is_ready)
+
+    def test_030_network_changes_since(self):
+        changes = self.network.changes_since(0)
+        self.assertTrue(changes['sequence'] >= 1)
+        node = self.network.controller.node
+        node.name = "changes %s" % changes['sequence']
+        for i in range(0, SLEEP):
+            changes = self.network.changes_since(changes['sequence'])
+            if node.node_id in changes['nodes']:
+                break
+            time.sleep(0.1)
+        self.assertTrue(node.node_id in changes['nodes'])
+        self.assertEqual(changes['nodes'][node.node_id]['name'], node.name)
+        self.assertFalse(changes['reset'])
+        #The broadcast ids of the driver notifications are not nodes
+        self.assertFalse(0 in self.network.changes_since(0)['nodes'])
+        self.assertFalse(0xff in self.network.changes_since(0)['nodes'])
+        if self.network.kvals_store is not None:
+            sequence = changes['sequence']
+            node.kvals = {'changes':sequence}
+            changes = self.network.changes_since(sequence)
+            self.assertTrue(node.node_id in changes['nodes'])
+            node.kvals = {'changes':None}
+        #A notification which changes nothing is not in the change log
+        sequence = self.network.sequence
+        self.network.zwcallback({'notificationType':self.network.SIGNAL_NODE_EVENT, 'nodeId':node.node_id, 'event':0})
+        self.assertEqual(self.network.sequence, sequence)
+
+    def test_040_network_notification_types(self):
+        types = self.network._map_notification_types([self.network.SIGNAL_MSG_COMPLETE, self.network.SIGNAL_VALUE])
+        self.assertTrue(self.network.SIGNAL_NOTIFICATION in types)
+        self.assertTrue(self.network.SIGNAL_VALUE_CHANGED in types)
+        self.assertTrue(self.network.SIGNAL_DRIVER_READY in types)
+        self.assertFalse(self.network.SIGNAL_NODE_EVENT in types)
+        self.assertRaises(openzwave.object.ZWaveException, ZWaveNetwork, self.network._options, \
+            autostart=False, kvals=False, notification_types=['NotANotification'])
+
     def test_100_network_test(self):
         self.network.test()
 
@@ -92,6 +227,15 @@ class TestNetwork(TestApi):
         self.assertNotEqual(res, None)
         self.assertTrue(len(res)>0)
 
+    def test_230_network_get_value(self):
+        for node in self.network.nodes:
+            for value_id in self.network.nodes[node].values:
+                value = self.network.nodes[node].values[value_id]
+                self.assertTrue(self.network.get_value(value_id) is value)
+                self.assertTrue(self.network.get_value_from_id_on_network(value.id_on_network) is value)
+        self.assertEqual(self.network.get_value(0), None)
+        self.assertEqual(self.network.get_value_from_id_on_network('unknown'), None)
+
     def test_300_network_kvals_nodes(self):
         nodes_id = self.network.nodes.keys()
         for nid in nodes_id:
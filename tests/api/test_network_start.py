@@ -98,21 +98,12 @@ class TestNetworkStartStop(TestPyZWave):
         dispatcher.connect(self.driver_ready_message, ZWaveNetwork.SIGNAL_NETWORK_STARTED)
         dispatcher.connect(self.driver_removed_message, ZWaveNetwork.SIGNAL_DRIVER_REMOVED)
         self.network = ZWaveNetwork(self.options)
-        for i in range(0, SLEEP):
-            if self.network.state>=self.network.STATE_STARTED:
-                break
-            else:
-                time.sleep(1.0)
+        self.network.wait_for_state(self.network.STATE_STARTED, timeout=SLEEP)
         time.sleep(5.0)
         self.assertTrue(self.driver_ready)
         #~ time.sleep(5.0)
         #~ self.assertTrue(self.network_started)
         self.network.stop()
-        for i in range(0, SLEEP):
-            if self.network.state==self.network.STATE_STOPPED:
-                break
-            else:
-                time.sleep(1.0)
         self.assertEqual(self.network.state, self.network.STATE_STOPPED)
         #~ self.assertTrue(self.network_stopped)
         #~ self.assertTrue(self.driver_removed)
@@ -132,30 +123,12 @@ class TestNetworkStartStop(TestPyZWave):
         dispatcher.connect(self.driver_ready_message, ZWaveNetwork.SIGNAL_NETWORK_STARTED)
         dispatcher.connect(self.driver_removed_message, ZWaveNetwork.SIGNAL_DRIVER_REMOVED)
         self.network = ZWaveNetwork(self.options)
-        for i in range(0, SLEEP):
-            if self.network.state>=self.network.STATE_STARTED:
-                break
-            else:
-                time.sleep(0.1)
+        self.network.wait_for_state(self.network.STATE_STARTED, timeout=SLEEP)
         self.network.stop()
-        for i in range(0, SLEEP*10):
-            if self.network.state==self.network.STATE_STOPPED:
-                break
-            else:
-                time.sleep(0.1)
         self.assertEqual(self.network.state, self.network.STATE_STOPPED)
         self.network.start()
-        for i in range(0, SLEEP*10):
-            if self.network.state>=self.network.STATE_STARTED:
-                break
-            else:
-                time.sleep(0.1)
+        self.network.wait_for_state(self.network.STATE_STARTED, timeout=SLEEP)
         self.network.stop()
-        for i in range(0, SLEEP*10):
-            if self.network.state==self.network.STATE_STOPPED:
-                break
-            else:
-                time.sleep(0.1)
         self.assertEqual(self.network.state, self.network.STATE_STOPPED)
         #self.assertTrue(self.driver_removed)
 
@@ -173,20 +146,11 @@ class TestNetworkStartStop(TestPyZWave):
         dispatcher.connect(self.driver_ready_message, ZWaveNetwork.SIGNAL_DRIVER_READY)
         dispatcher.connect(self.driver_removed_message, ZWaveNetwork.SIGNAL_DRIVER_REMOVED)
         self.network = ZWaveNetworkSingleton(self.options)
-        for i in range(0, SLEEP):
-            if self.network.state>=self.network.STATE_AWAKED:
-                break
-            else:
-                time.sleep(1.0)
+        self.network.wait_for_state(self.network.STATE_AWAKED, timeout=SLEEP)
         self.assertTrue(self.driver_ready)
         network2 = ZWaveNetworkSingleton(self.options, autostart=False)
         self.assertIs(self.network, network2)
         self.network.stop()
-        for i in range(0, SLEEP):
-            if self.network.state==self.network.STATE_STOPPED:
-                break
-            else:
-                time.sleep(1.0)
         self.assertEqual(self.network.state, self.network.STATE_STOPPED)
 
 if __name__ == '__main__':
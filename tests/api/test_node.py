@@ -79,6 +79,17 @@ class TestNode(TestApi):
         self.assertTrue(isinstance(self.network.nodes[node_id].max_baud_rate, integer_types))
         self.assertTrue(self.network.nodes[node_id].max_baud_rate > 0)
 
+    def test_350_node_info(self):
+        node_id = max(self.network.nodes.keys())
+        node = self.network.nodes[node_id]
+        info = self.network.manager.getNodeInfo(self.network.home_id, node_id)
+        self.assertEqual(info.nodeId, node_id)
+        self.assertEqual(info.name, node.name)
+        self.assertEqual(info.maxBaudRate, node.max_baud_rate)
+        self.assertEqual(info.listening, node.is_listening_device)
+        self.assertEqual(info.queryStage, node.query_stage)
+        self.assertEqual(type(info.to_dict()), type(dict()))
+
     def test_410_node_product(self):
         node_id = max(self.network.nodes.keys())
         self.assertTrue(isinstance(self.network.nodes[node_id].product_type, string_types))
@@ -175,6 +186,14 @@ class TestNode(TestApi):
         self.assertEqual(type(self.network.nodes[node_id].command_classes), type(set()))
         self.assertTrue(len(self.network.nodes[node_id].command_classes) >= 0)
 
+    def test_581_node_command_classes_versions(self):
+        node_id = max(self.network.nodes.keys())
+        classes = self.network.manager.getNodeCommandClasses(self.network.home_id, node_id)
+        self.assertEqual(type(classes), type(dict()))
+        self.assertEqual(set(classes.keys()), self.network.nodes[node_id].command_classes)
+        for cls in classes:
+            self.assertTrue(self.network.nodes[node_id].has_command_class(cls))
+
     def test_610_node_is_awake(self):
         node_id = max(self.network.nodes.keys())
         self.assertEqual(type(self.network.nodes[node_id].is_awake), type(True))
@@ -259,6 +278,30 @@ class TestNode(TestApi):
         node_id = max(self.network.nodes.keys())
         self.assertEqual(type(self.network.nodes[node_id].get_values()), type(dict()))
 
+    def test_820_node_values_filters(self):
+        for node_id in self.active_nodes:
+            node = self.network.nodes[node_id]
+            for value in node.values.values():
+                for kwargs in [{'class_id':value.command_class}, {'genre':value.genre},
+                               {'type':value.type}, {'index':value.index},
+                               {'class_id':value.command_class, 'genre':value.genre, 'type':value.type}]:
+                    expected = [val for val in node.values
+                                if all([getattr(node.values[val], {'class_id':'command_class'}.get(key, key)) == kwargs[key]
+                                        for key in kwargs])]
+                    self.assertEqual(set(node.get_values(**kwargs).keys()), set(expected))
+
+    def test_830_node_values_filters_missing_keys(self):
+        #A node without values : all the keys are missing from its indexes
+        node = ZWaveNode(250, self.network)
+        self.assertEqual(node.get_values(class_id=0x25, genre='User', type='Bool', readonly=False, writeonly=False), {})
+        self.assertEqual(node.get_values(class_id=0x25, index=0, instance=1), {})
+        for node_id in self.active_nodes:
+            node = self.network.nodes[node_id]
+            for value in node.values.values():
+                #An existing genre and type with a missing command class and index
+                self.assertEqual(node.get_values(class_id=0xEF, genre=value.genre, type=value.type, index=255), {})
+                break
+
 if __name__ == '__main__':
     sys.argv.append('-v')
     unittest.main()
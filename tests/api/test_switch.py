@@ -93,6 +93,20 @@ class TestSwitch(TestApi):
         if ran == False :
             self.skipTest("No Switch found")
 
+    def test_115_switch_set_confirm(self):
+        ran = False
+        for node in self.active_nodes:
+            for val in self.active_nodes[node].get_switches():
+                ran = True
+                value = self.active_nodes[node].values[val]
+                self.assertTrue(value.set(True, timeout=10).result())
+                self.assertTrue(self.active_nodes[node].get_switch_state(val))
+                self.assertFalse(value.set(False, timeout=10).result())
+                self.assertFalse(self.active_nodes[node].get_switch_state(val))
+                self.assertEqual(len(self.network.pending_writes), 0)
+        if ran == False :
+            self.skipTest("No Switch found")
+
     def test_120_switch_rgbbulbs(self):
         ran = False
         for node in self.active_nodes:
@@ -45,7 +45,8 @@ else:
 import libopenzwave
 import openzwave
 from openzwave.node import ZWaveNode
-from openzwave.value import ZWaveValue
+from openzwave.value import ZWaveValue, ZWavePendingWrites
+from openzwave.object import ZWaveWriteException
 from openzwave.scene import ZWaveScene
 from openzwave.controller import ZWaveController
 from openzwave.network import ZWaveNetwork
@@ -55,6 +56,35 @@ from tests.common import SLEEP
 from tests.api.common import TestApi
 from tests.common import TestPyZWave, json_dumps, json_loads
 
+class TestPendingWrites(TestPyZWave):
+    """
+    Test the pending writes. No controller needed.
+    """
+
+    def test_080_pending_writes_match(self):
+        writes = ZWavePendingWrites()
+        future = writes.add(10, timeout=0.2, match=lambda data: data == 50)
+        other = writes.add(10)
+        writes.resolve(10, 0)
+        self.assertFalse(future.done())
+        self.assertEqual(other.result(), 0)
+        writes.resolve(10, 50)
+        self.assertEqual(future.result(), 50)
+        self.assertEqual(len(writes), 0)
+
+    def test_085_pending_writes_other_data(self):
+        writes = ZWavePendingWrites()
+        started = time.time()
+        future = writes.add(11, timeout=0.2, match=lambda data: data == 50)
+        writes.resolve(11, 0)
+        writes.resolve(11, 49)
+        #A report with other data doesn't confirm the write
+        self.assertFalse(future.done())
+        self.assertTrue(11 in writes)
+        self.assertRaises(ZWaveWriteException, future.result, 5)
+        self.assertTrue(time.time() - started >= 0.2)
+        self.assertEqual(len(writes), 0)
+
 class TestValue(TestApi):
 
     def test_200_values_to_dict(self):
@@ -72,6 +102,65 @@ class TestValue(TestApi):
                 res = json_dumps(val)
                 self.assertNotEqual(res, None)
 
+    def test_205_values_info(self):
+        for node in self.active_nodes:
+            values = self.active_nodes[node].values
+            infos = self.network.manager.getValuesInfo(list(values.keys()))
+            for value in values:
+                self.assertTrue(value in infos)
+                info = infos[value]
+                self.assertEqual(info.id, value)
+                self.assertEqual(info.label, values[value].label)
+                self.assertEqual(info.genre, values[value].genre)
+                self.assertEqual(info.type, values[value].type)
+                self.assertEqual(info.readOnly, values[value].is_read_only)
+                self.assertEqual(type(info.to_dict()), type(dict()))
+
+    def test_206_values_cache(self):
+        for node in self.active_nodes:
+            for value in self.active_nodes[node].values.values():
+                if not value.use_cache:
+                    continue
+                self.assertEqual(value.label, self.network.manager.getValueLabel(value.value_id))
+                self.assertEqual(value.type, self.network.manager.getValueType(value.value_id))
+                self.assertEqual(value.command_class, self.network.manager.getValueCommandClass(value.value_id))
+                self.assertFalse(value.is_outdated('descriptor'))
+                value.outdate_data()
+                self.assertTrue(value.is_outdated('data'))
+                self.assertTrue(value.is_outdated('descriptor'))
+                self.assertTrue(value.is_outdated('is_read_only'))
+                self.assertEqual(value.label, self.network.manager.getValueLabel(value.value_id))
+                self.assertEqual(value.data, self.network.manager.getValue(value.value_id))
+                self.assertFalse(value.is_outdated('data'))
+
+    def test_207_values_descriptor(self):
+        descriptors = {}
+        for node in self.active_nodes:
+            for value in self.active_nodes[node].values.values():
+                descriptor = self.network.manager.getValueDescriptor(value.value_id)
+                self.assertTrue(descriptor is value.descriptor)
+                self.assertEqual(descriptor.label, value.label)
+                self.assertEqual(descriptor.units, value.units)
+                self.assertEqual(descriptor.commandClassId, value.command_class)
+                key = (value.command_class, value.genre, value.type, value.label, value.units)
+                self.assertTrue(descriptors.setdefault(key, descriptor) is descriptor)
+
+    def test_208_values_to_dict_memoized(self):
+        for node in self.active_nodes.values():
+            if not node.use_cache:
+                continue
+            first = node.to_dict()
+            second = node.to_dict()
+            self.assertEqual(first, second)
+            self.assertTrue(first['values'] is second['values'])
+            for value in node.values.values():
+                self.assertEqual(value.to_dict(), first['values'][value.value_id])
+                value.outdate_data()
+                break
+            else:
+                continue
+            self.assertFalse(node.to_dict()['values'] is first['values'])
+
     def test_210_values_check_data(self):
         for node in self.active_nodes:
             for value in self.active_nodes[node].values: